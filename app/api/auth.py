@@ -5,9 +5,9 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.dependencies import get_db
-from app import crud, schemas, security
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_async_db
+from app import crud, hashing, schemas, security
 
 router = APIRouter(tags=["Authentication"])
 
@@ -18,12 +18,15 @@ router = APIRouter(tags=["Authentication"])
     response_model=schemas.Token,
     status_code=status.HTTP_200_OK
 )
-def login(
+async def login(
         form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db, scope="function")
 ) -> dict:
     """Аутентификация пользователя и возврат токена JWT
 
+    Пароль проверяется в пуле процессов app.hashing; если хэш создан
+    с другой стоимостью bcrypt, он пересчитывается и сохраняется.
+
     Аргументы:
     form_data: данные формы OAuth2 с именем пользователя/паролем
     db: сеанс базы данных
@@ -33,20 +36,24 @@ def login(
 
     Вызывает:
     HTTPException: 401, если недействительные учетные данные
+    HashingBusyError: 503, если очередь пула хэширования заполнена
     """
-    user = crud.get_user_by_username(db, form_data.username)
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Неверное имя пользователя или пароль"
+    )
+    user = await crud.aio.get_user_by_username(db, form_data.username)
+    if not user:
+        raise credentials_exception
 
-    if not user or not security.verify_password(
-            form_data.password,
-            user.hashed_password
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Неверное имя пользователя или пароль"
-        )
+    valid, new_hash = await hashing.verify_password(form_data.password, user.hashed_password)
+    if not valid:
+        raise credentials_exception
+    if new_hash:
+        await crud.aio.set_user_password_hash(db, user.id, new_hash)
 
     access_token = security.create_access_token(
-        data={"sub": user.username}
+        data={"sub": user.username, "uid": user.id}
     )
 
     return {
@@ -61,12 +68,15 @@ def login(
     status_code=status.HTTP_201_CREATED,
     summary="Регистрация нового пользователя"
 )
-def register_user(
+async def register_user(
         user_data: schemas.UserCreate,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db, scope="function")
 ) -> schemas.User:
     """Регистрация нового пользователя в системе
 
+    Пароль проверяется валидатором UserCreate в открытом виде и хэшируется
+    один раз в пуле процессов app.hashing после проверки уникальности.
+
     Аргументы:
     user_data: Данные регистрации пользователя
     db: Сеанс базы данных
@@ -76,28 +86,20 @@ def register_user(
 
     Вызывает:
     HTTPException: 400, если имя пользователя/адрес электронной почты уже существуют
+    HashingBusyError: 503, если очередь пула хэширования заполнена
     """
-    if crud.get_user_by_username(db, user_data.username):
+    if await crud.aio.get_user_by_username(db, user_data.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Пользователь с таким именем уже существует"
         )
 
-    if crud.get_user_by_email(db, user_data.email):
+    if await crud.aio.get_user_by_email(db, user_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Пользователь с таким email уже существует"
         )
 
-    hashed_password = security.get_password_hash(user_data.password)
-
-    db_user = crud.create_user(
-        db,
-        schemas.UserCreate(
-            username=user_data.username,
-            email=user_data.email,
-            password=hashed_password
-        )
-    )
+    hashed_password = await hashing.hash_password(user_data.password)
 
-    return db_user
+    return await crud.aio.create_user(db, user_data, hashed_password)
@@ -5,9 +5,12 @@
 
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.dependencies import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import batch_ids, get_async_db, get_async_read_db, page_request
 from app import crud, schemas
+from app.cache import cache_tag, cached
+from app.etag import IfNoneMatch, conditional, entity_version, table_versions
+from app.pagination import PageRequest
 
 router = APIRouter(tags=["Авторы"])
 
@@ -18,9 +21,9 @@ router = APIRouter(tags=["Авторы"])
     status_code=status.HTTP_201_CREATED,
     summary="Создать нового автора"
 )
-def create_author(
+async def create_author(
         author: schemas.AuthorCreate,
-        db: Annotated[Session, Depends(get_db)]
+        db: Annotated[AsyncSession, Depends(get_async_db, scope="function")]
 ) -> schemas.Author:
     """Создание нового автора в системе
 
@@ -34,7 +37,57 @@ def create_author(
     Raises:
         HTTPException: 400 Если автор с таким именем уже существует
     """
-    return crud.create_author(db=db, author=author)
+    return await crud.aio.create_author(db=db, author=author)
+
+
+@router.get(
+    "/",
+    response_model=schemas.Page[schemas.Author],
+    summary="Список авторов"
+)
+@conditional(schemas.Page[schemas.Author], etag=table_versions(["authors"]), validate=False)
+async def read_authors(
+        db: Annotated[AsyncSession, Depends(get_async_read_db)],
+        page: Annotated[PageRequest, Depends(page_request)],
+        if_none_match: IfNoneMatch = None
+) -> dict:
+    """Получение страницы авторов в порядке идентификаторов
+
+    Args:
+        db: Сессия базы данных
+        page: Курсор и размер страницы
+        if_none_match: ETag ранее полученной страницы
+
+    Returns:
+        dict: Авторы страницы и курсор следующей
+    """
+    authors, next_cursor = await crud.aio.get_authors(db, page=page)
+    return {"items": authors, "next_cursor": next_cursor}
+
+
+@router.get(
+    "/batch",
+    response_model=schemas.Batch[schemas.Author],
+    summary="Пакет авторов по списку ID"
+)
+@conditional(schemas.Batch[schemas.Author], etag=table_versions(["authors"]), validate=False)
+async def read_authors_batch(
+        db: Annotated[AsyncSession, Depends(get_async_read_db)],
+        ids: Annotated[list[int], Depends(batch_ids)],
+        if_none_match: IfNoneMatch = None
+) -> dict:
+    """Получение авторов по списку идентификаторов одним запросом
+
+    Args:
+        db: Сессия базы данных
+        ids: Идентификаторы авторов через запятую
+        if_none_match: ETag ранее полученного ответа
+
+    Returns:
+        dict: Найденные авторы в порядке ids и ненайденные идентификаторы
+    """
+    authors, missing = await crud.aio.get_authors_by_ids(db, ids)
+    return {"items": authors, "missing": missing}
 
 
 @router.get(
@@ -42,15 +95,22 @@ def create_author(
     response_model=schemas.Author,
     summary="Получить автора по ID"
 )
-def read_author(
+@cached(
+    schemas.Author,
+    tags=lambda params, _: [cache_tag("author", params["author_id"])],
+    etag=entity_version("authors", "author_id")
+)
+async def read_author(
         author_id: int,
-        db: Annotated[Session, Depends(get_db)]
+        db: Annotated[AsyncSession, Depends(get_async_read_db)],
+        if_none_match: IfNoneMatch = None
 ) -> schemas.Author:
     """Получение информации об авторе по его идентификатору
 
     Args:
         author_id: Идентификатор автора
         db: Сессия базы данных
+        if_none_match: ETag ранее полученного ответа
 
     Returns:
         schemas.Author: Данные автора
@@ -58,7 +118,7 @@ def read_author(
     Raises:
         HTTPException: 404 Если автор не найден
     """
-    author = crud.get_author(db, author_id=author_id)
+    author = await crud.aio.get_author(db, author_id=author_id)
     if not author:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -72,10 +132,10 @@ def read_author(
     response_model=schemas.Author,
     summary="Обновить данные автора"
 )
-def update_author(
+async def update_author(
         author_id: int,
         author: schemas.AuthorCreate,
-        db: Annotated[Session, Depends(get_db)]
+        db: Annotated[AsyncSession, Depends(get_async_db, scope="function")]
 ) -> schemas.Author:
     """Обновление информации об авторе
 
@@ -90,13 +150,13 @@ def update_author(
     Raises:
         HTTPException: 404 Если автор не найден
     """
-    db_author = crud.get_author(db, author_id=author_id)
+    db_author = await crud.aio.get_author(db, author_id=author_id)
     if not db_author:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Автор не найден"
         )
-    return crud.update_author(db=db, author_id=author_id, author=author)
+    return await crud.aio.update_author(db=db, author_id=author_id, author=author)
 
 
 @router.delete(
@@ -104,9 +164,9 @@ def update_author(
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Удалить автора"
 )
-def delete_author(
+async def delete_author(
         author_id: int,
-        db: Annotated[Session, Depends(get_db)]
+        db: Annotated[AsyncSession, Depends(get_async_db, scope="function")]
 ) -> None:
     """Удаление автора из системы
 
@@ -117,7 +177,7 @@ def delete_author(
     Raises:
         HTTPException: 404 Если автор не найден
     """
-    db_author = crud.delete_author(db, author_id=author_id)
+    db_author = await crud.aio.delete_author(db, author_id=author_id)
     if not db_author:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -4,41 +4,275 @@
 """
 
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db
-from app import crud, schemas
-from app.models.book import Book
-from app.models.review import Review
+from app.dependencies import (
+    batch_ids, book_include, get_async_db, get_async_read_db, get_current_user, page_request
+)
+from app import bulk, crud, export, schemas
+from app.cache import cache_tag, cached
+from app.etag import IfNoneMatch, collection_etag, conditional, entity_etag
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PageRequest
 
 router = APIRouter(tags=["Книги"])
 
+# Таблицы, изменения которых меняют связи, включенные параметром include=
+_INCLUDE_TABLES = {
+    "author": ("authors",),
+    "genres": ("book_genre", "genres"),
+    "reviews": ("reviews",),
+}
+
+
+def _included_tables(include: frozenset[str]) -> list[str]:
+    """Таблицы связей, включенных в ответ."""
+    return [table for name in sorted(include) for table in _INCLUDE_TABLES[name]]
+
+
+async def _book_etag(params: dict) -> str | None:
+    """Сильный ETag книги: версии книги, автора и счетчики таблиц включенных связей."""
+    db, book_id, include = params["db"], params["book_id"], params["include"]
+    tables = [table for table in _included_tables(include) if table != "authors"]
+    versions = await crud.aio.get_book_versions(db, book_id, tables)
+    if versions is None:
+        return None
+    book_version, author_version, counters = versions
+    parts = [book_version]
+    if "author" in include:
+        parts.append(f"a{author_version}")
+    parts.extend(f"{table}.{version}" for table, version in counters.items())
+    return entity_etag("books", book_id, *parts)
+
+
+def _books_etag(*tables: str):
+    """Слабый ETag списка книг по счетчикам таблиц книг и включенных связей."""
+    async def etag(params: dict) -> str:
+        counters = await crud.aio.get_table_versions(
+            params["db"], [*tables, *_included_tables(params["include"])]
+        )
+        return collection_etag(counters)
+    return etag
+
+
+def _book_tags(params: dict, book: schemas.BookDetail) -> list[str]:
+    """Теги кэша книги и связей, включенных в ответ."""
+    tags = [cache_tag("book", book.id)]
+    if "author" in params["include"]:
+        tags.append(cache_tag("author", book.author_id))
+    if "genres" in params["include"]:
+        tags.extend(cache_tag("genre", genre.id) for genre in book.genres)
+    if "reviews" in params["include"]:
+        tags.append(cache_tag("reviews", book.id))
+    return tags
+
+
+@router.get(
+    "/",
+    response_model=schemas.Page[schemas.BookDetail],
+    response_model_exclude_unset=True,
+    summary="Список книг"
+)
+@conditional(
+    schemas.Page[schemas.BookDetail],
+    etag=_books_etag("books"),
+    exclude_unset=True,
+    validate=False
+)
+async def read_books(
+        db: Annotated[AsyncSession, Depends(get_async_read_db)],
+        include: Annotated[frozenset[str], Depends(book_include)],
+        page: Annotated[PageRequest, Depends(page_request)],
+        if_none_match: IfNoneMatch = None
+) -> dict:
+    """Получение страницы книг в порядке идентификаторов
+
+    Args:
+        db: Сессия базы данных
+        include: Связи, загружаемые вместе с книгами
+        page: Курсор и размер страницы
+        if_none_match: ETag ранее полученной страницы
+
+    Returns:
+        dict: Книги страницы и курсор следующей
+    """
+    books, next_cursor = await crud.aio.get_books(db, page=page, include=include)
+    return {"items": books, "next_cursor": next_cursor}
+
+
+@router.post(
+    "/import",
+    response_model=schemas.ImportReport,
+    summary="Массовый импорт книг из NDJSON или CSV",
+    dependencies=[Depends(get_current_user)]
+)
+async def import_books(
+        request: Request,
+        db: Annotated[AsyncSession, Depends(get_async_db, scope="function")],
+        fmt: Annotated[
+            str,
+            Query(alias="format", pattern="^(ndjson|csv)$", description="Формат тела запроса")
+        ] = "ndjson"
+) -> schemas.ImportReport:
+    """Массовый импорт книг из потока в теле запроса
+
+    Тело читается потоково и записывается пакетами по bulk.BATCH_SIZE строк;
+    каждый пакет фиксируется отдельно. Авторы и жанры, указанные по имени,
+    создаются при необходимости. Книги с существующим ISBN пропускаются.
+    Доступен только аутентифицированным пользователям.
+
+    Args:
+        request: HTTP-запрос с телом NDJSON или CSV
+        db: Сессия базы данных
+        fmt: Формат тела: ndjson (по умолчанию) или csv с заголовком
+
+    Returns:
+        schemas.ImportReport: Количество добавленных и пропущенных книг и ошибки строк
+    """
+    return await bulk.import_books_stream(db, request.stream(), fmt)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Потоковая выгрузка каталога в NDJSON или CSV"
+)
+async def export_books(
+        fmt: Annotated[
+            str,
+            Query(alias="format", pattern="^(ndjson|csv)$", description="Формат выгрузки")
+        ] = "ndjson",
+        gzip: Annotated[bool, Query(description="Сжать выгрузку gzip")] = False,
+        year_from: Annotated[int | None, Query(description="Год публикации от")] = None,
+        year_to: Annotated[int | None, Query(description="Год публикации до")] = None
+) -> StreamingResponse:
+    """Потоковая выгрузка всех книг с именем автора и жанрами
+
+    Строки читаются серверным курсором и отправляются клиенту порциями,
+    не материализуя каталог целиком.
+
+    Args:
+        fmt: Формат выгрузки: ndjson (по умолчанию) или csv с заголовком
+        gzip: Сжать выгрузку gzip
+        year_from: Минимальный год публикации включительно
+        year_to: Максимальный год публикации включительно
+
+    Returns:
+        StreamingResponse: Поток строк выгрузки
+    """
+    chunks = export.stream_books(fmt, year_from=year_from, year_to=year_to)
+    filename = f"books.{fmt}"
+    media_type = export.MEDIA_TYPES[fmt]
+    if gzip:
+        chunks = export.gzip_chunks(chunks)
+        filename += ".gz"
+        media_type = export.GZIP_MEDIA_TYPE
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get(
+    "/search",
+    response_model=list[schemas.BookSearchHit],
+    summary="Поиск книг по названию и автору"
+)
+async def search_books(   # pylint: disable=too-many-arguments
+        db: Annotated[AsyncSession, Depends(get_async_read_db)],
+        q: Annotated[str, Query(min_length=1, max_length=200, description="Поисковый запрос")],
+        prefix: Annotated[bool, Query(description="Автодополнение по префиксам слов")] = False,
+        genre: Annotated[str | None, Query(description="Название жанра")] = None,
+        year_from: Annotated[int | None, Query(description="Год публикации от")] = None,
+        year_to: Annotated[int | None, Query(description="Год публикации до")] = None,
+        limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE
+) -> list:
+    """Полнотекстовый и нечеткий поиск книг
+
+    Ищет по названию книги и имени автора, допускает опечатки;
+    результаты упорядочены по релевантности.
+
+    Args:
+        db: Сессия базы данных
+        q: Поисковый запрос
+        prefix: Сопоставлять слова запроса как префиксы
+        genre: Название жанра для фильтрации
+        year_from: Минимальный год публикации включительно
+        year_to: Максимальный год публикации включительно
+        limit: Максимальное количество результатов
+
+    Returns:
+        list: Найденные книги с оценкой релевантности
+    """
+    return await crud.aio.search_books(
+        db, q, prefix=prefix, genre=genre, year_from=year_from, year_to=year_to, limit=limit
+    )
+
+
+@router.get(
+    "/batch",
+    response_model=schemas.Batch[schemas.BookDetail],
+    response_model_exclude_unset=True,
+    summary="Пакет книг по списку ID"
+)
+@conditional(
+    schemas.Batch[schemas.BookDetail],
+    etag=_books_etag("books"),
+    exclude_unset=True,
+    validate=False
+)
+async def read_books_batch(
+        db: Annotated[AsyncSession, Depends(get_async_read_db)],
+        ids: Annotated[list[int], Depends(batch_ids)],
+        include: Annotated[frozenset[str], Depends(book_include)],
+        if_none_match: IfNoneMatch = None
+) -> dict:
+    """Получение книг по списку идентификаторов одним запросом
+
+    Args:
+        db: Сессия базы данных
+        ids: Идентификаторы книг через запятую
+        include: Связи, загружаемые вместе с книгами
+        if_none_match: ETag ранее полученного ответа
+
+    Returns:
+        dict: Найденные книги в порядке ids и ненайденные идентификаторы
+    """
+    books, missing = await crud.aio.get_books_by_ids(db, ids, include=include)
+    return {"items": books, "missing": missing}
+
 
 @router.get(
     "/{book_id}",
-    response_model=schemas.Book,
+    response_model=schemas.BookDetail,
+    response_model_exclude_unset=True,
     summary="Получить книгу по ID"
 )
-def read_book(
+@cached(schemas.BookDetail, tags=_book_tags, etag=_book_etag, exclude_unset=True)
+async def read_book(
         book_id: int,
-        db: Annotated[Session, Depends(get_db)]
-) -> schemas.Book:
+        db: Annotated[AsyncSession, Depends(get_async_read_db)],
+        include: Annotated[frozenset[str], Depends(book_include)],
+        if_none_match: IfNoneMatch = None
+) -> schemas.BookDetail:
     """Получение информации о книге по её идентификатору
 
     Args:
         book_id: Идентификатор книги
         db: Сессия базы данных
+        include: Связи, загружаемые вместе с книгой
+        if_none_match: ETag ранее полученного ответа
 
     Returns:
-        schemas.Book: Данные книги
+        schemas.BookDetail: Данные книги и запрошенные связи
 
     Raises:
         HTTPException: 404 Если книга не найдена
     """
-    db_book = crud.get_book(db, book_id)
+    db_book = await crud.aio.get_book(db, book_id, include=include)
     if not db_book:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -49,31 +283,101 @@ def read_book(
 
 @router.get(
     "/books/top-rated/",
-    response_model=list[schemas.Book],
+    response_model=schemas.Page[schemas.BookDetail],
+    response_model_exclude_unset=True,
     summary="Топ книг по рейтингу"
 )
-def get_top_rated_books(
-        limit: int = 10,
-        db: Session = Depends(get_db)
-) -> list[schemas.Book]:
+@conditional(
+    schemas.Page[schemas.BookDetail],
+    etag=_books_etag("books", "leaderboard_entries"),
+    exclude_unset=True,
+    validate=False
+)
+async def get_top_rated_books(
+        include: Annotated[frozenset[str], Depends(book_include)],
+        page: Annotated[PageRequest, Depends(page_request)],
+        db: AsyncSession = Depends(get_async_read_db),
+        if_none_match: IfNoneMatch = None
+) -> dict:
     """Получение списка книг с наивысшим рейтингом
 
+    Книги упорядочены по байесовской средней общего рейтинга: книга
+    с единственной высокой оценкой не опережает книги с большим числом
+    оценок. Страницы выбираются по курсору (оценка, идентификатор).
+
+    Args:
+        include: Связи, загружаемые вместе с книгами
+        page: Курсор и размер страницы
+        db: Сессия базы данных
+        if_none_match: ETag ранее полученной страницы
+
+    Returns:
+        dict: Книги страницы и курсор следующей
+    """
+    books, next_cursor = await crud.aio.get_top_rated_books(db, page=page, include=include)
+    return {"items": books, "next_cursor": next_cursor}
+
+
+@router.get(
+    "/books/leaderboard/",
+    response_model=schemas.Page[schemas.BookDetail],
+    response_model_exclude_unset=True,
+    summary="Рейтинг книг с учетом числа оценок"
+)
+@conditional(
+    schemas.Page[schemas.BookDetail],
+    etag=_books_etag("books", "leaderboard_entries"),
+    exclude_unset=True,
+    validate=False
+)
+async def get_leaderboard(
+        include: Annotated[frozenset[str], Depends(book_include)],
+        page: Annotated[PageRequest, Depends(page_request)],
+        method: Annotated[
+            str, Query(pattern="^(bayesian|wilson)$", description="Оценка для сортировки")
+        ] = "bayesian",
+        genre_id: Annotated[int | None, Query(description="Рейтинг жанра")] = None,
+        decade: Annotated[
+            int | None, Query(description="Рейтинг десятилетия, например 1990")
+        ] = None,
+        db: AsyncSession = Depends(get_async_read_db),
+        if_none_match: IfNoneMatch = None
+) -> dict:
+    """Получение рейтинга книг по байесовской оценке или границе Уилсона
+
+    Книга с единственной высокой оценкой не опережает книги с большим числом
+    оценок. Рейтинги предрассчитаны, страница выбирается по индексу
+    по курсору (оценка, идентификатор).
+
     Args:
-        limit: Количество возвращаемых книг (по умолчанию 10)
+        include: Связи, загружаемые вместе с книгами
+        page: Курсор и размер страницы
+        method: Оценка для сортировки: bayesian или wilson
+        genre_id: Жанр для рейтинга жанра
+        decade: Год из десятилетия для рейтинга десятилетия
         db: Сессия базы данных
+        if_none_match: ETag ранее полученной страницы
 
     Returns:
-        list[schemas.Book]: Список книг с рейтингом
+        dict: Книги страницы и курсор следующей
+
+    Raises:
+        HTTPException: Если заданы одновременно жанр и десятилетие
     """
-    top_books = (
-        db.query(Book)
-        .join(Review)
-        .group_by(Book.id)
-        .order_by(func.avg(Review.rating).desc())
-        .limit(limit)
-        .all()
+    if genre_id is not None and decade is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Укажите либо жанр, либо десятилетие"
+        )
+    board, board_key = "all", 0
+    if genre_id is not None:
+        board, board_key = "genre", genre_id
+    elif decade is not None:
+        board, board_key = "decade", decade // 10 * 10
+    books, next_cursor = await crud.aio.get_leaderboard(
+        db, board, board_key, method=method, page=page, include=include
     )
-    return top_books
+    return {"items": books, "next_cursor": next_cursor}
 
 
 @router.post(
@@ -82,9 +386,9 @@ def get_top_rated_books(
     status_code=status.HTTP_201_CREATED,
     summary="Создать новую книгу"
 )
-def create_book(
+async def create_book(
         book: schemas.BookCreate,
-        db: Annotated[Session, Depends(get_db)],
+        db: Annotated[AsyncSession, Depends(get_async_db, scope="function")],
 ) -> schemas.Book:
     """Создание новой книги в каталоге
 
@@ -101,14 +405,14 @@ def create_book(
         HTTPException: 400 Если ISBN уже существует
     """
     try:
-        db_author = crud.get_author(db, book.author_id)
+        db_author = await crud.aio.get_author(db, book.author_id)
         if not db_author:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Автор не найден"
             )
 
-        return crud.create_book(db=db, book=book)
+        return await crud.aio.create_book(db=db, book=book)
     except IntegrityError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -4,18 +4,23 @@
 Содержит операции CRUD для жанров книг с проверкой аутентификации пользователя.
 """
 
+from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, get_async_read_db
+from app.dependencies import batch_ids, book_include, genre_filter, page_request
 from app import crud, schemas
+from app.cache import cache_tag, cached
+from app.etag import IfNoneMatch, conditional, entity_version, table_versions
+from app.pagination import PageRequest
 
 router = APIRouter(prefix="/genres", tags=["genres"])
 
 
 @router.post("/", response_model=schemas.Genre, status_code=status.HTTP_201_CREATED)
-def create_genre(
+async def create_genre(
     genre: schemas.GenreCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db, scope="function"),
 ):
     """
     Создает новый жанр в базе данных.
@@ -31,37 +36,130 @@ def create_genre(
     Raises:
         HTTPException: Если жанр с таким именем уже существует.
     """
-    db_genre = crud.get_genre_by_name(db, name=genre.name)
+    db_genre = await crud.aio.get_genre_by_name(db, name=genre.name)
     if db_genre:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Жанр с таким названием уже существует",
         )
-    return crud.create_genre(db=db, genre=genre)
+    return await crud.aio.create_genre(db=db, genre=genre)
 
 
-@router.get("/", response_model=list[schemas.Genre])
-def read_genres(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
-) -> list[schemas.Genre]:
+@router.post("/assignments", response_model=schemas.GenreAssignmentReport)
+async def add_genre_assignments(
+    assignment: schemas.GenreAssignment,
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+) -> schemas.GenreAssignmentReport:
     """
-    Получает список жанров из базы данных.
+    Привязывает каждую из книг к каждому из жанров.
+
+    Существующие связи, несуществующие книги и жанры пропускаются.
+
+    Args:
+        assignment: Наборы книг и жанров.
+        db: Сессия базы данных.
+
+    Returns:
+        schemas.GenreAssignmentReport: Количество добавленных связей.
+    """
+    added = await crud.aio.add_book_genres(db, assignment.book_ids, assignment.genre_ids)
+    return schemas.GenreAssignmentReport(added=added)
+
+
+@router.post("/assignments/remove", response_model=schemas.GenreAssignmentReport)
+async def remove_genre_assignments(
+    assignment: schemas.GenreAssignment,
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+) -> schemas.GenreAssignmentReport:
+    """
+    Отвязывает каждую из книг от каждого из жанров.
+
+    Args:
+        assignment: Наборы книг и жанров.
+        db: Сессия базы данных.
+
+    Returns:
+        schemas.GenreAssignmentReport: Количество удаленных связей.
+    """
+    removed = await crud.aio.remove_book_genres(db, assignment.book_ids, assignment.genre_ids)
+    return schemas.GenreAssignmentReport(removed=removed)
+
+
+@router.put("/assignments", response_model=schemas.GenreAssignmentReport)
+async def replace_genre_assignments(
+    assignment: schemas.GenreAssignment,
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+) -> schemas.GenreAssignmentReport:
+    """
+    Заменяет жанры каждой из книг указанным набором.
+
+    Args:
+        assignment: Книги и их новый набор жанров.
+        db: Сессия базы данных.
+
+    Returns:
+        schemas.GenreAssignmentReport: Количество добавленных и удаленных связей.
+    """
+    added, removed = await crud.aio.replace_book_genres(
+        db, assignment.book_ids, assignment.genre_ids
+    )
+    return schemas.GenreAssignmentReport(added=added, removed=removed)
+
+
+@router.get("/", response_model=schemas.Page[schemas.Genre])
+@conditional(schemas.Page[schemas.Genre], etag=table_versions(["genres"]), validate=False)
+async def read_genres(
+    page: Annotated[PageRequest, Depends(page_request)],
+    db: AsyncSession = Depends(get_async_read_db),
+    if_none_match: IfNoneMatch = None
+) -> dict:
+    """
+    Получает страницу жанров из базы данных.
+
+    Args:
+        page: Курсор и размер страницы.
+        db: Сессия базы данных.
+        if_none_match: ETag ранее полученной страницы.
+
+    Returns:
+        dict: Жанры страницы и курсор следующей.
+    """
+    genres, next_cursor = await crud.aio.get_genres(db, page=page)
+    return {"items": genres, "next_cursor": next_cursor}
+
+
+@router.get("/batch", response_model=schemas.Batch[schemas.Genre])
+@conditional(schemas.Batch[schemas.Genre], etag=table_versions(["genres"]), validate=False)
+async def read_genres_batch(
+    ids: Annotated[list[int], Depends(batch_ids)],
+    db: AsyncSession = Depends(get_async_read_db),
+    if_none_match: IfNoneMatch = None
+) -> dict:
+    """
+    Получает жанры по списку идентификаторов одним запросом.
 
     Args:
-        skip: Количество записей для пропуска.
-        limit: Максимальное количество записей.
+        ids: Идентификаторы жанров через запятую.
         db: Сессия базы данных.
+        if_none_match: ETag ранее полученного ответа.
 
     Returns:
-        list[schemas.Genre]: Список жанров.
+        dict: Найденные жанры в порядке ids и ненайденные идентификаторы.
     """
-    return crud.get_genres(db, skip=skip, limit=limit)
+    genres, missing = await crud.aio.get_genres_by_ids(db, ids)
+    return {"items": genres, "missing": missing}
 
 
 @router.get("/{genre_id}", response_model=schemas.Genre)
-def read_genre(
+@cached(
+    schemas.Genre,
+    tags=lambda params, _: [cache_tag("genre", params["genre_id"])],
+    etag=entity_version("genres", "genre_id")
+)
+async def read_genre(
     genre_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
+    if_none_match: IfNoneMatch = None
 ) -> schemas.Genre:
     """
     Получает информацию о жанре по его ID.
@@ -69,6 +167,7 @@ def read_genre(
     Args:
         genre_id: Идентификатор жанра.
         db: Сессия базы данных.
+        if_none_match: ETag ранее полученного ответа.
 
     Returns:
         schemas.Genre: Запрошенный жанр.
@@ -76,7 +175,7 @@ def read_genre(
     Raises:
         HTTPException: Если жанр не найден.
     """
-    db_genre = crud.get_genre(db, genre_id=genre_id)
+    db_genre = await crud.aio.get_genre(db, genre_id=genre_id)
     if not db_genre:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -85,10 +184,61 @@ def read_genre(
     return db_genre
 
 
+@router.get(
+    "/{genre_id}/books",
+    response_model=schemas.Page[schemas.BookDetail],
+    response_model_exclude_unset=True
+)
+@conditional(
+    schemas.Page[schemas.BookDetail],
+    # Таблицы книг, связей с жанрами и всех связей, доступных через include
+    etag=table_versions(["books", "book_genre", "authors", "genres", "reviews"]),
+    exclude_unset=True,
+    validate=False
+)
+async def read_genre_books(
+    genre_id: int,
+    with_genres: Annotated[list[int], Depends(genre_filter)],
+    include: Annotated[frozenset[str], Depends(book_include)],
+    page: Annotated[PageRequest, Depends(page_request)],
+    db: AsyncSession = Depends(get_async_read_db),
+    if_none_match: IfNoneMatch = None
+) -> dict:
+    """
+    Получает страницу книг жанра в порядке идентификаторов.
+
+    С параметром with_genres возвращаются книги, входящие одновременно
+    в жанр genre_id и во все перечисленные жанры.
+
+    Args:
+        genre_id: Идентификатор жанра.
+        with_genres: Дополнительные жанры для пересечения.
+        include: Связи, загружаемые вместе с книгами.
+        page: Курсор и размер страницы.
+        db: Сессия базы данных.
+        if_none_match: ETag ранее полученной страницы.
+
+    Returns:
+        dict: Книги страницы и курсор следующей.
+
+    Raises:
+        HTTPException: 404, если какой-либо из жанров не найден.
+    """
+    genre_ids = list(dict.fromkeys([genre_id, *with_genres]))
+    result = await crud.aio.get_books_by_genres(db, genre_ids, page=page, include=include)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Жанр не найден"
+        )
+    books, next_cursor = result
+    return {"items": books, "next_cursor": next_cursor}
+
+
 @router.delete("/{genre_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_genre(
+async def delete_genre(
     genre_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db, scope="function"),
 ) -> None:
     """
     Удаляет жанр из базы данных.
@@ -101,7 +251,7 @@ def delete_genre(
     Raises:
         HTTPException: Если жанр не найден.
     """
-    db_genre = crud.delete_genre(db, genre_id=genre_id)
+    db_genre = await crud.aio.delete_genre(db, genre_id=genre_id)
     if not db_genre:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,80 @@
+"""
+Модуль служебных эндпоинтов состояния сервиса.
+
+Содержит проверку доступности базы данных и метрики пулов соединений.
+"""
+
+import time
+
+from fastapi import APIRouter, HTTPException, Request, status
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import auth_cache
+from app.cache import response_cache
+from app.database import async_engine, pool_status
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/db", summary="Проверка доступности базы данных")
+async def database_health() -> dict:
+    """
+    Выполняет SELECT 1 через асинхронный пул и измеряет задержку.
+
+    Returns:
+        dict: Статус и время выполнения запроса в миллисекундах.
+
+    Raises:
+        HTTPException: 503, если база данных недоступна.
+    """
+    start = time.perf_counter()
+    try:
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except SQLAlchemyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="База данных недоступна"
+        ) from exc
+    return {
+        "status": "ok",
+        "latency_ms": (time.perf_counter() - start) * 1000
+    }
+
+
+@router.get("/db/pool", summary="Метрики пулов соединений")
+async def database_pool_metrics() -> dict:
+    """
+    Возвращает заполненность пулов соединений и время ожидания выдачи.
+
+    Returns:
+        dict: Снимок метрик синхронного и асинхронного пулов.
+    """
+    return {"pools": pool_status()}
+
+
+@router.get("/cache", summary="Счетчики кэшей ответов и аутентификации")
+async def response_cache_metrics() -> dict:
+    """
+    Возвращает попадания, промахи, вытеснения и инвалидации кэша ответов,
+    а также заполненность кэшей токенов и пользователей.
+
+    Returns:
+        dict: Снимок счетчиков кэшей.
+    """
+    return {**response_cache.stats(), "auth": auth_cache.stats()}
+
+
+@router.get("/startup", summary="Фазы запуска процесса")
+async def startup_report(request: Request) -> dict:
+    """
+    Возвращает длительность фаз прогрева при запуске процесса.
+
+    Args:
+        request: HTTP-запрос (для доступа к состоянию приложения).
+
+    Returns:
+        dict: Фазы запуска с временем в миллисекундах и ошибками.
+    """
+    return {"phases": getattr(request.app.state, "startup", [])}
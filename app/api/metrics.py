@@ -0,0 +1,96 @@
+"""
+Модуль эндпоинта метрик в формате Prometheus.
+
+Кроме счетчиков и гистограмм app.metrics выводит снимки пулов соединений,
+кэша ответов, кэша аутентификации, пула хэширования паролей
+и очереди записи отзывов.
+"""
+
+from collections.abc import Iterator
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app import auth_cache, metrics
+from app.cache import response_cache
+from app.database import pool_status
+from app.hashing import hashing_pool
+from app.review_queue import review_queue
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _pool_metrics() -> Iterator[str]:
+    pools = pool_status()
+    for key, name, documentation, kind in (
+            ("pool_size", "db_pool_size", "Размер пула соединений", "gauge"),
+            ("checked_out", "db_pool_checked_out", "Выданные соединения", "gauge"),
+            ("checked_in", "db_pool_checked_in", "Свободные соединения в пуле", "gauge"),
+            ("overflow", "db_pool_overflow", "Соединения сверх размера пула", "gauge"),
+            ("checkouts", "db_pool_checkouts_total", "Выдачи соединений", "counter"),
+            ("timeouts", "db_pool_timeouts_total", "Отказы по таймауту ожидания", "counter"),
+            ("wait_seconds_total", "db_pool_wait_seconds_total",
+             "Суммарное ожидание соединений", "counter"),
+    ):
+        yield from metrics.snapshot(
+            name, documentation, [({"pool": pool["name"]}, pool[key]) for pool in pools], kind
+        )
+
+
+def _cache_metrics() -> Iterator[str]:
+    stats = response_cache.stats()
+    auth = auth_cache.stats()
+    yield from metrics.snapshot("response_cache_requests_total", "Обращения к кэшу ответов", [
+        ({"result": "hit"}, stats["hits"]), ({"result": "miss"}, stats["misses"])
+    ], "counter")
+    yield from metrics.snapshot(
+        "response_cache_invalidations_total", "Записи, удаленные инвалидацией",
+        [({}, stats["invalidations"])], "counter"
+    )
+    yield from metrics.snapshot("cache_entries", "Записи в кэшах процесса", [
+        ({"cache": "responses"}, stats.get("entries", 0)),
+        ({"cache": "auth_tokens"}, auth["tokens"]["entries"]),
+        ({"cache": "auth_users"}, auth["users"]["entries"]),
+    ])
+    yield from metrics.snapshot(
+        "password_hashing_rejected_total",
+        "Задачи хэширования, отклоненные при заполненной очереди",
+        [({}, hashing_pool.stats()["rejected"])], "counter"
+    )
+
+
+def _review_queue_metrics() -> Iterator[str]:
+    stats = review_queue.stats()
+    yield from metrics.snapshot(
+        "review_queue_depth", "Отзывы в очереди записи", [({}, stats["depth"])]
+    )
+    yield from metrics.snapshot(
+        "review_queue_capacity", "Емкость очереди записи отзывов", [({}, stats["capacity"])]
+    )
+    yield from metrics.snapshot("review_queue_reviews_total", "Отзывы, прошедшие через очередь", [
+        ({"result": "enqueued"}, stats["enqueued"]),
+        ({"result": "rejected"}, stats["rejected"]),
+        ({"result": "written"}, stats["written"]),
+        ({"result": "failed"}, stats["failed"]),
+    ], "counter")
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Метрики в формате Prometheus",
+    include_in_schema=False
+)
+async def prometheus_metrics() -> PlainTextResponse:
+    """
+    Возвращает метрики запросов, базы данных и кэшей в текстовом формате экспозиции.
+
+    Returns:
+        PlainTextResponse: Текст экспозиции Prometheus.
+    """
+    return PlainTextResponse(
+        metrics.render(_pool_metrics(), _cache_metrics(), _review_queue_metrics()),
+        media_type=CONTENT_TYPE
+    )
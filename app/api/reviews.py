@@ -4,18 +4,27 @@
 Содержит операции создания и получения отзывов с проверкой аутентификации пользователя.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.dependencies import get_db
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import (
+    batch_ids, get_async_db, get_async_read_db, get_current_user, page_request
+)
 from app import crud, schemas
+from app.cache import cache_tag, cached
+from app.etag import IfNoneMatch, conditional, table_versions
+from app.pagination import PageRequest
+from app.review_queue import ReviewAlreadyQueuedError, review_queue
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
 
 @router.post("/", response_model=schemas.Review, status_code=status.HTTP_201_CREATED)
-def create_review(
+async def create_review(
     review: schemas.ReviewCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+    current_user: schemas.User = Depends(get_current_user),
 ) -> schemas.Review:
     """
     Создает новый отзыв о книге.
@@ -27,29 +36,169 @@ def create_review(
 
     Returns:
         schemas.Review: Созданный отзыв.
+
+    Raises:
+        HTTPException: 404, если книга не найдена;
+            409, если пользователь уже оставил отзыв о книге.
+    """
+    result = await crud.aio.create_review(db=db, review=review, user_id=current_user.id)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Книга не найдена"
+        )
+    db_review, created = result
+    if not created:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Отзыв о книге уже оставлен, для изменения используйте PUT",
+        )
+    return db_review
+
+
+@router.put(
+    "/book/{book_id}",
+    response_model=schemas.Review,
+    responses={status.HTTP_201_CREATED: {"model": schemas.Review}}
+)
+async def rate_book(
+    book_id: int,
+    rate: schemas.ReviewRate,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+    current_user: schemas.User = Depends(get_current_user),
+) -> schemas.Review:
+    """
+    Оценивает книгу: создает отзыв пользователя или обновляет его на месте.
+
+    Args:
+        book_id: Идентификатор книги.
+        rate: Оценка и комментарий.
+        response: Ответ, в котором задается код 201 для нового отзыва.
+        db: Сессия базы данных.
+        current_user: Текущий аутентифицированный пользователь.
+
+    Returns:
+        schemas.Review: Созданный или обновленный отзыв.
+
+    Raises:
+        HTTPException: Если книга не найдена.
+    """
+    review = schemas.ReviewCreate(book_id=book_id, **rate.dict())
+    result = await crud.aio.rate_book(db, current_user.id, review)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Книга не найдена"
+        )
+    db_review, created = result
+    if created:
+        response.status_code = status.HTTP_201_CREATED
+    return db_review
+
+
+@router.post(
+    "/queue", response_model=schemas.ReviewQueued, status_code=status.HTTP_202_ACCEPTED
+)
+async def enqueue_review(
+    review: schemas.ReviewCreate,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: schemas.User = Depends(get_current_user),
+) -> schemas.ReviewQueued:
     """
-    return crud.create_review(db=db, review=review)
+    Ставит отзыв в очередь пакетной записи.
+
+    В режиме надежности commit ответ отправляется после фиксации пакета
+    с отзывом, в остальных режимах — сразу после постановки в очередь.
+    Повторный отзыв пользователя о книге (записанный или ожидающий записи)
+    отклоняется до постановки в очередь.
+
+    Args:
+        review: Данные для создания отзыва.
+        db: Сессия базы данных для проверки повторного отзыва.
+        current_user: Текущий аутентифицированный пользователь, автор отзыва.
+
+    Returns:
+        schemas.ReviewQueued: Признак фиксации отзыва.
 
+    Raises:
+        ReviewQueueFullError: Если очередь заполнена (ответ 503).
+        HTTPException: Если отзыв не удалось записать (409 — повторный отзыв о книге).
+    """
+    duplicate = HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Отзыв о книге уже оставлен, для изменения используйте PUT",
+    )
+    exists = await crud.aio.get_user_review(db, current_user.id, review.book_id)
+    # Соединение возвращается в пул до ожидания записи пакета
+    await db.close()
+    if exists:
+        raise duplicate
+    try:
+        committed = await review_queue.enqueue(review, current_user.id)
+    except (ReviewAlreadyQueuedError, IntegrityError) as exc:
+        raise duplicate from exc
+    except SQLAlchemyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Ошибка базы данных: {str(exc)}"
+        ) from exc
+    return schemas.ReviewQueued(committed=committed)
 
-@router.get("/book/{book_id}", response_model=list[schemas.Review])
-def get_book_reviews(
+
+@router.get("/batch", response_model=schemas.Batch[schemas.Review])
+@conditional(schemas.Batch[schemas.Review], etag=table_versions(["reviews"]), validate=False)
+async def get_reviews_batch(
+    ids: Annotated[list[int], Depends(batch_ids)],
+    db: AsyncSession = Depends(get_async_read_db),
+    if_none_match: IfNoneMatch = None
+) -> dict:
+    """
+    Получает отзывы по списку идентификаторов одним запросом.
+
+    Args:
+        ids: Идентификаторы отзывов через запятую.
+        db: Сессия базы данных.
+        if_none_match: ETag ранее полученного ответа.
+
+    Returns:
+        dict: Найденные отзывы в порядке ids и ненайденные идентификаторы.
+    """
+    reviews, missing = await crud.aio.get_reviews_by_ids(db, ids)
+    return {"items": reviews, "missing": missing}
+
+
+@router.get("/book/{book_id}", response_model=schemas.Page[schemas.Review])
+@cached(
+    schemas.Page[schemas.Review],
+    tags=lambda params, _: [cache_tag("reviews", params["book_id"])],
+    etag=table_versions(["reviews"])
+)
+async def get_book_reviews(
     book_id: int,
-    db: Session = Depends(get_db)
-) -> list[schemas.Review]:
+    page: Annotated[PageRequest, Depends(page_request)],
+    db: AsyncSession = Depends(get_async_read_db),
+    if_none_match: IfNoneMatch = None
+) -> dict:
     """
-    Получает список отзывов для указанной книги.
+    Получает страницу отзывов для указанной книги.
 
     Args:
         book_id: Идентификатор книги.
+        page: Курсор и размер страницы.
         db: Сессия базы данных.
+        if_none_match: ETag ранее полученной страницы.
 
     Returns:
-        list[schemas.Review]: Список отзывов для книги.
+        dict: Отзывы страницы и курсор следующей.
+
+    Raises:
+        HTTPException: Если у книги нет отзывов.
     """
-    reviews = crud.get_reviews_by_book(db, book_id=book_id)
-    if not reviews:
+    reviews, next_cursor = await crud.aio.get_reviews_by_book(db, book_id=book_id, page=page)
+    if not reviews and page.cursor is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Отзывы для данной книги не найдены"
         )
-    return reviews
+    return {"items": reviews, "next_cursor": next_cursor}
@@ -1,12 +1,18 @@
 """
 Модуль для работы с эндпоинтами пользователей.
 
-Содержит операции для получения информации о текущем аутентифицированном пользователе.
+Содержит операции для получения информации о текущем аутентифицированном пользователе
+и его отзывов, а также пакетной выгрузки учетных записей из SSO.
 """
 
-from fastapi import APIRouter, Depends
-from app.dependencies import get_current_user
-from app import schemas
+from typing import Annotated
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import (
+    get_async_db, get_async_read_db, get_current_user, page_request, require_provisioning_token
+)
+from app import crud, schemas
+from app.pagination import PageRequest
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -17,7 +23,7 @@ router = APIRouter(prefix="/users", tags=["users"])
     summary="Получить данные текущего пользователя",
     description="Возвращает информацию о текущем аутентифицированном пользователе"
 )
-def read_current_user(
+async def read_current_user(
     current_user: schemas.User = Depends(get_current_user)
 ) -> schemas.User:
     """
@@ -30,3 +36,61 @@ def read_current_user(
         schemas.User: Данные аутентифицированного пользователя.
     """
     return current_user
+
+
+@router.get(
+    "/me/reviews",
+    response_model=schemas.Page[schemas.Review],
+    summary="Получить отзывы текущего пользователя",
+    description="Возвращает страницу отзывов текущего пользователя, начиная с последних"
+)
+async def read_current_user_reviews(
+    page: Annotated[PageRequest, Depends(page_request)],
+    current_user: schemas.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> dict:
+    """
+    Получает страницу отзывов текущего пользователя.
+
+    Args:
+        page: Курсор и размер страницы.
+        current_user: Объект текущего пользователя из зависимости.
+        db: Сессия базы данных.
+
+    Returns:
+        dict: Отзывы страницы и курсор следующей.
+    """
+    reviews, next_cursor = await crud.aio.get_reviews_by_user(db, current_user.id, page=page)
+    return {"items": reviews, "next_cursor": next_cursor}
+
+
+@router.post(
+    "/provision",
+    response_model=schemas.ProvisionReport,
+    status_code=status.HTTP_200_OK,
+    summary="Пакетная выгрузка учетных записей из SSO",
+    dependencies=[Depends(require_provisioning_token)]
+)
+async def provision_users(
+    batch: schemas.UserProvisionBatch,
+    db: AsyncSession = Depends(get_async_db, scope="function")
+) -> schemas.ProvisionReport:
+    """
+    Создает пользователей с готовыми хэшами паролей без повторного хэширования.
+
+    Доступно только с заголовком X-Provisioning-Token. Записи с уже занятыми
+    именем или email пропускаются.
+
+    Args:
+        batch: Учетные записи с хэшами bcrypt (не более MAX_PROVISION_BATCH).
+        db: Сессия базы данных.
+
+    Returns:
+        schemas.ProvisionReport: Количество созданных и пропущенных записей.
+    """
+    created = await crud.aio.provision_users(db, batch.users)
+    return schemas.ProvisionReport(
+        received=len(batch.users),
+        created=created,
+        skipped=len(batch.users) - created
+    )
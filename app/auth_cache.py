@@ -0,0 +1,111 @@
+"""
+Кэш проверенных JWT-токенов и пользователей для get_current_user.
+
+Проверка подписи токена и запрос пользователя выполнялись на каждом
+аутентифицированном запросе. Здесь хранятся расшифрованные данные токена
+(не дольше срока его действия) и снимок пользователя (schemas.User).
+Записи помечены тегами "user:<id>" и "username:<name>" и сбрасываются
+после фиксации транзакции, изменившей пользователя (update_user_password).
+
+Настройки: AUTH_CACHE_TTL (секунды, 0 отключает кэш), AUTH_CACHE_MAX_ENTRIES.
+"""
+
+import os
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, schemas, security
+from app.cache import LocalCache, cache_tag, register_tagged_cache
+
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", "300"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+token_claims = register_tagged_cache(LocalCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL))
+user_snapshots = register_tagged_cache(LocalCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL))
+
+
+def _user_tags(claims: dict) -> list[str]:
+    tags = [cache_tag("username", claims["sub"])]
+    if claims.get("uid") is not None:
+        tags.append(cache_tag("user", claims["uid"]))
+    return tags
+
+
+def verify_token(token: str) -> dict | None:
+    """
+    Проверяет JWT-токен, используя ранее проверенные данные из кэша.
+
+    Запись живет не дольше срока действия токена (claim exp), поэтому
+    истекший токен не будет принят из кэша.
+
+    Args:
+        token: JWT-токен
+
+    Returns:
+        dict | None: Данные токена или None, если токен невалиден
+    """
+    if AUTH_CACHE_TTL <= 0:
+        return security.decode_token(token)
+    claims = token_claims.get(token)
+    if claims is not None:
+        return claims
+    claims = security.decode_token(token)
+    if not claims or not claims.get("sub"):
+        return claims
+    ttl = claims.get("exp", 0) - time.time()
+    if ttl > 0:
+        token_claims.set(token, claims, _user_tags(claims), ttl=ttl)
+    return claims
+
+
+async def get_user(db: AsyncSession, claims: dict) -> schemas.User | None:
+    """
+    Получает снимок пользователя из данных токена.
+
+    Если в токене есть claim uid, пользователь ищется по идентификатору,
+    иначе — по имени пользователя (токены, выданные до появления uid).
+
+    Args:
+        db: Асинхронная сессия базы данных
+        claims: Проверенные данные токена
+
+    Returns:
+        schemas.User | None: Данные пользователя или None, если он не найден
+    """
+    uid = claims.get("uid")
+    key = cache_tag("user", uid) if uid is not None else cache_tag("username", claims["sub"])
+    if AUTH_CACHE_TTL > 0:
+        snapshot = user_snapshots.get(key)
+        if snapshot is not None:
+            return snapshot
+    if uid is not None:
+        user = await crud.aio.get_user(db, uid)
+    else:
+        user = await crud.aio.get_user_by_username(db, username=claims["sub"])
+    if user is None or user.username != claims["sub"]:
+        return None
+    snapshot = schemas.User.model_validate(user)
+    if AUTH_CACHE_TTL > 0:
+        user_snapshots.set(key, snapshot, [
+            cache_tag("user", snapshot.id), cache_tag("username", snapshot.username)
+        ])
+    return snapshot
+
+
+def clear() -> None:
+    """
+    Очищает кэши токенов и пользователей.
+    """
+    token_claims.clear()
+    user_snapshots.clear()
+
+
+def stats() -> dict:
+    """
+    Возвращает счетчики кэшей токенов и пользователей.
+
+    Returns:
+        dict: Снимки счетчиков обоих кэшей
+    """
+    return {"tokens": token_claims.stats(), "users": user_snapshots.stats()}
@@ -0,0 +1,302 @@
+"""
+Массовый импорт книг из потоков NDJSON и CSV.
+
+Строки читаются потоково, проверяются пакетами схемой BookImport
+и записываются пакетными INSERT ... ON CONFLICT через crud.import_books_batch.
+CSV разбирается одним csv.reader на весь поток, поэтому поля в кавычках
+могут содержать переводы строк.
+Используется эндпоинтом импорта и консольной командой import-books.
+"""
+
+import codecs
+import csv
+import json
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.schemas import BookImport, ImportReport, ImportRowError
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+CSV_GENRE_SEPARATOR = "|"
+FORMATS = ("ndjson", "csv")
+
+_BATCH_ADAPTER = TypeAdapter(list[BookImport])
+
+
+def _ends_in_quotes(line: str, quoted: bool) -> bool:
+    """
+    Проверяет, заканчивается ли строка CSV внутри поля в кавычках.
+
+    Повторяет правила csv.reader для диалекта по умолчанию: кавычка
+    открывает поле только в его начале, "" внутри поля — экранированная кавычка.
+
+    Args:
+        line: Строка CSV.
+        quoted: Строка продолжает поле в кавычках.
+
+    Returns:
+        bool: True, если поле в кавычках продолжается на следующей строке.
+    """
+    field_start = not quoted
+    index = 0
+    while index < len(line):
+        char = line[index]
+        if quoted and char == '"':
+            if line.startswith('"', index + 1):
+                index += 1
+            else:
+                quoted = False
+        elif not quoted and char == '"' and field_start:
+            quoted = True
+        field_start = not quoted and char == ","
+        index += 1
+    return quoted
+
+
+class _LineFeed:     # pylint: disable=too-few-public-methods
+    """
+    Итератор строк для csv.reader, пополняемый по мере чтения потока.
+
+    Записи подаются в читатель целиком, поэтому к моменту чтения
+    очередь не пустеет посреди записи.
+    """
+
+    def __init__(self, lines: deque[str]):
+        self._lines = lines
+
+    def __iter__(self) -> "_LineFeed":
+        return self
+
+    def __next__(self) -> str:
+        if not self._lines:
+            raise StopIteration
+        return self._lines.popleft()
+
+
+class BookImporter:
+    """
+    Накопитель строк импорта: разбор, пакетная проверка и отчет.
+
+    Атрибуты:
+        fmt (str): Формат входных данных: ndjson или csv
+        report (ImportReport): Накопленный отчет об импорте
+    """
+
+    def __init__(self, fmt: str):
+        if fmt not in FORMATS:
+            raise ValueError(f"Неподдерживаемый формат импорта: {fmt}")
+        self.fmt = fmt
+        self.report = ImportReport()
+        self._header: list[str] | None = None
+        self._pending: list[tuple[int, dict]] = []
+        # Строки CSV-записи, которая продолжается на следующей строке
+        self._record_lines: list[str] = []
+        self._record_start = self._record_size = 0
+        self._csv_lines: deque[str] = deque()
+        self._csv_reader = csv.reader(_LineFeed(self._csv_lines))
+
+    def _add_errors(self, errors: Iterable[ImportRowError]) -> None:
+        for error in errors:
+            self.report.failed += 1
+            if len(self.report.errors) < MAX_REPORTED_ERRORS:
+                self.report.errors.append(error)
+
+    def _parse(self, lines: list[str]) -> dict | None:
+        if self.fmt == "ndjson":
+            record = json.loads(lines[0])
+            if not isinstance(record, dict):
+                raise ValueError("Ожидается JSON-объект")
+            return record
+        self._csv_lines.extend(line + "\n" for line in lines)
+        try:
+            values = next(self._csv_reader)
+        finally:
+            self._csv_lines.clear()
+        if self._header is None:
+            self._header = [name.strip() for name in values]
+            return None
+        record = dict(zip(self._header, values))
+        genres = record.get("genres") or ""
+        record["genres"] = [
+            name.strip() for name in genres.split(CSV_GENRE_SEPARATOR) if name.strip()
+        ]
+        for key in ("author_id", "author"):
+            if not record.get(key):
+                record.pop(key, None)
+        return record
+
+    def feed(self, line_no: int, line: str) -> bool:
+        """
+        Добавляет строку входных данных.
+
+        Запись CSV с незакрытой кавычкой (поле с переводом строки)
+        накапливается до строки, закрывающей кавычку; в отчете она
+        указывается номером первой строки.
+
+        Args:
+            line_no: Номер строки.
+            line: Текст строки без перевода строки.
+
+        Returns:
+            bool: True, если накоплен полный пакет.
+        """
+        if self._record_lines:
+            self._record_lines.append(line.rstrip("\r"))
+            self._record_size += len(line)
+            # Запись длиннее field_size_limit разбирается сразу: csv.reader ее отклонит
+            if (_ends_in_quotes(line, quoted=True)
+                    and self._record_size <= csv.field_size_limit()):
+                return False
+            lines, self._record_lines = self._record_lines, []
+            return self._add(self._record_start, lines)
+        if not line.strip():
+            return False
+        if self.fmt == "csv" and '"' in line and _ends_in_quotes(line, quoted=False):
+            self._record_lines = [line.lstrip().rstrip("\r")]
+            self._record_start, self._record_size = line_no, len(line)
+            return False
+        return self._add(line_no, [line.strip()])
+
+    def finish(self) -> None:
+        """
+        Учитывает незавершенную запись CSV в конце потока.
+        """
+        if self._record_lines:
+            lines, self._record_lines = self._record_lines, []
+            self._add(self._record_start, lines)
+
+    def _add(self, line_no: int, lines: list[str]) -> bool:
+        try:
+            record = self._parse(lines)
+        except (ValueError, csv.Error) as exc:
+            self.report.received += 1
+            self._add_errors([ImportRowError(line=line_no, errors=[str(exc)])])
+            return False
+        if record is not None:
+            self.report.received += 1
+            self._pending.append((line_no, record))
+        return len(self._pending) >= BATCH_SIZE
+
+    def take_batch(self) -> list[tuple[int, BookImport]]:
+        """
+        Проверяет накопленные строки и возвращает корректные.
+
+        Весь пакет проверяется одним вызовом TypeAdapter; при ошибках
+        некорректные строки попадают в отчет, остальные проверяются повторно.
+
+        Returns:
+            list[tuple[int, BookImport]]: Пары (номер строки, данные книги).
+        """
+        pending, self._pending = self._pending, []
+        if not pending:
+            return []
+        try:
+            books = _BATCH_ADAPTER.validate_python([record for _, record in pending])
+            return [(line, book) for (line, _), book in zip(pending, books)]
+        except ValidationError as exc:
+            failed: dict[int, list[str]] = {}
+            for error in exc.errors():
+                index = error["loc"][0]
+                field = ".".join(str(part) for part in error["loc"][1:])
+                failed.setdefault(index, []).append(
+                    f"{field}: {error['msg']}" if field else error["msg"]
+                )
+        self._add_errors(
+            ImportRowError(line=pending[index][0], errors=messages)
+            for index, messages in sorted(failed.items())
+        )
+        valid = [item for index, item in enumerate(pending) if index not in failed]
+        books = _BATCH_ADAPTER.validate_python([record for _, record in valid])
+        return [(line, book) for (line, _), book in zip(valid, books)]
+
+    def record(self, result: tuple[int, int, list[ImportRowError]]) -> None:
+        """
+        Учитывает результат записи пакета в отчете.
+
+        Args:
+            result: Результат crud.import_books_batch.
+        """
+        inserted, skipped, errors = result
+        self.report.inserted += inserted
+        self.report.skipped += skipped
+        self._add_errors(errors)
+
+
+def import_books(db: Session, lines: Iterable[str], fmt: str) -> ImportReport:
+    """
+    Импортирует книги из итератора строк, фиксируя каждый пакет.
+
+    Args:
+        db: Сессия базы данных.
+        lines: Строки входных данных.
+        fmt: Формат: ndjson или csv.
+
+    Returns:
+        ImportReport: Отчет об импорте.
+    """
+    importer = BookImporter(fmt)
+    for line_no, line in enumerate(lines, start=1):
+        if importer.feed(line_no, line.rstrip("\n")):
+            importer.record(crud.import_books_batch(db, importer.take_batch()))
+            db.commit()
+    importer.finish()
+    importer.record(crud.import_books_batch(db, importer.take_batch()))
+    db.commit()
+    return importer.report
+
+
+async def aiter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Разбивает поток байтов UTF-8 на строки.
+
+    Args:
+        chunks: Асинхронный поток фрагментов тела запроса.
+
+    Yields:
+        str: Очередная строка без перевода строки.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+async def import_books_stream(
+        db: AsyncSession,
+        chunks: AsyncIterator[bytes],
+        fmt: str
+) -> ImportReport:
+    """
+    Импортирует книги из асинхронного потока, фиксируя каждый пакет.
+
+    Args:
+        db: Асинхронная сессия базы данных.
+        chunks: Поток фрагментов тела запроса.
+        fmt: Формат: ndjson или csv.
+
+    Returns:
+        ImportReport: Отчет об импорте.
+    """
+    importer = BookImporter(fmt)
+    line_no = 0
+    async for line in aiter_lines(chunks):
+        line_no += 1
+        if importer.feed(line_no, line):
+            importer.record(await crud.aio.import_books_batch(db, importer.take_batch()))
+            await db.commit()
+    importer.finish()
+    importer.record(await crud.aio.import_books_batch(db, importer.take_batch()))
+    await db.commit()
+    return importer.report
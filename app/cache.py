@@ -0,0 +1,469 @@
+"""
+Кэш ответов GET-эндпоинтов с инвалидацией по тегам.
+
+Ответ сохраняется уже сериализованным в JSON под ключом «эндпоинт + параметры»
+и помечается тегами сущностей, из которых он собран (например, "author:1").
+CRUD-функции записи регистрируют затронутые теги через invalidate_on_commit;
+после фиксации транзакции записи с этими тегами удаляются из кэша.
+
+Вместе с ответом хранится его ETag (app.etag), поэтому условный запрос
+к закэшированному ресурсу получает 304 без обращения к базе.
+
+Хранилище подключаемое: по умолчанию — LRU в памяти процесса с TTL,
+при заданном CACHE_URL — общий Redis (требуется пакет redis).
+Настройки: CACHE_TTL (секунды, 0 отключает кэш), CACHE_MAX_ENTRIES, CACHE_URL.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from functools import wraps
+from typing import Any
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.crud.utils import PENDING_CACHE_TAGS, cache_tag, invalidate_on_commit
+from app.etag import EtagFunc, conditional, etag_matches, not_modified
+from app.metrics import serialization
+from app.serializers import dumps
+
+try:
+    import redis
+except ImportError:     # pragma: no cover - необязательная зависимость
+    redis = None
+
+CACHE_URL = os.getenv("CACHE_URL")
+logger = logging.getLogger("app.cache")
+CACHE_TTL = int(os.getenv("CACHE_TTL", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+
+__all__ = [
+    "cache_tag", "invalidate_on_commit", "cached", "response_cache", "register_tagged_cache",
+    "CacheBackend", "LocalCache", "RedisCache", "ResponseCache"
+]
+
+
+class CacheBackend:
+    """
+    Интерфейс хранилища кэша.
+
+    Хранилище ведет номер инвалидации (generation): значение, собранное
+    до инвалидации, не сохраняется, даже если инвалидацию выполнил другой
+    процесс с тем же хранилищем.
+    """
+
+    def get(self, key: str) -> bytes | None:
+        """Возвращает значение по ключу или None."""
+        raise NotImplementedError
+
+    def set(
+            self,
+            key: str,
+            value: bytes,
+            tags: Iterable[str],
+            ttl: float | None = None,
+            generation: int | None = None
+    ) -> None:
+        """
+        Сохраняет значение с тегами.
+
+        ttl укорачивает время жизни записи; при заданном generation значение
+        не сохраняется, если с тех пор хранилище инвалидировалось.
+        """
+        raise NotImplementedError
+
+    def generation(self) -> int:
+        """Возвращает текущий номер инвалидации."""
+        raise NotImplementedError
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Удаляет записи с любым из тегов и возвращает их количество."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Удаляет все записи."""
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        """Возвращает счетчики хранилища."""
+        return {}
+
+
+class LocalCache(CacheBackend):
+    """
+    LRU-кэш в памяти процесса с ограничением по числу записей и TTL.
+
+    Атрибуты:
+        max_entries (int): Максимальное число записей
+        ttl (float): Время жизни записи в секундах
+        evictions (int): Записи, вытесненные из-за переполнения
+        expirations (int): Записи, удаленные по истечении TTL
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self.expirations = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Any, frozenset[str]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+
+    def _remove(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(
+            self,
+            key: str,
+            value: Any,
+            tags: Iterable[str],
+            ttl: float | None = None,
+            generation: int | None = None
+    ) -> None:
+        tags = frozenset(tags)
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def generation(self) -> int:
+        return self._generation
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+                    removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class RedisCache(CacheBackend):
+    """
+    Общий кэш в Redis для нескольких процессов приложения.
+
+    Теги хранятся множествами ключей; вытеснение и TTL выполняет сам Redis.
+    Номер инвалидации хранится в Redis (INCR), запись проверяет его
+    под WATCH, поэтому ответ, собранный до инвалидации в любом процессе,
+    не сохраняется. Ошибки Redis (таймаут, обрыв соединения) записываются
+    в журнал и считаются промахом: ответ собирается из базы.
+
+    Атрибуты:
+        ttl (int): Время жизни записи в секундах
+    """
+
+    def __init__(self, url: str, ttl: int = CACHE_TTL, prefix: str = "cache:"):
+        if redis is None:
+            raise RuntimeError("Для CACHE_URL требуется пакет redis")
+        self.ttl = ttl
+        self._prefix = prefix
+        self._generation_key = prefix + "generation"
+        self._client = redis.Redis.from_url(url, socket_timeout=0.1)
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self._client.get(self._prefix + key)
+        except redis.RedisError as exc:
+            logger.warning("Кэш Redis недоступен: %s", exc)
+            return None
+
+    def set(
+            self,
+            key: str,
+            value: bytes,
+            tags: Iterable[str],
+            ttl: float | None = None,
+            generation: int | None = None
+    ) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._client.pipeline() as pipe:
+            try:
+                if generation is not None:
+                    pipe.watch(self._generation_key)
+                    if int(pipe.get(self._generation_key) or 0) != generation:
+                        return
+                    pipe.multi()
+                pipe.set(self._prefix + key, value, px=max(1, int(ttl * 1000)))
+                for tag in tags:
+                    pipe.sadd(self._prefix + tag, self._prefix + key)
+                    pipe.expire(self._prefix + tag, self.ttl)
+                pipe.execute()
+            except redis.WatchError:
+                # Инвалидация между проверкой номера и записью
+                return
+            except redis.RedisError as exc:
+                logger.warning("Ответ не сохранен в кэш Redis: %s", exc)
+
+    def generation(self) -> int:
+        try:
+            return int(self._client.get(self._generation_key) or 0)
+        except redis.RedisError as exc:
+            logger.warning("Кэш Redis недоступен: %s", exc)
+            # Не совпадает ни с одним номером: ответ не будет сохранен
+            return -1
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        removed = 0
+        try:
+            self._client.incr(self._generation_key)
+            for tag in tags:
+                keys = self._client.smembers(self._prefix + tag)
+                if keys:
+                    removed += self._client.delete(*keys)
+                self._client.delete(self._prefix + tag)
+        except redis.RedisError as exc:
+            logger.error("Кэш Redis не сброшен по тегам: %s", exc)
+        return removed
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=self._prefix + "*"):
+            if key != self._generation_key.encode():
+                self._client.delete(key)
+
+
+class ResponseCache:
+    """
+    Кэш ответов: хранилище и счетчики попаданий.
+
+    Атрибуты:
+        backend (CacheBackend): Хранилище записей
+        enabled (bool): Кэширование включено
+        hits (int): Ответы, отданные из кэша
+        misses (int): Ответы, собранные обработчиком
+        invalidations (int): Записи, удаленные при изменении данных
+    """
+
+    def __init__(self, backend: CacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        """Номер инвалидации хранилища, увеличивается при каждом сбросе тегов."""
+        return self.backend.generation()
+
+    def get(self, key: str) -> bytes | None:
+        """Возвращает сохраненный ответ и учитывает попадание или промах."""
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes, tags: Iterable[str], generation: int) -> None:
+        """
+        Сохраняет ответ с тегами.
+
+        Ответ, собранный до инвалидации (generation изменился), не сохраняется:
+        он мог прочитать данные до фиксации конкурентной записи. Проверку
+        выполняет хранилище, поэтому она учитывает инвалидации других процессов.
+        """
+        self.backend.set(key, value, tags, generation=generation)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Удаляет ответы, помеченные любым из тегов."""
+        self.invalidations += self.backend.invalidate(tags)
+
+    def clear(self) -> None:
+        """Удаляет все ответы и сбрасывает счетчики."""
+        self.backend.clear()
+        self.hits = self.misses = self.invalidations = 0
+
+    def stats(self) -> dict:
+        """
+        Возвращает счетчики кэша.
+
+        Returns:
+            dict: Попадания, промахи, инвалидации и счетчики хранилища.
+        """
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            **self.backend.stats(),
+        }
+
+
+def _build_backend() -> CacheBackend:
+    if CACHE_URL:
+        return RedisCache(CACHE_URL)
+    return LocalCache()
+
+
+response_cache = ResponseCache(_build_backend(), enabled=CACHE_TTL > 0)
+
+# Кэши в памяти процесса, которые тоже сбрасываются по тегам после фиксации
+_tagged_caches: list[LocalCache] = []
+
+
+def register_tagged_cache(cache: LocalCache) -> LocalCache:
+    """
+    Подключает локальный кэш к инвалидации по тегам после фиксации транзакций.
+
+    Args:
+        cache: Кэш, записи которого помечены тегами сущностей
+
+    Returns:
+        LocalCache: Тот же кэш
+    """
+    _tagged_caches.append(cache)
+    return cache
+
+
+def _key_part(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    return value
+
+
+def _pack(etag: str | None, content: bytes) -> bytes:
+    return (etag or "").encode() + b"\n" + content
+
+
+def _unpack(value: bytes) -> tuple[str | None, bytes]:
+    etag, content = value.split(b"\n", 1)
+    return etag.decode() or None, content
+
+
+def _json_response(content: bytes, etag: str | None, cache_status: str) -> Response:
+    headers = {"X-Cache": cache_status}
+    if etag:
+        headers["ETag"] = etag
+    return Response(content, media_type="application/json", headers=headers)
+
+
+def cached(
+        response_model: Any,
+        tags: Callable[[dict, Any], Iterable[str]],
+        etag: EtagFunc | None = None,
+        exclude_unset: bool = False,
+        exclude: Iterable[str] = ("db", "if_none_match"),
+        validate: bool = True
+) -> Callable:
+    """
+    Кэширует JSON-ответ асинхронного GET-обработчика.
+
+    Ключ строится из имени обработчика и его параметров (кроме exclude).
+    Кэшируются только успешные ответы: исключения обработчика не сохраняются.
+    Если задана функция ETag, ETag хранится вместе с ответом: при попадании
+    в кэш совпадение с If-None-Match дает 304 без обращения к базе.
+
+    Args:
+        response_model: Схема ответа, которой сериализуется результат
+        tags: Функция (параметры, проверенный ответ) -> теги записи;
+            при validate=False получает результат обработчика как есть
+        etag: Корутина (параметры обработчика) -> ETag (см. app.etag)
+        exclude_unset: Не выводить незаданные поля (как response_model_exclude_unset)
+        exclude: Параметры, не входящие в ключ
+        validate: Проверять результат схемой (см. app.etag.conditional)
+
+    Returns:
+        Callable: Декоратор обработчика
+    """
+    adapter = TypeAdapter(response_model)
+    exclude = frozenset(exclude)
+
+    def decorator(func: Callable) -> Callable:
+        name = f"{func.__module__}.{func.__qualname__}"
+        uncached = (
+            conditional(response_model, etag, exclude_unset, validate)(func) if etag else func
+        )
+
+        @wraps(func)
+        async def wrapper(**kwargs: Any) -> Any:
+            if not response_cache.enabled:
+                return await uncached(**kwargs)
+            if_none_match = kwargs.get("if_none_match")
+            params = {k: v for k, v in kwargs.items() if k not in exclude}
+            key = f"{name}:{sorted((k, _key_part(v)) for k, v in params.items())!r}"
+            value = response_cache.get(key)
+            if value is not None:
+                current, content = _unpack(value)
+                if current and etag_matches(if_none_match, current):
+                    return not_modified(current)
+                return _json_response(content, current, "HIT")
+
+            generation = response_cache.generation
+            current = await etag(kwargs) if etag else None
+            if current and etag_matches(if_none_match, current):
+                return not_modified(current)
+            result = await func(**kwargs)
+            with serialization():
+                if validate:
+                    result = adapter.validate_python(result, from_attributes=True)
+                    content = adapter.dump_json(result, exclude_unset=exclude_unset)
+                else:
+                    content = dumps(result)
+            response_cache.set(key, _pack(current, content), tags(params, result), generation)
+            return _json_response(content, current, "MISS")
+        return wrapper
+    return decorator
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    tags = session.info.pop(PENDING_CACHE_TAGS, None)
+    if tags:
+        response_cache.invalidate(tags)
+        for cache in _tagged_caches:
+            cache.invalidate(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(PENDING_CACHE_TAGS, None)
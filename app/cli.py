@@ -0,0 +1,121 @@
+"""
+Консольные команды обслуживания каталога книг.
+
+Запуск: python -m app.cli <команда>
+"""
+
+import argparse
+import sys
+
+from app.database import SessionLocal
+from app import bulk, crud
+
+
+def rebuild_ratings(_args: argparse.Namespace) -> None:
+    """
+    Пересчитывает агрегаты рейтинга книг по всем отзывам и рейтинги книг.
+
+    Args:
+        _args: Аргументы командной строки.
+    """
+    with SessionLocal() as db:
+        count = crud.rebuild_book_ratings(db)
+        crud.rebuild_leaderboards(db)
+        db.commit()
+    print(f"Агрегаты рейтинга пересчитаны для {count} книг")
+
+
+def rebuild_genre_counts(_args: argparse.Namespace) -> None:
+    """
+    Пересчитывает количество книг в жанрах по таблице book_genre.
+
+    Args:
+        _args: Аргументы командной строки.
+    """
+    with SessionLocal() as db:
+        count = crud.rebuild_genre_counts(db)
+        db.commit()
+    print(f"Количество книг пересчитано для {count} жанров")
+
+
+def rebuild_leaderboards(_args: argparse.Namespace) -> None:
+    """
+    Перестраивает рейтинги книг по агрегатам book_ratings.
+
+    Предназначена для запуска по расписанию (cron) в одном экземпляре:
+    перестройка заменяет все строки leaderboard_entries.
+
+    Args:
+        _args: Аргументы командной строки.
+    """
+    with SessionLocal() as db:
+        count = crud.rebuild_leaderboards(db)
+        db.commit()
+    print(f"Рейтинги перестроены: {count} строк")
+
+
+def import_books(args: argparse.Namespace) -> None:
+    """
+    Импортирует книги из файла NDJSON или CSV.
+
+    Args:
+        args: Аргументы командной строки (path, format).
+    """
+    stream = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8")
+    with stream, SessionLocal() as db:
+        report = bulk.import_books(db, stream, args.format)
+    print(report.model_dump_json(indent=2))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Создает разборщик аргументов командной строки.
+
+    Returns:
+        argparse.ArgumentParser: Настроенный разборщик с подкомандами.
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser(
+        "rebuild-ratings",
+        help="Пересчитать таблицу book_ratings по таблице reviews"
+    )
+    rebuild.set_defaults(handler=rebuild_ratings)
+
+    recount = commands.add_parser(
+        "rebuild-genre-counts",
+        help="Пересчитать genres.book_count по таблице book_genre"
+    )
+    recount.set_defaults(handler=rebuild_genre_counts)
+
+    leaderboards = commands.add_parser(
+        "rebuild-leaderboards",
+        help="Перестроить рейтинги книг (байесовская оценка и граница Уилсона)"
+    )
+    leaderboards.set_defaults(handler=rebuild_leaderboards)
+
+    importer = commands.add_parser(
+        "import-books",
+        help="Массово импортировать книги из NDJSON или CSV"
+    )
+    importer.add_argument("path", help="Путь к файлу или - для стандартного ввода")
+    importer.add_argument("--format", choices=bulk.FORMATS, default="ndjson")
+    importer.set_defaults(handler=import_books)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Точка входа консольных команд.
+
+    Args:
+        argv: Аргументы командной строки (по умолчанию sys.argv).
+    """
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,63 @@
 """
 Маркер, который сообщает интерпретатору, что каталог содержит код для модуля Python.
+
+Функции записи только сбрасывают изменения (flush): транзакция фиксируется
+один раз на запрос зависимостью get_db/get_async_db или вызывающим кодом.
 """
 
-from .user import get_user_by_username, get_user_by_email, create_user
-from .author import get_author, create_author, update_author, delete_author
-from .book import get_book, create_book
-from .genre import get_genre_by_name, create_genre, get_genres, delete_genre, get_genre
-from .review import create_review, get_reviews_by_book
+from .user import get_user_by_username, get_user_by_email, create_user, provision_users
+from .author import (
+    get_author, get_authors, get_authors_by_ids, create_author, update_author, delete_author
+)
+from .book import (
+    get_book, get_books, get_books_by_ids, get_books_by_genres, create_book, book_load_options,
+    BOOK_RELATION_LOADERS, book_export_statement, get_genre_names
+)
+from .genre import (
+    get_genre_by_name, create_genre, get_genres, get_genres_by_ids, delete_genre, get_genre
+)
+from .review import (
+    create_review, create_reviews_batch, get_user_review, rate_book, get_reviews_by_user,
+    get_reviews_by_book, get_reviews_by_ids
+)
+from .rating import (
+    apply_rating_deltas, apply_review_rating, rebuild_book_ratings, get_top_rated_books
+)
+from .genre_counts import apply_genre_count_deltas, rebuild_genre_counts
+from .tagging import add_book_genres, remove_book_genres, replace_book_genres
+from .ranking import (
+    RANKING_METHODS, get_leaderboard, rebuild_leaderboards, refresh_leaderboards,
+    mark_books_for_ranking
+)
+from .bulk import ensure_named, import_books_batch
+from .search import search_books
+from .versions import (
+    VERSIONED_MODELS, get_entity_version, get_book_versions, get_table_versions,
+    bump_table_versions
+)
+from .loaders import DATA_LOADERS, data_loader, loader
+from . import aio
 
 __all__ = [
-    "get_user_by_username", "get_user_by_email", "create_user",
-    "get_author", "create_author", "update_author", "delete_author",
-    "get_book", "create_book",
-    "get_genre_by_name", "create_genre", "get_genres", "delete_genre", "get_genre",
-    "create_review", "get_reviews_by_book"
+    "get_user_by_username", "get_user_by_email", "create_user", "provision_users",
+    "get_author", "get_authors", "get_authors_by_ids", "create_author", "update_author",
+    "delete_author",
+    "get_book", "get_books", "get_books_by_ids", "get_books_by_genres", "create_book",
+    "book_load_options",
+    "BOOK_RELATION_LOADERS", "book_export_statement", "get_genre_names",
+    "get_genre_by_name", "create_genre", "get_genres", "get_genres_by_ids", "delete_genre",
+    "get_genre",
+    "create_review", "create_reviews_batch", "get_user_review", "rate_book",
+    "get_reviews_by_user", "get_reviews_by_book", "get_reviews_by_ids",
+    "apply_rating_deltas", "apply_review_rating", "rebuild_book_ratings", "get_top_rated_books",
+    "apply_genre_count_deltas", "rebuild_genre_counts",
+    "add_book_genres", "remove_book_genres", "replace_book_genres",
+    "RANKING_METHODS", "get_leaderboard", "rebuild_leaderboards", "refresh_leaderboards",
+    "mark_books_for_ranking",
+    "ensure_named", "import_books_batch",
+    "search_books",
+    "VERSIONED_MODELS", "get_entity_version", "get_book_versions", "get_table_versions",
+    "bump_table_versions",
+    "DATA_LOADERS", "data_loader", "loader",
+    "aio"
 ]
@@ -0,0 +1,95 @@
+"""
+Модуль асинхронных версий CRUD-операций.
+
+Каждая функция выполняет одноименную синхронную операцию через
+AsyncSession.run_sync: запросы строятся в одном месте, а ввод-вывод
+выполняется асинхронным драйвером без блокировки цикла событий.
+"""
+
+from functools import wraps
+from typing import Any, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import (
+    author, book, bulk, genre, genre_counts, ranking, rating, review, search, tagging, user,
+    versions
+)
+
+
+def _run_sync(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Создает асинхронную обертку над синхронной CRUD-функцией.
+
+    Args:
+        func: Синхронная функция, первым аргументом принимающая Session.
+
+    Returns:
+        Callable: Корутина с той же сигнатурой, принимающая AsyncSession.
+    """
+    @wraps(func)
+    async def wrapper(db: AsyncSession, *args: Any, **kwargs: Any) -> Any:
+        return await db.run_sync(func, *args, **kwargs)
+    return wrapper
+
+
+get_user = _run_sync(user.get_user)
+get_user_by_email = _run_sync(user.get_user_by_email)
+get_user_by_username = _run_sync(user.get_user_by_username)
+create_user = _run_sync(user.create_user)
+provision_users = _run_sync(user.provision_users)
+update_user_password = _run_sync(user.update_user_password)
+set_user_password_hash = _run_sync(user.set_user_password_hash)
+
+get_author = _run_sync(author.get_author)
+get_authors = _run_sync(author.get_authors)
+get_authors_by_ids = _run_sync(author.get_authors_by_ids)
+create_author = _run_sync(author.create_author)
+update_author = _run_sync(author.update_author)
+delete_author = _run_sync(author.delete_author)
+
+get_book = _run_sync(book.get_book)
+get_books = _run_sync(book.get_books)
+get_books_by_ids = _run_sync(book.get_books_by_ids)
+get_books_by_genres = _run_sync(book.get_books_by_genres)
+create_book = _run_sync(book.create_book)
+get_genre_names = _run_sync(book.get_genre_names)
+
+get_genre = _run_sync(genre.get_genre)
+get_genre_by_name = _run_sync(genre.get_genre_by_name)
+get_genres = _run_sync(genre.get_genres)
+get_genres_by_ids = _run_sync(genre.get_genres_by_ids)
+create_genre = _run_sync(genre.create_genre)
+update_genre = _run_sync(genre.update_genre)
+delete_genre = _run_sync(genre.delete_genre)
+apply_genre_count_deltas = _run_sync(genre_counts.apply_genre_count_deltas)
+rebuild_genre_counts = _run_sync(genre_counts.rebuild_genre_counts)
+add_book_genres = _run_sync(tagging.add_book_genres)
+remove_book_genres = _run_sync(tagging.remove_book_genres)
+replace_book_genres = _run_sync(tagging.replace_book_genres)
+
+create_review = _run_sync(review.create_review)
+create_reviews_batch = _run_sync(review.create_reviews_batch)
+get_user_review = _run_sync(review.get_user_review)
+rate_book = _run_sync(review.rate_book)
+get_reviews_by_user = _run_sync(review.get_reviews_by_user)
+get_reviews_by_book = _run_sync(review.get_reviews_by_book)
+get_reviews_by_ids = _run_sync(review.get_reviews_by_ids)
+
+apply_rating_deltas = _run_sync(rating.apply_rating_deltas)
+apply_review_rating = _run_sync(rating.apply_review_rating)
+rebuild_book_ratings = _run_sync(rating.rebuild_book_ratings)
+get_top_rated_books = _run_sync(rating.get_top_rated_books)
+
+get_leaderboard = _run_sync(ranking.get_leaderboard)
+rebuild_leaderboards = _run_sync(ranking.rebuild_leaderboards)
+refresh_leaderboards = _run_sync(ranking.refresh_leaderboards)
+
+ensure_named = _run_sync(bulk.ensure_named)
+import_books_batch = _run_sync(bulk.import_books_batch)
+
+search_books = _run_sync(search.search_books)
+
+get_entity_version = _run_sync(versions.get_entity_version)
+get_book_versions = _run_sync(versions.get_book_versions)
+get_table_versions = _run_sync(versions.get_table_versions)
@@ -4,15 +4,29 @@
 Содержит функции для создания, чтения, обновления и удаления авторов в базе данных.
 """
 
+from collections.abc import Sequence
 from sqlalchemy.orm import Session
+from app import schemas
 from app.models import Author
 from app.schemas import AuthorCreate
+from app.pagination import KeysetPage, PageRequest, paginate
+from app.serializers import RowShape
+from app.crud.loaders import loader
+from app.crud.utils import (
+    BatchResult, cache_tag, id_in, invalidate_on_commit, ordered_batch
+)
+
+# Колонки строк списка авторов
+AUTHOR_ROW = RowShape(schemas.Author, Author, defaults=True)
 
 
 def get_author(db: Session, author_id: int) -> Author | None:
     """
     Получает автора по его идентификатору.
 
+    Повторные обращения в пределах сессии запроса не выполняют запрос
+    (загрузчик author из app.crud.loaders).
+
     Args:
         db: Сессия базы данных.
         author_id: Идентификатор автора.
@@ -20,7 +34,39 @@ def get_author(db: Session, author_id: int) -> Author | None:
     Returns:
         Author | None: Объект автора или None, если не найден.
     """
-    return db.query(Author).filter(Author.id == author_id).first()
+    return loader(db, "author").load(author_id)
+
+
+def get_authors(db: Session, page: PageRequest = PageRequest()) -> KeysetPage:
+    """
+    Получает страницу авторов, упорядоченных по идентификатору.
+
+    Args:
+        db: Сессия базы данных.
+        page: Курсор и размер страницы.
+
+    Returns:
+        KeysetPage: Словари авторов в форме схемы Author и курсор следующей страницы.
+    """
+    rows, next_cursor = paginate(
+        db.query(*AUTHOR_ROW.columns), [(Author.id, False)], page, key=lambda row: (row.id,)
+    )
+    return KeysetPage([AUTHOR_ROW.to_dict(row) for row in rows], next_cursor)
+
+
+def get_authors_by_ids(db: Session, ids: Sequence[int]) -> BatchResult:
+    """
+    Получает авторов по набору идентификаторов одним запросом.
+
+    Args:
+        db: Сессия базы данных.
+        ids: Идентификаторы авторов без повторов.
+
+    Returns:
+        BatchResult: Словари авторов в порядке ids и ненайденные идентификаторы.
+    """
+    rows = db.query(*AUTHOR_ROW.columns).filter(id_in(db, Author.id, ids))
+    return ordered_batch(ids, (AUTHOR_ROW.to_dict(row) for row in rows))
 
 
 def create_author(db: Session, author: AuthorCreate) -> Author:
@@ -36,8 +82,7 @@ def create_author(db: Session, author: AuthorCreate) -> Author:
     """
     db_author = Author(**author.dict())
     db.add(db_author)
-    db.commit()
-    db.refresh(db_author)
+    db.flush()
     return db_author
 
 
@@ -57,8 +102,8 @@ def update_author(db: Session, author_id: int, author: AuthorCreate) -> Author |
     if db_author:
         for key, value in author.dict().items():
             setattr(db_author, key, value)
-        db.commit()
-        db.refresh(db_author)
+        db.flush()
+        invalidate_on_commit(db, cache_tag("author", author_id))
     return db_author
 
 
@@ -76,5 +121,6 @@ def delete_author(db: Session, author_id: int) -> Author | None:
     db_author = get_author(db, author_id)
     if db_author:
         db.delete(db_author)
-        db.commit()
+        db.flush()
+        invalidate_on_commit(db, cache_tag("author", author_id))
     return db_author
@@ -4,23 +4,216 @@
 Содержит функции для создания и чтения книг в базе данных.
 """
 
-from sqlalchemy.orm import Session
-from app.models import Book
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from sqlalchemy import Row, Select, exists, select
+from sqlalchemy.orm import Query, Session, joinedload, raiseload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+from app import schemas
+from app.models import Author, Book, Genre
+from app.models.genre import book_genre
 from app.schemas import BookCreate
+from app.pagination import KeysetPage, PageRequest, paginate
+from app.serializers import RowShape
+from app.crud.loaders import loader
+from app.crud.utils import BatchResult, id_in, ordered_batch
 
+# Стратегии загрузки связей книги, выбираемые параметром include=
+BOOK_RELATION_LOADERS = {
+    "author": lambda: joinedload(Book.author),
+    "genres": lambda: selectinload(Book.genres),
+    "reviews": lambda: selectinload(Book.reviews),
+}
 
-def get_book(db: Session, book_id: int) -> Book | None:
+# Колонки строк списков книг и автора (ответы без незаданных полей)
+BOOK_ROW = RowShape(schemas.BookDetail, Book)
+BOOK_AUTHOR_ROW = RowShape(schemas.Author, Author, prefix="author__")
+
+
+def book_load_options(include: Iterable[str] = ()) -> list[LoaderOption]:
+    """
+    Формирует опции загрузки связей книги.
+
+    Запрошенные связи загружаются заранее, обращение к остальным
+    завершается ошибкой вместо скрытого запроса на каждую строку.
+
+    Args:
+        include: Имена связей из BOOK_RELATION_LOADERS.
+
+    Returns:
+        list[LoaderOption]: Опции для Query.options().
+    """
+    options = [BOOK_RELATION_LOADERS[name]() for name in sorted(set(include))]
+    options.append(raiseload("*"))
+    return options
+
+
+def get_book(db: Session, book_id: int, include: Iterable[str] = ()) -> Book | None:
     """
     Получает книгу по её идентификатору.
 
     Args:
         db: Сессия базы данных.
         book_id: Идентификатор книги.
+        include: Связи, загружаемые вместе с книгой.
 
     Returns:
         Book | None: Объект книги или None, если не найдена.
     """
-    return db.query(Book).filter(Book.id == book_id).first()
+    return (
+        db.query(Book)
+        .options(*book_load_options(include))
+        .filter(Book.id == book_id)
+        .first()
+    )
+
+
+def book_rows_query(db: Session, include: Iterable[str] = ()) -> Query:
+    """
+    Формирует запрос колонок книг для списков.
+
+    Автор, если он запрошен, присоединяется в том же запросе колонками
+    с префиксом author__.
+
+    Args:
+        db: Сессия базы данных.
+        include: Связи, выводимые вместе с книгами.
+
+    Returns:
+        Query: Запрос колонок BOOK_ROW (и BOOK_AUTHOR_ROW).
+    """
+    query = db.query(*BOOK_ROW.columns)
+    if "author" in include:
+        query = (
+            query.add_columns(*BOOK_AUTHOR_ROW.columns)
+            .outerjoin(Author, Author.id == Book.author_id)
+        )
+    return query
+
+
+def book_rows(db: Session, rows: Sequence[Row], include: Iterable[str] = ()) -> list[dict]:
+    """
+    Собирает словари книг из строк book_rows_query.
+
+    Жанры и отзывы, если они запрошены, выбираются загрузчиками
+    book_genre_rows и book_review_rows: один запрос на связь для всех
+    книг, еще не загруженных в этой сессии.
+
+    Args:
+        db: Сессия базы данных.
+        rows: Строки запроса book_rows_query.
+        include: Связи, выводимые вместе с книгами.
+
+    Returns:
+        list[dict]: Книги в форме схемы BookDetail.
+    """
+    books = [BOOK_ROW.to_dict(row) for row in rows]
+    if "author" in include:
+        for book, row in zip(books, rows):
+            book["author"] = (
+                None if row.author__id is None
+                else BOOK_AUTHOR_ROW.to_dict(row, len(BOOK_ROW))
+            )
+    for relation, name in (("genres", "book_genre_rows"), ("reviews", "book_review_rows")):
+        if relation in include:
+            values = loader(db, name).load_many(book["id"] for book in books)
+            for book, value in zip(books, values):
+                book[relation] = value
+    return books
+
+
+def get_books(
+        db: Session,
+        page: PageRequest = PageRequest(),
+        include: Iterable[str] = ()
+) -> KeysetPage:
+    """
+    Получает страницу книг, упорядоченных по идентификатору.
+
+    Выбираются только колонки, ORM-объекты не создаются.
+
+    Args:
+        db: Сессия базы данных.
+        page: Курсор и размер страницы.
+        include: Связи, выводимые вместе с книгами.
+
+    Returns:
+        KeysetPage: Словари книг в форме схемы BookDetail и курсор следующей страницы.
+    """
+    rows, next_cursor = paginate(
+        book_rows_query(db, include),
+        [(Book.id, False)],
+        page,
+        key=lambda row: (row.id,)
+    )
+    return KeysetPage(book_rows(db, rows, include), next_cursor)
+
+
+def get_books_by_genres(
+        db: Session,
+        genre_ids: Sequence[int],
+        page: PageRequest = PageRequest(),
+        include: Iterable[str] = ()
+) -> KeysetPage | None:
+    """
+    Получает страницу книг, входящих во все указанные жанры.
+
+    Страница читается по обратному индексу (genre_id, book_id) жанра
+    с наименьшим book_count; принадлежность остальным жанрам проверяется
+    поиском по первичному ключу book_genre (book_id, genre_id). Стоимость
+    страницы ограничена числом просмотренных строк самого редкого жанра
+    и не зависит от общего числа связей.
+
+    Args:
+        db: Сессия базы данных.
+        genre_ids: Идентификаторы жанров без повторов.
+        page: Курсор (идентификатор книги) и размер страницы.
+        include: Связи, выводимые вместе с книгами.
+
+    Returns:
+        KeysetPage | None: Словари книг в форме схемы BookDetail и курсор
+            следующей страницы или None, если какой-либо жанр не найден.
+    """
+    genres = loader(db, "genre").load_many(genre_ids)
+    if any(genre is None for genre in genres):
+        return None
+    driver, *others = sorted(genres, key=lambda genre: (genre.book_count, genre.id))
+    links = book_genre.alias("links")
+    query = (
+        book_rows_query(db, include)
+        .join(links, links.c.book_id == Book.id)
+        .filter(links.c.genre_id == driver.id)
+    )
+    for genre in others:
+        member = book_genre.alias(f"genre_{genre.id}")
+        query = query.filter(exists().where(
+            member.c.book_id == links.c.book_id, member.c.genre_id == genre.id
+        ))
+    rows, next_cursor = paginate(
+        query, [(links.c.book_id, False)], page, key=lambda row: (row.id,)
+    )
+    return KeysetPage(book_rows(db, rows, include), next_cursor)
+
+
+def get_books_by_ids(
+        db: Session,
+        ids: Sequence[int],
+        include: Iterable[str] = ()
+) -> BatchResult:
+    """
+    Получает книги по набору идентификаторов одним запросом (и по запросу на связь).
+
+    Args:
+        db: Сессия базы данных.
+        ids: Идентификаторы книг без повторов.
+        include: Связи, выводимые вместе с книгами.
+
+    Returns:
+        BatchResult: Словари книг в форме схемы BookDetail в порядке ids
+            и ненайденные идентификаторы.
+    """
+    rows = book_rows_query(db, include).filter(id_in(db, Book.id, ids)).all()
+    return ordered_batch(ids, book_rows(db, rows, include))
 
 
 def create_book(db: Session, book: BookCreate) -> Book:
@@ -36,6 +229,57 @@ def create_book(db: Session, book: BookCreate) -> Book:
     """
     db_book = Book(**book.dict())
     db.add(db_book)
-    db.commit()
-    db.refresh(db_book)
+    db.flush()
     return db_book
+
+
+def book_export_statement(year_from: int | None = None, year_to: int | None = None) -> Select:
+    """
+    Формирует запрос строк выгрузки каталога.
+
+    Выбираются только колонки (без ORM-объектов) вместе с именем автора,
+    строки упорядочены по идентификатору книги.
+
+    Args:
+        year_from: Минимальный год публикации включительно.
+        year_to: Максимальный год публикации включительно.
+
+    Returns:
+        Select: Запрос колонок id, title, publication_year, isbn, author_id, author.
+    """
+    stmt = (
+        select(
+            Book.id, Book.title, Book.publication_year, Book.isbn, Book.author_id,
+            Author.name.label("author")
+        )
+        .outerjoin(Author, Book.author_id == Author.id)
+        .order_by(Book.id)
+    )
+    if year_from is not None:
+        stmt = stmt.where(Book.publication_year >= year_from)
+    if year_to is not None:
+        stmt = stmt.where(Book.publication_year <= year_to)
+    return stmt
+
+
+def get_genre_names(db: Session, book_ids: Iterable[int]) -> dict[int, list[str]]:
+    """
+    Получает названия жанров для набора книг одним запросом.
+
+    Args:
+        db: Сессия базы данных.
+        book_ids: Идентификаторы книг.
+
+    Returns:
+        dict[int, list[str]]: Отсортированные названия жанров по идентификатору книги.
+    """
+    rows = db.execute(
+        select(book_genre.c.book_id, Genre.name)
+        .join(Genre, Genre.id == book_genre.c.genre_id)
+        .where(book_genre.c.book_id.in_(list(book_ids)))
+        .order_by(book_genre.c.book_id, Genre.name)
+    )
+    names = defaultdict(list)
+    for book_id, name in rows:
+        names[book_id].append(name)
+    return names
@@ -0,0 +1,103 @@
+"""
+Модуль для массовых операций записи в каталог.
+
+Содержит пакетную вставку книг с разрешением имен авторов и жанров
+в идентификаторы фиксированным числом запросов на пакет.
+"""
+
+from collections import Counter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models import Author, Book, Genre
+from app.models.genre import book_genre
+from app.schemas import BookImport, ImportRowError
+from app.crud.genre_counts import apply_genre_count_deltas
+from app.crud.utils import dialect_insert
+
+
+def ensure_named(db: Session, model, names: set[str]) -> dict[str, int]:
+    """
+    Создает недостающие записи по уникальному имени и возвращает их идентификаторы.
+
+    Выполняет один INSERT ... ON CONFLICT DO NOTHING и один SELECT.
+
+    Args:
+        db: Сессия базы данных.
+        model: Модель с уникальным столбцом name (Author или Genre).
+        names: Имена для разрешения.
+
+    Returns:
+        dict[str, int]: Соответствие имени идентификатору.
+    """
+    if not names:
+        return {}
+    db.execute(
+        dialect_insert(db, model)
+        .values([{"name": name} for name in names])
+        .on_conflict_do_nothing(index_elements=[model.name])
+    )
+    rows = db.execute(select(model.name, model.id).where(model.name.in_(names)))
+    return dict(rows.all())
+
+
+def import_books_batch(
+        db: Session,
+        rows: list[tuple[int, BookImport]]
+) -> tuple[int, int, list[ImportRowError]]:
+    """
+    Вставляет пакет проверенных строк импорта книг.
+
+    Книги с уже существующим ISBN пропускаются. Транзакция не фиксируется.
+
+    Args:
+        db: Сессия базы данных.
+        rows: Пары (номер строки, проверенные данные книги).
+
+    Returns:
+        tuple[int, int, list[ImportRowError]]: Количество добавленных
+        и пропущенных книг и ошибки строк.
+    """
+    errors: list[ImportRowError] = []
+    author_ids = ensure_named(db, Author, {row.author for _, row in rows if row.author_id is None})
+    genre_ids = ensure_named(db, Genre, {name for _, row in rows for name in row.genres})
+
+    referenced = {row.author_id for _, row in rows if row.author_id is not None}
+    existing = set(db.scalars(select(Author.id).where(Author.id.in_(referenced)))) \
+        if referenced else set()
+
+    books: dict[str, dict] = {}
+    genres_by_isbn: dict[str, set[int]] = {}
+    for line, row in rows:
+        author_id = row.author_id if row.author_id is not None else author_ids[row.author]
+        if author_id not in existing and row.author_id is not None:
+            errors.append(ImportRowError(line=line, errors=[f"Автор {author_id} не найден"]))
+            continue
+        books.setdefault(row.isbn, {
+            "title": row.title,
+            "publication_year": row.publication_year,
+            "isbn": row.isbn,
+            "author_id": author_id,
+        })
+        genres_by_isbn.setdefault(row.isbn, set()).update(genre_ids[name] for name in row.genres)
+
+    if not books:
+        return 0, 0, errors
+
+    inserted = dict(db.execute(
+        dialect_insert(db, Book)
+        .values(list(books.values()))
+        .on_conflict_do_nothing(index_elements=[Book.isbn])
+        .returning(Book.isbn, Book.id)
+    ).all())
+
+    links = [
+        {"book_id": book_id, "genre_id": genre_id}
+        for isbn, book_id in inserted.items()
+        for genre_id in genres_by_isbn[isbn]
+    ]
+    if links:
+        db.execute(dialect_insert(db, book_genre).values(links).on_conflict_do_nothing())
+        apply_genre_count_deltas(db, Counter(link["genre_id"] for link in links))
+
+    valid_rows = len(rows) - len(errors)
+    return len(inserted), valid_rows - len(inserted), errors
@@ -5,16 +5,30 @@
 а также работы с ассоциативными таблицами.
 """
 
+from collections.abc import Sequence
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models import Genre
+from sqlalchemy import delete, func
+from app import schemas
+from app.models import Genre, LeaderboardEntry
 from app.schemas import GenreCreate
+from app.pagination import KeysetPage, PageRequest, paginate
+from app.serializers import RowShape
+from app.crud.loaders import loader
+from app.crud.utils import (
+    BatchResult, cache_tag, id_in, invalidate_on_commit, ordered_batch
+)
+
+# Колонки строк списка жанров
+GENRE_ROW = RowShape(schemas.Genre, Genre, defaults=True)
 
 
 def get_genre(db: Session, genre_id: int) -> Genre | None:
     """
     Получает жанр по его идентификатору.
 
+    Повторные обращения в пределах сессии запроса не выполняют запрос
+    (загрузчик genre из app.crud.loaders).
+
     Args:
         db: Сессия базы данных.
         genre_id: Идентификатор жанра.
@@ -22,7 +36,7 @@ def get_genre(db: Session, genre_id: int) -> Genre | None:
     Returns:
         Genre | None: Объект жанра или None, если не найден.
     """
-    return db.query(Genre).filter(Genre.id == genre_id).first()
+    return loader(db, "genre").load(genre_id)
 
 
 def get_genre_by_name(db: Session, name: str) -> Genre | None:
@@ -39,19 +53,36 @@ def get_genre_by_name(db: Session, name: str) -> Genre | None:
     return db.query(Genre).filter(func.lower(Genre.name) == func.lower(name)).first()
 
 
-def get_genres(db: Session, skip: int = 0, limit: int = 100) -> list[Genre]:
+def get_genres(db: Session, page: PageRequest = PageRequest()) -> KeysetPage:
+    """
+    Получает страницу жанров, упорядоченных по идентификатору.
+
+    Args:
+        db: Сессия базы данных.
+        page: Курсор и размер страницы.
+
+    Returns:
+        KeysetPage: Словари жанров в форме схемы Genre и курсор следующей страницы.
+    """
+    rows, next_cursor = paginate(
+        db.query(*GENRE_ROW.columns), [(Genre.id, False)], page, key=lambda row: (row.id,)
+    )
+    return KeysetPage([GENRE_ROW.to_dict(row) for row in rows], next_cursor)
+
+
+def get_genres_by_ids(db: Session, ids: Sequence[int]) -> BatchResult:
     """
-    Получает список жанров с пагинацией.
+    Получает жанры по набору идентификаторов одним запросом.
 
     Args:
         db: Сессия базы данных.
-        skip: Количество пропускаемых записей.
-        limit: Максимальное количество возвращаемых записей.
+        ids: Идентификаторы жанров без повторов.
 
     Returns:
-        list[Genre]: Список объектов жанров.
+        BatchResult: Словари жанров в порядке ids и ненайденные идентификаторы.
     """
-    return db.query(Genre).offset(skip).limit(limit).all()
+    rows = db.query(*GENRE_ROW.columns).filter(id_in(db, Genre.id, ids))
+    return ordered_batch(ids, (GENRE_ROW.to_dict(row) for row in rows))
 
 
 def create_genre(db: Session, genre: GenreCreate) -> Genre:
@@ -67,8 +98,7 @@ def create_genre(db: Session, genre: GenreCreate) -> Genre:
     """
     db_genre = Genre(**genre.dict())
     db.add(db_genre)
-    db.commit()
-    db.refresh(db_genre)
+    db.flush()
     return db_genre
 
 
@@ -87,14 +117,14 @@ def update_genre(db: Session, genre_id: int, genre: GenreCreate) -> Genre | None
     db_genre = get_genre(db, genre_id)
     if db_genre:
         db_genre.name = genre.name
-        db.commit()
-        db.refresh(db_genre)
+        db.flush()
+        invalidate_on_commit(db, cache_tag("genre", genre_id))
     return db_genre
 
 
 def delete_genre(db: Session, genre_id: int) -> Genre | None:
     """
-    Удаляет жанр из базы данных.
+    Удаляет жанр из базы данных вместе с его рейтингом книг.
 
     Args:
         db: Сессия базы данных.
@@ -106,5 +136,9 @@ def delete_genre(db: Session, genre_id: int) -> Genre | None:
     db_genre = get_genre(db, genre_id)
     if db_genre:
         db.delete(db_genre)
-        db.commit()
+        db.execute(delete(LeaderboardEntry).where(
+            LeaderboardEntry.board == "genre", LeaderboardEntry.board_key == genre_id
+        ))
+        db.flush()
+        invalidate_on_commit(db, cache_tag("genre", genre_id))
     return db_genre
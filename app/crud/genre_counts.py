@@ -0,0 +1,114 @@
+"""
+Модуль для инкрементального учета количества книг в жанрах.
+
+Счетчик genres.book_count меняется в той же транзакции, что и связи
+book_genre: для изменений через ORM (Book.genres) — обработчиком after_flush,
+для массовых вставок связей — явным вызовом apply_genre_count_deltas.
+Изменение счетчика увеличивает версию жанра и счетчик таблицы genres
+и сбрасывает кэш ответов жанра, поэтому ETag и кэш остаются согласованными.
+"""
+
+from collections import Counter
+from itertools import chain
+
+from sqlalchemy import case, event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Book, Genre
+from app.models.genre import book_genre
+from app.crud.utils import cache_tag, id_in, invalidate_on_commit
+from app.crud.versions import bump_table_versions
+
+_EXPIRE_GENRES = "genre_counts_expire"
+
+genres_table = Genre.__table__
+
+
+def _update_counts(db: Session, deltas: dict[int, int]) -> set[int]:
+    deltas = {genre_id: delta for genre_id, delta in deltas.items() if delta}
+    if not deltas:
+        return set()
+    db.connection().execute(
+        update(genres_table)
+        .where(id_in(db, genres_table.c.id, deltas))
+        .values(
+            book_count=genres_table.c.book_count + case(deltas, value=genres_table.c.id, else_=0),
+            version=genres_table.c.version + 1,
+        )
+    )
+    bump_table_versions(db, ["genres"])
+    invalidate_on_commit(db, *(cache_tag("genre", genre_id) for genre_id in deltas))
+    return set(deltas)
+
+
+def apply_genre_count_deltas(db: Session, deltas: dict[int, int]) -> None:
+    """
+    Применяет приращения количества книг к жанрам одним UPDATE.
+
+    Выполняется в текущей транзакции, без фиксации. Загруженные в сессию
+    объекты жанров помечаются устаревшими и перечитываются при обращении.
+
+    Args:
+        db: Сессия базы данных.
+        deltas: Словарь genre_id -> приращение количества книг.
+    """
+    _expire_genres(db, _update_counts(db, deltas))
+
+
+def rebuild_genre_counts(db: Session) -> int:
+    """
+    Пересчитывает genres.book_count по таблице book_genre.
+
+    Используется для первичного заполнения и восстановления после расхождений.
+
+    Args:
+        db: Сессия базы данных.
+
+    Returns:
+        int: Количество пересчитанных жанров.
+    """
+    counted = (
+        select(func.count())
+        .where(book_genre.c.genre_id == genres_table.c.id)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(genres_table).values(book_count=counted, version=genres_table.c.version + 1)
+    )
+    _expire_genres(db, [genre.id for genre in db.identity_map.values()
+                        if isinstance(genre, Genre)])
+    return result.rowcount
+
+
+def _genre_deltas(session: Session) -> Counter:
+    deltas = Counter()
+    for book in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(book, Book):
+            continue
+        history = inspect(book).attrs.genres.history
+        if book in session.deleted:
+            removed = chain(history.unchanged or (), history.deleted or ())
+            deltas.update({genre.id: -1 for genre in removed})
+            continue
+        deltas.update({genre.id: 1 for genre in history.added or ()})
+        deltas.update({genre.id: -1 for genre in history.deleted or ()})
+    return deltas
+
+
+def _expire_genres(session: Session, genre_ids) -> None:
+    for genre_id in genre_ids:
+        genre = session.identity_map.get(session.identity_key(Genre, genre_id))
+        if genre is not None:
+            session.expire(genre, ["book_count", "version"])
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed(session: Session, _flush_context) -> None:
+    counted = _update_counts(session, _genre_deltas(session))
+    if counted:
+        session.info.setdefault(_EXPIRE_GENRES, set()).update(counted)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _expire_counted(session: Session, _flush_context) -> None:
+    _expire_genres(session, session.info.pop(_EXPIRE_GENRES, ()))
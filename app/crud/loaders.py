@@ -0,0 +1,177 @@
+"""
+Пакетные загрузчики сущностей в пределах сессии (в стиле DataLoader).
+
+Каждый загрузчик собирает запрошенные ключи, выбирает отсутствующие
+одним запросом и запоминает результат, включая отсутствие строки.
+Загрузчики хранятся в Session.info: сессия живет один HTTP-запрос
+(get_db/get_async_db), поэтому и кэш загрузчиков принадлежит запросу.
+Любая запись в сессии (flush, INSERT/UPDATE/DELETE, фиксация, откат)
+сбрасывает все загрузчики сессии.
+
+Загрузчики регистрируются декоратором data_loader и получаются функцией
+loader(db, name); CRUD-функции используют их вместо отдельных запросов.
+"""
+
+from collections import defaultdict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app import schemas
+from app.crud.utils import id_in
+from app.models import Author, Genre, Review
+from app.models.genre import book_genre
+from app.serializers import RowShape
+
+SESSION_LOADERS = "data_loaders"
+
+FetchFunc = Callable[[Session, list], dict]
+
+# Зарегистрированные функции выборки: имя загрузчика -> (сессия, ключи) -> {ключ: значение}
+DATA_LOADERS: dict[str, FetchFunc] = {}
+
+# Колонки связей книги в строках списков (ответы без незаданных полей)
+BOOK_GENRE_ROW = RowShape(schemas.Genre, Genre)
+BOOK_REVIEW_ROW = RowShape(schemas.Review, Review)
+
+
+class Loader:
+    """
+    Загрузчик значений по ключам с запоминанием в пределах сессии.
+
+    Attributes:
+        name: Имя загрузчика в DATA_LOADERS
+        queries: Количество выполненных выборок
+    """
+
+    def __init__(self, db: Session, name: str, fetch: FetchFunc) -> None:
+        """
+        Args:
+            db: Сессия базы данных
+            name: Имя загрузчика
+            fetch: Функция выборки значений по списку ключей
+        """
+        self.name = name
+        self.queries = 0
+        self._db = db
+        self._fetch = fetch
+        self._values: dict[Hashable, Any] = {}
+
+    def load_many(self, keys: Iterable[Hashable]) -> list:
+        """
+        Возвращает значения для ключей, выбирая незагруженные одним запросом.
+
+        Args:
+            keys: Ключи в нужном порядке (повторы допускаются)
+
+        Returns:
+            list: Значения в порядке ключей; None для отсутствующих
+        """
+        keys = list(keys)
+        missing = [key for key in dict.fromkeys(keys) if key not in self._values]
+        if missing:
+            self.queries += 1
+            found = self._fetch(self._db, missing)
+            for key in missing:
+                self._values[key] = found.get(key)
+        return [self._values[key] for key in keys]
+
+    def load(self, key: Hashable) -> Any:
+        """
+        Возвращает значение для одного ключа.
+
+        Args:
+            key: Ключ
+
+        Returns:
+            Any: Значение или None, если оно отсутствует
+        """
+        return self.load_many([key])[0]
+
+
+def data_loader(name: str) -> Callable[[FetchFunc], FetchFunc]:
+    """
+    Регистрирует функцию выборки загрузчика.
+
+    Args:
+        name: Имя загрузчика
+
+    Returns:
+        Callable: Декоратор функции (сессия, ключи) -> {ключ: значение}
+    """
+    def decorator(fetch: FetchFunc) -> FetchFunc:
+        DATA_LOADERS[name] = fetch
+        return fetch
+    return decorator
+
+
+def loader(db: Session, name: str) -> Loader:
+    """
+    Возвращает загрузчик сессии, создавая его при первом обращении.
+
+    Args:
+        db: Сессия базы данных
+        name: Имя зарегистрированного загрузчика
+
+    Returns:
+        Loader: Загрузчик, общий для всех CRUD-вызовов в этой сессии
+    """
+    loaders = db.info.setdefault(SESSION_LOADERS, {})
+    if name not in loaders:
+        loaders[name] = Loader(db, name, DATA_LOADERS[name])
+    return loaders[name]
+
+
+def _by_id(entity: type) -> FetchFunc:
+    def fetch(db: Session, ids: list) -> dict:
+        return {row.id: row for row in db.query(entity).filter(id_in(db, entity.id, ids))}
+    return fetch
+
+
+data_loader("author")(_by_id(Author))
+data_loader("genre")(_by_id(Genre))
+
+
+@data_loader("book_genre_rows")
+def _book_genre_rows(db: Session, book_ids: list) -> dict:
+    """Жанры книг в форме схемы Genre по идентификатору книги."""
+    genres = defaultdict(list)
+    rows = db.execute(
+        select(book_genre.c.book_id, *BOOK_GENRE_ROW.columns)
+        .join(Genre, Genre.id == book_genre.c.genre_id)
+        .where(id_in(db, book_genre.c.book_id, book_ids))
+        .order_by(book_genre.c.book_id, Genre.id)
+    )
+    for row in rows:
+        genres[row[0]].append(BOOK_GENRE_ROW.to_dict(row, 1))
+    return {book_id: genres.get(book_id, []) for book_id in book_ids}
+
+
+@data_loader("book_review_rows")
+def _book_review_rows(db: Session, book_ids: list) -> dict:
+    """Отзывы книг в форме схемы Review по идентификатору книги."""
+    reviews = defaultdict(list)
+    rows = db.execute(
+        select(*BOOK_REVIEW_ROW.columns)
+        .where(id_in(db, Review.book_id, book_ids))
+        .order_by(Review.id)
+    )
+    for row in rows:
+        review = BOOK_REVIEW_ROW.to_dict(row)
+        reviews[review["book_id"]].append(review)
+    return {book_id: reviews.get(book_id, []) for book_id in book_ids}
+
+
+@event.listens_for(Session, "after_flush")
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _reset_loaders(session: Session, *_args: Any) -> None:
+    session.info.pop(SESSION_LOADERS, None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _reset_on_write(state: ORMExecuteState) -> None:
+    if not state.is_select:
+        state.session.info.pop(SESSION_LOADERS, None)
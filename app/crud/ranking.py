@@ -0,0 +1,243 @@
+"""
+Модуль предрассчитанных рейтингов книг.
+
+Средняя оценка ставит книгу с единственной пятеркой выше книги с тысячей
+оценок 4.8. Здесь для каждой книги с оценками хранятся две устойчивые оценки:
+
+- байесовская средняя (C * m + сумма) / (C + количество), где m — средняя
+  оценка по всем отзывам, C — вес априорной оценки (RANKING_PRIOR_WEIGHT);
+- нижняя граница доверительного интервала Уилсона (RANKING_WILSON_Z)
+  для доли «положительности» оценки (оценка 1 — 0, оценка 5 — 1),
+  переведенная обратно в шкалу 1..5.
+
+Оценки записываются в leaderboard_entries для общего рейтинга, рейтинга
+каждого жанра книги и десятилетия ее публикации, поэтому страница рейтинга
+читается по индексу за O(limit).
+
+Обновление: книги с изменившимися оценками, жанрами или годом публикации
+накапливаются в сессии и пересчитываются перед фиксацией транзакции
+(RANKING_INCREMENTAL). Средняя m пересчитывается полной перестройкой
+rebuild_leaderboards командой python -m app.cli rebuild-leaderboards,
+которую планировщик (cron, в docker-compose — сервис leaderboards)
+запускает в одном месте, а не каждый процесс приложения.
+"""
+
+import os
+from collections.abc import Iterable
+
+from sqlalchemy import Float, cast, delete, event, func, inspect, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models import Book, BookRating, LeaderboardEntry, RankingParam
+from app.models.genre import book_genre
+from app.crud.book import book_rows, book_rows_query
+from app.crud.utils import dialect_insert, id_in
+from app.crud.versions import bump_table_versions
+from app.pagination import KeysetPage, PageRequest, paginate
+
+RANKING_PRIOR_WEIGHT = float(os.getenv("RANKING_PRIOR_WEIGHT", "10"))
+RANKING_WILSON_Z = float(os.getenv("RANKING_WILSON_Z", "1.96"))
+RANKING_INCREMENTAL = os.getenv("RANKING_INCREMENTAL", "true").lower() in ("1", "true", "yes")
+
+RANKING_METHODS = ("bayesian", "wilson")
+# Априорная средняя до первой полной перестройки
+DEFAULT_PRIOR_MEAN = 3.0
+
+_PENDING_BOOKS = "ranking_pending_books"
+
+entries_table = LeaderboardEntry.__table__
+
+
+def _scores(prior_mean: float) -> tuple:
+    count = cast(BookRating.review_count, Float)
+    total = cast(BookRating.rating_sum, Float)
+    bayesian = (RANKING_PRIOR_WEIGHT * prior_mean + total) / (RANKING_PRIOR_WEIGHT + count)
+    z2 = RANKING_WILSON_Z ** 2
+    positive = (total / count - 1) / 4
+    lower = (
+        positive + z2 / (2 * count)
+        - RANKING_WILSON_Z * func.sqrt((positive * (1 - positive) + z2 / (4 * count)) / count)
+    ) / (1 + z2 / count)
+    return bayesian, 1 + 4 * lower
+
+
+def _entries_select(db: Session, prior_mean: float, book_ids: Iterable[int] | None = None):
+    bayesian, wilson = _scores(prior_mean)
+    scored = BookRating.review_count > 0
+    if book_ids is not None:
+        scored = scored & id_in(db, BookRating.book_id, book_ids)
+    overall = select(literal("all"), literal(0), BookRating.book_id, bayesian, wilson).where(scored)
+    decade = (
+        select(
+            literal("decade"), Book.publication_year // 10 * 10, BookRating.book_id,
+            bayesian, wilson
+        )
+        .join(Book, Book.id == BookRating.book_id)
+        .where(scored, Book.publication_year.is_not(None))
+    )
+    genre = (
+        select(literal("genre"), book_genre.c.genre_id, BookRating.book_id, bayesian, wilson)
+        .join(book_genre, book_genre.c.book_id == BookRating.book_id)
+        .where(scored)
+    )
+    return union_all(overall, decade, genre)
+
+
+def _write_entries(db: Session, prior_mean: float, book_ids: Iterable[int] | None = None) -> int:
+    result = db.connection().execute(
+        entries_table.insert().from_select(
+            ["board", "board_key", "book_id", "bayesian", "wilson"],
+            _entries_select(db, prior_mean, book_ids)
+        )
+    )
+    bump_table_versions(db, ["leaderboard_entries"])
+    return result.rowcount
+
+
+def get_prior_mean(db: Session) -> float:
+    """
+    Получает априорную среднюю оценку байесовского рейтинга.
+
+    Args:
+        db: Сессия базы данных.
+
+    Returns:
+        float: Значение из последней полной перестройки или DEFAULT_PRIOR_MEAN.
+    """
+    value = db.scalar(select(RankingParam.value).where(RankingParam.name == "prior_mean"))
+    return DEFAULT_PRIOR_MEAN if value is None else value
+
+
+def rebuild_leaderboards(db: Session) -> int:
+    """
+    Полностью перестраивает рейтинги по агрегатам book_ratings.
+
+    Пересчитывает априорную среднюю по всем оценкам и оценки всех книг.
+    Выполняется в текущей транзакции, без фиксации.
+
+    Args:
+        db: Сессия базы данных.
+
+    Returns:
+        int: Количество записанных строк рейтингов.
+    """
+    db.info.pop(_PENDING_BOOKS, None)
+    prior_mean = db.execute(
+        select(
+            cast(func.sum(BookRating.rating_sum), Float)
+            / func.nullif(func.sum(BookRating.review_count), 0)
+        )
+    ).scalar() or DEFAULT_PRIOR_MEAN
+    stmt = dialect_insert(db, RankingParam).values(name="prior_mean", value=prior_mean)
+    db.connection().execute(stmt.on_conflict_do_update(
+        index_elements=[RankingParam.name], set_={"value": stmt.excluded.value}
+    ))
+    db.connection().execute(delete(entries_table))
+    return _write_entries(db, prior_mean)
+
+
+def refresh_leaderboards(db: Session, book_ids: Iterable[int]) -> int:
+    """
+    Пересчитывает строки рейтингов указанных книг.
+
+    Используется текущая априорная средняя, поэтому оценки остальных книг
+    остаются сопоставимыми до следующей полной перестройки.
+
+    Args:
+        db: Сессия базы данных.
+        book_ids: Идентификаторы книг.
+
+    Returns:
+        int: Количество записанных строк рейтингов.
+    """
+    book_ids = sorted(set(book_ids))
+    if not book_ids:
+        return 0
+    db.connection().execute(
+        delete(entries_table).where(id_in(db, entries_table.c.book_id, book_ids))
+    )
+    return _write_entries(db, get_prior_mean(db), book_ids)
+
+
+def mark_books_for_ranking(db: Session, book_ids: Iterable[int]) -> None:
+    """
+    Отмечает книги, строки рейтингов которых нужно пересчитать перед фиксацией.
+
+    Args:
+        db: Сессия, в которой изменены оценки или данные книг.
+        book_ids: Идентификаторы книг.
+    """
+    db.info.setdefault(_PENDING_BOOKS, set()).update(book_ids)
+
+
+def get_leaderboard(
+        db: Session,
+        board: str = "all",
+        board_key: int = 0,
+        method: str = "bayesian",
+        page: PageRequest = PageRequest(),
+        include: Iterable[str] = ()
+) -> KeysetPage:
+    """
+    Получает страницу рейтинга книг.
+
+    Читает leaderboard_entries по индексу (board, board_key, оценка DESC,
+    book_id), курсор содержит пару (оценка, идентификатор книги).
+
+    Args:
+        db: Сессия базы данных.
+        board: Вид рейтинга: all, genre или decade.
+        board_key: Жанр или первый год десятилетия; 0 для общего рейтинга.
+        method: Оценка для сортировки: bayesian или wilson.
+        page: Курсор и размер страницы.
+        include: Связи, выводимые вместе с книгами.
+
+    Returns:
+        KeysetPage: Словари книг в форме схемы BookDetail в порядке убывания
+            оценки и курсор следующей страницы.
+    """
+    score = getattr(LeaderboardEntry, method)
+    query = (
+        book_rows_query(db, include)
+        .add_columns(score.label("score"))
+        .join(LeaderboardEntry, LeaderboardEntry.book_id == Book.id)
+        .filter(LeaderboardEntry.board == board, LeaderboardEntry.board_key == board_key)
+    )
+    rows, next_cursor = paginate(
+        query,
+        [(score, True), (LeaderboardEntry.book_id, False)],
+        page,
+        key=lambda row: (row.score, row.id)
+    )
+    return KeysetPage(book_rows(db, rows, include), next_cursor)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed_books(session: Session, _flush_context) -> None:
+    changed = [
+        book.id for book in session.dirty
+        if isinstance(book, Book) and (
+            inspect(book).attrs.genres.history.has_changes()
+            or inspect(book).attrs.publication_year.history.has_changes()
+        )
+    ]
+    if changed:
+        mark_books_for_ranking(session, changed)
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_marked(session: Session) -> None:
+    if session.dirty:
+        # Фиксация сбрасывает изменения после before_commit: сбрасываем раньше,
+        # чтобы after_flush успел отметить книги
+        session.flush()
+    if _PENDING_BOOKS not in session.info:
+        return
+    book_ids = session.info.pop(_PENDING_BOOKS, ())
+    if RANKING_INCREMENTAL:
+        refresh_leaderboards(session, book_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_marked(session: Session) -> None:
+    session.info.pop(_PENDING_BOOKS, None)
@@ -0,0 +1,122 @@
+"""
+Модуль для операций с агрегатами рейтинга книг.
+
+Содержит функции инкрементального обновления таблицы book_ratings,
+ее полного пересчета и чтения топа книг по рейтингу.
+"""
+
+from collections.abc import Iterable
+from sqlalchemy import Float, cast, delete, func, insert, select
+from sqlalchemy.orm import Session
+from app.models import BookRating, Review
+from app.crud.ranking import get_leaderboard, mark_books_for_ranking
+from app.crud.utils import dialect_insert
+from app.pagination import KeysetPage, PageRequest
+
+
+def apply_rating_deltas(db: Session, deltas: dict[int, tuple[int, int]]) -> None:
+    """
+    Применяет приращения количества и суммы оценок к агрегатам книг.
+
+    Выполняется одним многострочным INSERT ... ON CONFLICT DO UPDATE
+    в текущей транзакции, без фиксации. Строки идут по возрастанию book_id,
+    чтобы параллельные пакеты блокировали агрегаты в одном порядке
+    и не взаимоблокировались. Рейтинги книг пересчитываются перед
+    фиксацией (app.crud.ranking).
+
+    Args:
+        db: Сессия базы данных.
+        deltas: Словарь book_id -> (приращение количества, приращение суммы).
+    """
+    if not deltas:
+        return
+
+    stmt = dialect_insert(db, BookRating).values([
+        {
+            "book_id": book_id,
+            "review_count": count,
+            "rating_sum": total,
+            "rating_avg": total / count if count else None,
+        }
+        for book_id, (count, total) in sorted(deltas.items())
+    ])
+    new_count = BookRating.review_count + stmt.excluded.review_count
+    new_sum = BookRating.rating_sum + stmt.excluded.rating_sum
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[BookRating.book_id],
+        set_={
+            "review_count": new_count,
+            "rating_sum": new_sum,
+            "rating_avg": cast(new_sum, Float) / func.nullif(new_count, 0),
+        },
+    )
+    db.execute(stmt)
+    mark_books_for_ranking(db, deltas)
+
+
+def apply_review_rating(db: Session, book_id: int, rating: int) -> None:
+    """
+    Учитывает одну новую оценку в агрегате книги.
+
+    Args:
+        db: Сессия базы данных.
+        book_id: Идентификатор книги.
+        rating: Оценка из нового отзыва.
+    """
+    apply_rating_deltas(db, {book_id: (1, rating)})
+
+
+def rebuild_book_ratings(db: Session) -> int:
+    """
+    Полностью пересчитывает таблицу book_ratings по таблице reviews.
+
+    Используется для первичного заполнения и восстановления после расхождений.
+
+    Args:
+        db: Сессия базы данных.
+
+    Returns:
+        int: Количество книг, для которых построен агрегат.
+    """
+    aggregates = (
+        select(
+            Review.book_id,
+            func.count(Review.rating),
+            func.sum(Review.rating),
+            cast(func.sum(Review.rating), Float) / func.count(Review.rating),
+        )
+        .where(Review.rating.is_not(None))
+        .group_by(Review.book_id)
+    )
+    db.execute(delete(BookRating))
+    result = db.execute(
+        insert(BookRating).from_select(
+            ["book_id", "review_count", "rating_sum", "rating_avg"],
+            aggregates,
+        )
+    )
+    return result.rowcount
+
+
+def get_top_rated_books(
+        db: Session,
+        page: PageRequest = PageRequest(),
+        include: Iterable[str] = ()
+) -> KeysetPage:
+    """
+    Получает страницу книг с наивысшим рейтингом.
+
+    Книги упорядочены по байесовской средней общего рейтинга
+    (app.crud.ranking): средняя оценка с единственной пятеркой не выводит
+    книгу на первое место. Курсор содержит пару (оценка, идентификатор книги).
+
+    Args:
+        db: Сессия базы данных.
+        page: Курсор и размер страницы.
+        include: Связи, выводимые вместе с книгами.
+
+    Returns:
+        KeysetPage: Словари книг в форме схемы BookDetail в порядке убывания
+            рейтинга и курсор следующей страницы.
+    """
+    return get_leaderboard(db, "all", 0, "bayesian", page, include)
@@ -4,38 +4,212 @@
 Содержит функции для создания и получения отзывов из базы данных.
 """
 
+from collections.abc import Sequence
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
-from app.models import Review
+from app import schemas
+from app.models import Book, Review
 from app.schemas import ReviewCreate
+from app.crud.rating import apply_rating_deltas, apply_review_rating
+from app.pagination import KeysetPage, PageRequest, paginate
+from app.serializers import RowShape
+from app.crud.utils import (
+    BatchResult, cache_tag, dialect_insert, id_in, invalidate_on_commit, ordered_batch
+)
 
+# Колонки строк пакета отзывов
+REVIEW_ROW = RowShape(schemas.Review, Review, defaults=True)
 
-def create_review(db: Session, review: ReviewCreate) -> Review:
+
+def create_review(
+        db: Session,
+        review: ReviewCreate,
+        user_id: int | None = None
+) -> tuple[Review, bool] | None:
     """
     Создает новый отзыв о книге в базе данных.
 
+    Отзыв вставляется через INSERT ... ON CONFLICT DO NOTHING по уникальному
+    индексу (user_id, book_id), поэтому конкурентный повторный отзыв
+    не завершается ошибкой целостности. В той же транзакции обновляет
+    агрегат рейтинга книги.
+
     Args:
         db: Сессия базы данных.
         review: Данные для создания отзыва.
+        user_id: Идентификатор автора отзыва.
+
+    Returns:
+        tuple[Review, bool] | None: Отзыв и признак создания (False — отзыв
+        пользователя о книге уже есть) или None, если книга не найдена.
+    """
+    if db.get(Book, review.book_id) is None:
+        return None
+    inserted = db.scalar(
+        dialect_insert(db, Review)
+        .values(**review.dict(), user_id=user_id)
+        .on_conflict_do_nothing(index_elements=[Review.user_id, Review.book_id])
+        .returning(Review.id)
+    )
+    if inserted is None:
+        return get_user_review(db, user_id, review.book_id), False
+    apply_review_rating(db, review.book_id, review.rating)
+    invalidate_on_commit(db, cache_tag("reviews", review.book_id))
+    return db.get(Review, inserted), True
+
+
+def create_reviews_batch(db: Session, reviews: Sequence[dict]) -> int:
+    """
+    Создает пакет отзывов многострочной вставкой.
+
+    Агрегаты рейтинга обновляются одним запросом на весь пакет,
+    а не по запросу на каждый отзыв.
+
+    Args:
+        db: Сессия базы данных.
+        reviews: Словари полей отзывов (book_id, user_id, rating, comment).
+
+    Returns:
+        int: Количество созданных отзывов.
+    """
+    if not reviews:
+        return 0
+    db.execute(insert(Review), list(reviews))
+    deltas: dict[int, tuple[int, int]] = {}
+    for review in reviews:
+        count, total = deltas.get(review["book_id"], (0, 0))
+        deltas[review["book_id"]] = (count + 1, total + review["rating"])
+    apply_rating_deltas(db, deltas)
+    invalidate_on_commit(db, *(cache_tag("reviews", book_id) for book_id in deltas))
+    return len(reviews)
+
+
+def get_user_review(db: Session, user_id: int, book_id: int) -> Review | None:
+    """
+    Получает отзыв пользователя о книге.
+
+    Args:
+        db: Сессия базы данных.
+        user_id: Идентификатор пользователя.
+        book_id: Идентификатор книги.
+
+    Returns:
+        Review | None: Отзыв или None, если пользователь не оценивал книгу.
+    """
+    return db.scalar(
+        select(Review).where(Review.user_id == user_id, Review.book_id == book_id)
+    )
+
+
+def rate_book(
+        db: Session,
+        user_id: int,
+        review: ReviewCreate
+) -> tuple[Review, bool] | None:
+    """
+    Создает отзыв пользователя о книге или обновляет существующий на месте.
+
+    Новый отзыв вставляется через INSERT ... ON CONFLICT DO NOTHING по
+    уникальному индексу (user_id, book_id); если отзыв уже есть, он
+    блокируется и обновляется, а агрегат рейтинга меняется на разницу оценок.
+
+    Args:
+        db: Сессия базы данных.
+        user_id: Идентификатор автора отзыва.
+        review: Оценка и комментарий.
+
+    Returns:
+        tuple[Review, bool] | None: Отзыв и признак создания
+        или None, если книга не найдена.
+    """
+    if db.get(Book, review.book_id) is None:
+        return None
+    invalidate_on_commit(db, cache_tag("reviews", review.book_id))
+    inserted = db.scalar(
+        dialect_insert(db, Review)
+        .values(**review.dict(), user_id=user_id)
+        .on_conflict_do_nothing(index_elements=[Review.user_id, Review.book_id])
+        .returning(Review.id)
+    )
+    if inserted is not None:
+        apply_review_rating(db, review.book_id, review.rating)
+        return db.get(Review, inserted), True
+
+    db_review = db.scalar(
+        select(Review)
+        .where(Review.user_id == user_id, Review.book_id == review.book_id)
+        .with_for_update()
+    )
+    delta = review.rating - db_review.rating
+    db_review.rating = review.rating
+    db_review.comment = review.comment
+    if delta:
+        apply_rating_deltas(db, {review.book_id: (0, delta)})
+    db.flush()
+    return db_review, False
+
+
+def get_reviews_by_user(
+        db: Session,
+        user_id: int,
+        page: PageRequest = PageRequest()
+) -> KeysetPage:
+    """
+    Получает страницу отзывов пользователя, начиная с последних.
+
+    Читается по индексу (user_id, id) без сортировки всех отзывов пользователя.
+
+    Args:
+        db: Сессия базы данных.
+        user_id: Идентификатор пользователя.
+        page: Курсор и размер страницы.
 
     Returns:
-        Review: Созданный объект отзыва.
+        KeysetPage: Словари отзывов страницы и курсор следующей.
     """
-    db_review = Review(**review.dict())
-    db.add(db_review)
-    db.commit()
-    db.refresh(db_review)
-    return db_review
+    rows, next_cursor = paginate(
+        db.query(*REVIEW_ROW.columns).filter(Review.user_id == user_id),
+        [(Review.id, True)],
+        page,
+        key=lambda row: (row.id,)
+    )
+    return KeysetPage([REVIEW_ROW.to_dict(row) for row in rows], next_cursor)
 
 
-def get_reviews_by_book(db: Session, book_id: int) -> list[Review]:
+def get_reviews_by_book(
+        db: Session,
+        book_id: int,
+        page: PageRequest = PageRequest()
+) -> KeysetPage:
     """
-    Получает все отзывы для указанной книги.
+    Получает страницу отзывов для указанной книги.
 
     Args:
         db: Сессия базы данных.
         book_id: Идентификатор книги.
+        page: Курсор и размер страницы.
+
+    Returns:
+        KeysetPage: Отзывы страницы и курсор следующей.
+    """
+    return paginate(
+        db.query(Review).filter(Review.book_id == book_id),
+        [(Review.id, False)],
+        page,
+        key=lambda review: (review.id,)
+    )
+
+
+def get_reviews_by_ids(db: Session, ids: Sequence[int]) -> BatchResult:
+    """
+    Получает отзывы по набору идентификаторов одним запросом.
+
+    Args:
+        db: Сессия базы данных.
+        ids: Идентификаторы отзывов без повторов.
 
     Returns:
-        list[Review]: Список отзывов для указанной книги.
+        BatchResult: Словари отзывов в порядке ids и ненайденные идентификаторы.
     """
-    return db.query(Review).filter(Review.book_id == book_id).all()
+    rows = db.query(*REVIEW_ROW.columns).filter(id_in(db, Review.id, ids))
+    return ordered_batch(ids, (REVIEW_ROW.to_dict(row) for row in rows))
@@ -0,0 +1,116 @@
+"""
+Модуль поиска книг по названию и имени автора.
+
+В PostgreSQL используются GIN-индексы tsvector и pg_trgm, для остальных
+баз — резервный индекс в памяти из app.search.
+"""
+
+from collections import defaultdict
+from sqlalchemy import Row, func, literal, literal_column, or_, select
+from sqlalchemy.orm import Session
+from app.models import Author, Book, Genre
+from app.models.book import SEARCH_CONFIG, search_vector
+from app.models.genre import book_genre
+from app.pagination import DEFAULT_PAGE_SIZE
+from app.search import AUTHOR_WEIGHT, SearchHit, memory_index, track_changes, words
+from .book import book_export_statement
+
+
+def _refresh_memory_index(db: Session) -> None:
+    track_changes()
+    generation = memory_index.generation
+    rows = db.execute(book_export_statement()).all()
+    genres = defaultdict(list)
+    for book_id, name in db.execute(
+            select(book_genre.c.book_id, Genre.name)
+            .join(Genre, Genre.id == book_genre.c.genre_id)
+    ):
+        genres[book_id].append(name)
+    memory_index.rebuild(rows, genres, generation)
+
+
+def _postgresql_search(   # pylint: disable=too-many-arguments
+        db: Session,
+        query_words: list[str],
+        prefix: bool,
+        genre: str | None,
+        year_from: int | None,
+        year_to: int | None,
+        limit: int
+) -> list[Row]:
+    config = literal_column(f"'{SEARCH_CONFIG}'")
+    text = " ".join(query_words)
+    if prefix:
+        tsquery = func.to_tsquery(config, " & ".join(f"{word}:*" for word in query_words))
+    else:
+        tsquery = func.plainto_tsquery(config, text)
+    title_vector = search_vector(Book.title)
+    author_vector = search_vector(Author.name)
+
+    # Условия по каждой таблице отдельно, чтобы использовались их GIN-индексы
+    matched_authors = select(Author.id).where(
+        or_(author_vector.op("@@")(tsquery), literal(text).op("<%")(Author.name))
+    )
+    score = (
+        func.ts_rank(title_vector, tsquery)
+        + func.word_similarity(text, Book.title)
+        + AUTHOR_WEIGHT * func.coalesce(
+            func.ts_rank(author_vector, tsquery) + func.word_similarity(text, Author.name), 0
+        )
+    ).label("score")
+    stmt = (
+        book_export_statement(year_from, year_to)
+        .add_columns(score)
+        .where(or_(
+            title_vector.op("@@")(tsquery),
+            literal(text).op("<%")(Book.title),
+            Book.author_id.in_(matched_authors)
+        ))
+        .order_by(None)
+        .order_by(score.desc(), Book.id)
+        .limit(limit)
+    )
+    if genre is not None:
+        stmt = stmt.where(Book.id.in_(
+            select(book_genre.c.book_id)
+            .join(Genre, Genre.id == book_genre.c.genre_id)
+            .where(Genre.name == genre)
+        ))
+    return db.execute(stmt).all()
+
+
+def search_books(   # pylint: disable=too-many-arguments
+        db: Session,
+        query: str,
+        prefix: bool = False,
+        genre: str | None = None,
+        year_from: int | None = None,
+        year_to: int | None = None,
+        limit: int = DEFAULT_PAGE_SIZE
+) -> list[Row] | list[SearchHit]:
+    """
+    Ищет книги по названию и имени автора с учетом опечаток.
+
+    Книга находится, если все слова запроса есть в названии или в имени автора
+    либо если фрагмент названия или имени похож на запрос (word_similarity).
+
+    Args:
+        db: Сессия базы данных.
+        query: Поисковый запрос.
+        prefix: Сопоставлять слова запроса как префиксы (автодополнение).
+        genre: Название жанра для фильтрации.
+        year_from: Минимальный год публикации включительно.
+        year_to: Максимальный год публикации включительно.
+        limit: Максимальное количество результатов.
+
+    Returns:
+        list: Строки с колонками книги, именем автора и оценкой, по убыванию оценки.
+    """
+    query_words = words(query)
+    if not query_words:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        return _postgresql_search(db, query_words, prefix, genre, year_from, year_to, limit)
+    if memory_index.stale:
+        _refresh_memory_index(db)
+    return memory_index.search(query, prefix, genre, year_from, year_to, limit)
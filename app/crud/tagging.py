@@ -0,0 +1,129 @@
+"""
+Модуль для массовой привязки книг к жанрам.
+
+Связи book_genre добавляются и удаляются множествами одним запросом
+без загрузки коллекций Book.genres: INSERT ... SELECT ... ON CONFLICT
+DO NOTHING и DELETE по наборам идентификаторов с RETURNING затронутых пар.
+По возвращенным парам в той же транзакции обновляются счетчики
+genres.book_count и сбрасывается кэш ответов затронутых книг.
+"""
+
+from collections import Counter
+from collections.abc import Iterable, Sequence
+
+from sqlalchemy import and_, delete, not_, select, true
+from sqlalchemy.orm import Session
+
+from app.models import Book, Genre
+from app.models.genre import book_genre
+from app.crud.genre_counts import apply_genre_count_deltas
+from app.crud.ranking import mark_books_for_ranking
+from app.crud.utils import cache_tag, dialect_insert, id_in, invalidate_on_commit
+
+
+def add_book_genres(db: Session, book_ids: Sequence[int], genre_ids: Sequence[int]) -> int:
+    """
+    Привязывает каждую из книг к каждому из жанров.
+
+    Несуществующие книги и жанры пропускаются, существующие связи не дублируются.
+
+    Args:
+        db: Сессия базы данных.
+        book_ids: Идентификаторы книг.
+        genre_ids: Идентификаторы жанров.
+
+    Returns:
+        int: Количество добавленных связей.
+    """
+    if not book_ids or not genre_ids:
+        return 0
+    # Все пары книга-жанр: явное перекрестное соединение
+    pairs = (
+        select(Book.id, Genre.id)
+        .join(Genre, true())
+        .where(id_in(db, Book.id, book_ids), id_in(db, Genre.id, genre_ids))
+    )
+    stmt = (
+        dialect_insert(db, book_genre)
+        .from_select(["book_id", "genre_id"], pairs)
+        .on_conflict_do_nothing()
+        .returning(book_genre.c.book_id, book_genre.c.genre_id)
+    )
+    added = db.execute(stmt).all()
+    _apply_changes(db, added, 1)
+    return len(added)
+
+
+def remove_book_genres(db: Session, book_ids: Sequence[int], genre_ids: Sequence[int]) -> int:
+    """
+    Отвязывает каждую из книг от каждого из жанров.
+
+    Args:
+        db: Сессия базы данных.
+        book_ids: Идентификаторы книг.
+        genre_ids: Идентификаторы жанров.
+
+    Returns:
+        int: Количество удаленных связей.
+    """
+    if not book_ids or not genre_ids:
+        return 0
+    return _delete_links(db, and_(
+        id_in(db, book_genre.c.book_id, book_ids),
+        id_in(db, book_genre.c.genre_id, genre_ids)
+    ))
+
+
+def replace_book_genres(
+        db: Session,
+        book_ids: Sequence[int],
+        genre_ids: Sequence[int]
+) -> tuple[int, int]:
+    """
+    Заменяет жанры каждой из книг указанным набором.
+
+    Связи, которые уже есть, не переписываются: удаляются только лишние
+    и добавляются только недостающие.
+
+    Args:
+        db: Сессия базы данных.
+        book_ids: Идентификаторы книг.
+        genre_ids: Новый набор жанров (пустой — отвязать книги от всех жанров).
+
+    Returns:
+        tuple[int, int]: Количество добавленных и удаленных связей.
+    """
+    if not book_ids:
+        return 0, 0
+    condition = id_in(db, book_genre.c.book_id, book_ids)
+    if genre_ids:
+        condition = and_(condition, not_(id_in(db, book_genre.c.genre_id, genre_ids)))
+    removed = _delete_links(db, condition)
+    return add_book_genres(db, book_ids, genre_ids), removed
+
+
+def _delete_links(db: Session, condition) -> int:
+    removed = db.execute(
+        delete(book_genre)
+        .where(condition)
+        .returning(book_genre.c.book_id, book_genre.c.genre_id)
+    ).all()
+    _apply_changes(db, removed, -1)
+    return len(removed)
+
+
+def _apply_changes(db: Session, pairs: Iterable[tuple[int, int]], sign: int) -> None:
+    pairs = list(pairs)
+    if not pairs:
+        return
+    apply_genre_count_deltas(db, Counter({
+        genre_id: sign * count
+        for genre_id, count in Counter(genre_id for _, genre_id in pairs).items()
+    }))
+    book_ids = {book_id for book_id, _ in pairs}
+    invalidate_on_commit(db, *(cache_tag("book", book_id) for book_id in book_ids))
+    mark_books_for_ranking(db, book_ids)
+    for book_id in book_ids:
+        book = db.identity_map.get(db.identity_key(Book, book_id))
+        if book is not None:
+            db.expire(book, ["genres"])
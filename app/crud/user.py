@@ -8,8 +8,8 @@
 from typing import Optional
 from sqlalchemy.orm import Session
 from app.models import User
-from app.schemas import UserCreate
-from app.security import get_password_hash
+from app.schemas import UserBase, UserProvision
+from app.crud.utils import cache_tag, dialect_insert, invalidate_on_commit
 
 
 def get_user(db: Session, user_id: int) -> Optional[User]:
@@ -54,48 +54,106 @@ def get_user_by_username(db: Session, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
 
 
-def create_user(db: Session, user: UserCreate) -> User:
+def create_user(db: Session, user: UserBase, hashed_password: str) -> User:
     """
     Создает нового пользователя в базе данных.
 
+    Пароль передается уже хэшированным: хэш вычисляется один раз
+    вызывающим кодом (при регистрации — в пуле app.hashing).
+
     Args:
         db: Сессия базы данных.
-        user: Данные для создания пользователя.
+        user: Имя пользователя и email.
+        hashed_password: Хэш пароля.
 
     Returns:
         User: Созданный объект пользователя.
     """
-    hashed_password = get_password_hash(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    db.flush()
     return db_user
 
 
+def provision_users(db: Session, users: list[UserProvision]) -> int:
+    """
+    Создает пакет пользователей с готовыми хэшами паролей одним запросом.
+
+    Записи, имя или email которых уже заняты, пропускаются
+    (INSERT ... ON CONFLICT DO NOTHING).
+
+    Args:
+        db: Сессия базы данных.
+        users: Учетные записи с хэшами паролей.
+
+    Returns:
+        int: Количество созданных пользователей.
+    """
+    created = db.execute(
+        dialect_insert(db, User)
+        .values([user.model_dump() for user in users])
+        .on_conflict_do_nothing()
+        .returning(User.id)
+    ).all()
+    return len(created)
+
+
+def set_user_password_hash(
+    db: Session,
+    user_id: int,
+    hashed_password: str
+) -> Optional[User]:
+    """
+    Сохраняет уже вычисленный хэш пароля пользователя.
+
+    Используется для пересчета хэша при входе, когда изменилась стоимость
+    bcrypt: пароль тот же, поэтому кэш аутентификации не сбрасывается.
+
+    Args:
+        db: Сессия базы данных.
+        user_id: Идентификатор пользователя.
+        hashed_password: Новый хэш пароля.
+
+    Returns:
+        Optional[User]: Обновленный объект пользователя или None, если не найден.
+    """
+    user = get_user(db, user_id)
+    if user:
+        user.hashed_password = hashed_password
+        db.flush()
+    return user
+
+
 def update_user_password(
     db: Session,
     user_id: int,
-    new_password: str
+    hashed_password: str
 ) -> Optional[User]:
     """
     Обновляет пароль пользователя.
 
+    Хэш нового пароля вычисляется заранее в пуле процессов
+    (app.hashing.hash_password), как и при создании пользователя.
+    После фиксации транзакции сбрасывает кэшированные токены и данные
+    пользователя (app.auth_cache).
+
     Args:
         db: Сессия базы данных.
         user_id: Идентификатор пользователя.
-        new_password: Новый пароль для установки.
+        hashed_password: Хэш нового пароля.
 
     Returns:
         Optional[User]: Обновленный объект пользователя или None, если не найден.
     """
     user = get_user(db, user_id)
     if user:
-        user.hashed_password = get_password_hash(new_password)
-        db.commit()
-        db.refresh(user)
+        user.hashed_password = hashed_password
+        db.flush()
+        invalidate_on_commit(
+            db, cache_tag("user", user.id), cache_tag("username", user.username)
+        )
     return user
@@ -0,0 +1,114 @@
+"""
+Вспомогательные функции для CRUD-модулей.
+
+Содержит построители диалектно-зависимых выражений, общие для разных сущностей,
+выборку пакетов по идентификаторам и регистрацию тегов кэша ответов,
+сбрасываемых после фиксации транзакции.
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import Any, NamedTuple
+from sqlalchemy import any_, literal
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+PENDING_CACHE_TAGS = "cache_invalidate_tags"
+
+
+class BatchResult(NamedTuple):
+    """
+    Результат выборки пакета сущностей по идентификаторам.
+
+    Attributes:
+        items: Найденные элементы в порядке запрошенных идентификаторов
+        missing: Ненайденные идентификаторы в порядке запроса
+    """
+    items: list
+    missing: list[int]
+
+
+def dialect_insert(db: Session, table):
+    """
+    Возвращает INSERT с поддержкой ON CONFLICT для текущего диалекта.
+
+    PostgreSQL и SQLite предоставляют одинаковый интерфейс
+    on_conflict_do_nothing/on_conflict_do_update.
+
+    Args:
+        db: Сессия базы данных.
+        table: Таблица или ORM-модель для вставки.
+
+    Returns:
+        Insert: Выражение INSERT соответствующего диалекта.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+def id_in(db: Session, column, ids: Iterable[int]):
+    """
+    Возвращает условие «колонка входит в набор идентификаторов».
+
+    В PostgreSQL набор передается одним параметром-массивом (= ANY(:ids)),
+    поэтому текст запроса и подготовленный оператор не зависят от размера
+    набора. В остальных диалектах используется IN с раскрываемым параметром.
+
+    Args:
+        db: Сессия базы данных.
+        column: Колонка идентификатора.
+        ids: Идентификаторы.
+
+    Returns:
+        ColumnElement: Условие для WHERE.
+    """
+    ids = list(ids)
+    if db.get_bind().dialect.name == "postgresql":
+        return column == any_(literal(ids, postgresql.ARRAY(column.type)))
+    return column.in_(ids)
+
+
+def ordered_batch(ids: Sequence[int], items: Iterable[dict]) -> BatchResult:
+    """
+    Упорядочивает найденные элементы по запрошенным идентификаторам.
+
+    Args:
+        ids: Запрошенные идентификаторы без повторов.
+        items: Найденные элементы со значением "id" в любом порядке.
+
+    Returns:
+        BatchResult: Элементы в порядке ids и ненайденные идентификаторы.
+    """
+    found = {item["id"]: item for item in items}
+    return BatchResult(
+        [found[entity_id] for entity_id in ids if entity_id in found],
+        [entity_id for entity_id in ids if entity_id not in found]
+    )
+
+
+def cache_tag(kind: str, entity_id: Any) -> str:
+    """
+    Формирует тег сущности для кэша ответов.
+
+    Args:
+        kind: Тип сущности: book, author, genre, reviews, user, username.
+        entity_id: Идентификатор сущности.
+
+    Returns:
+        str: Тег вида "kind:id".
+    """
+    return f"{kind}:{entity_id}"
+
+
+def invalidate_on_commit(db: Session, *tags: str) -> None:
+    """
+    Регистрирует теги кэша ответов, которые нужно сбросить после фиксации.
+
+    Сброс выполняет обработчик after_commit из app.cache; при откате
+    транзакции теги отбрасываются.
+
+    Args:
+        db: Сессия, в которой выполняется запись.
+        tags: Теги затронутых сущностей.
+    """
+    db.info.setdefault(PENDING_CACHE_TAGS, set()).update(tags)
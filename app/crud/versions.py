@@ -0,0 +1,179 @@
+"""
+Модуль версий сущностей и счетчиков изменений таблиц.
+
+Содержит легкие запросы версий для ETag (без загрузки строк целиком)
+и обработчики событий сессии, увеличивающие счетчики table_versions.
+
+Счетчики увеличиваются после фиксации изменившей данные транзакции, отдельной
+короткой транзакцией на том же соединении: строка счетчика общая для всех
+писателей таблицы, и блокировка ее до конца транзакции записи выстраивала бы
+их в очередь. Пока счетчик не увеличен, ETag коллекции может кратко
+соответствовать прежним данным.
+"""
+
+import logging
+from collections.abc import Iterable
+from itertools import chain
+from sqlalchemy import Connection, event, func, inspect, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.models import Author, Book, Genre, TableVersion
+from app.crud.utils import dialect_insert
+
+VERSIONED_MODELS = {"books": Book, "authors": Author, "genres": Genre}
+
+_PENDING_TABLES = "table_versions_pending"
+_CONNECTION = "table_versions_connection"
+
+logger = logging.getLogger("app.table_versions")
+
+
+def get_entity_version(db: Session, table: str, entity_id: int) -> int | None:
+    """
+    Получает номер версии строки без загрузки остальных колонок.
+
+    Args:
+        db: Сессия базы данных.
+        table: Имя таблицы из VERSIONED_MODELS.
+        entity_id: Идентификатор сущности.
+
+    Returns:
+        int | None: Версия строки или None, если сущность не найдена.
+    """
+    model = VERSIONED_MODELS[table]
+    return db.scalar(select(model.version).where(model.id == entity_id))
+
+
+def get_book_versions(
+        db: Session,
+        book_id: int,
+        tables: Iterable[str] = ()
+) -> tuple[int, int | None, dict[str, int]] | None:
+    """
+    Получает версии книги, ее автора и счетчики таблиц одним запросом.
+
+    Args:
+        db: Сессия базы данных.
+        book_id: Идентификатор книги.
+        tables: Таблицы, счетчики изменений которых нужно прочитать.
+
+    Returns:
+        tuple | None: Версия книги, версия автора и счетчики таблиц
+        или None, если книга не найдена.
+    """
+    tables = sorted(set(tables))
+    counters = [
+        func.coalesce(
+            select(TableVersion.version)
+            .where(TableVersion.table_name == table)
+            .scalar_subquery(),
+            0
+        )
+        for table in tables
+    ]
+    row = db.execute(
+        select(Book.version, Author.version, *counters)
+        .outerjoin(Author, Book.author_id == Author.id)
+        .where(Book.id == book_id)
+    ).first()
+    if row is None:
+        return None
+    return row[0], row[1], dict(zip(tables, row[2:]))
+
+
+def get_table_versions(db: Session, tables: Iterable[str]) -> dict[str, int]:
+    """
+    Получает счетчики изменений таблиц.
+
+    Args:
+        db: Сессия базы данных.
+        tables: Имена таблиц.
+
+    Returns:
+        dict[str, int]: Версия каждой таблицы (0, если таблица не изменялась).
+    """
+    tables = sorted(set(tables))
+    versions = dict(db.execute(
+        select(TableVersion.table_name, TableVersion.version)
+        .where(TableVersion.table_name.in_(tables))
+    ).all())
+    return {table: versions.get(table, 0) for table in tables}
+
+
+def bump_table_versions(db: Session, tables: Iterable[str]) -> None:
+    """
+    Отмечает таблицы, счетчики изменений которых увеличиваются после фиксации.
+
+    Args:
+        db: Сессия базы данных.
+        tables: Имена измененных таблиц.
+    """
+    tables = set(tables) - {TableVersion.__tablename__}
+    if tables:
+        db.info.setdefault(_PENDING_TABLES, set()).update(tables)
+        db.info[_CONNECTION] = db.connection()
+
+
+def _increment(db: Session, connection: Connection, tables: Iterable[str]) -> None:
+    # Таблицы обновляются в порядке имен, чтобы конкурентные транзакции
+    # блокировали строки счетчиков в одном порядке
+    stmt = dialect_insert(db, TableVersion).values(
+        [{"table_name": table, "version": 1} for table in sorted(tables)]
+    )
+    with connection.begin():
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=[TableVersion.table_name],
+            set_={"version": TableVersion.version + 1}
+        ))
+
+
+def _flushed_tables(session: Session) -> set[str]:
+    tables = set()
+    for obj in chain(session.new, session.deleted):
+        mapper = inspect(obj).mapper
+        tables.add(mapper.local_table.name)
+        tables.update(
+            rel.secondary.name for rel in mapper.relationships if rel.secondary is not None
+        )
+    for obj in session.dirty:
+        state = inspect(obj)
+        for attr in state.mapper.column_attrs:
+            if state.attrs[attr.key].history.has_changes():
+                tables.add(state.mapper.local_table.name)
+                break
+        tables.update(
+            rel.secondary.name for rel in state.mapper.relationships
+            if rel.secondary is not None and state.attrs[rel.key].history.has_changes()
+        )
+    return tables
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed(session: Session, _flush_context) -> None:
+    bump_table_versions(session, _flushed_tables(session))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_executed(orm_execute_state) -> None:
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        bump_table_versions(state.session, [state.statement.table.name])
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed(session: Session) -> None:
+    tables = session.info.pop(_PENDING_TABLES, None)
+    connection = session.info.pop(_CONNECTION, None)
+    if not tables or connection is None:
+        return
+    try:
+        _increment(session, connection, tables)
+    except SQLAlchemyError:
+        # Данные уже зафиксированы; счетчик увеличит следующая запись таблицы
+        logger.exception("Не удалось увеличить счетчики таблиц %s", sorted(tables))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_executed(session: Session) -> None:
+    session.info.pop(_PENDING_TABLES, None)
+    session.info.pop(_CONNECTION, None)
@@ -1,46 +1,455 @@
 """
 Модуль для работы с базой данных.
 
-Содержит настройки подключения к PostgreSQL, фабрику сессий и обработку ошибок.
+Содержит настройки подключения к PostgreSQL, синхронную и асинхронную
+фабрики сессий, учет времени SQL-запросов с журналом медленных запросов
+и обработку ошибок.
 """
 
-from contextlib import contextmanager
-from sqlalchemy import create_engine
-from sqlalchemy.exc import SQLAlchemyError
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import InvalidRequestError, SQLAlchemyError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from fastapi import HTTPException
 
+from app import metrics
+
+load_dotenv()
+
+
+def _env_int(name: str, default: int) -> int:
+    """Читает целочисленную настройку из переменной окружения."""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Читает логическую настройку из переменной окружения."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _async_url(url: str) -> str:
+    """Подбирает асинхронный драйвер для строки подключения."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql":
+        return parsed.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+    if parsed.get_backend_name() == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    return url
+
+
+SQLALCHEMY_DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    "postgresql://postgres:postgres@db:5432/book_catalog"
+)
+ASYNC_SQLALCHEMY_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    _async_url(SQLALCHEMY_DATABASE_URL)
+)
+
+# Параметры пула соединений (на один процесс и на каждый из движков)
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT", 30)
+DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 1800)
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+
+# Порог журнала медленных запросов в миллисекундах (0 отключает журнал)
+SLOW_QUERY_MS = _env_int("SLOW_QUERY_MS", 200)
+# Добавлять в журнал план выполнения (EXPLAIN без ANALYZE, запрос не выполняется повторно)
+SLOW_QUERY_EXPLAIN = _env_bool("SLOW_QUERY_EXPLAIN", True)
+
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+# Префиксы EXPLAIN по диалектам; для остальных баз план не запрашивается
+_EXPLAIN_PREFIXES = {"postgresql": "EXPLAIN ", "sqlite": "EXPLAIN QUERY PLAN "}
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+# Границы корзин гистограммы ожидания соединения, в секундах
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMetrics:
+    """
+    Счетчики ожидания соединений из пула.
+
+    Атрибуты:
+        name (str): Имя пула в отчетах
+        checkouts (int): Количество выданных соединений
+        timeouts (int): Количество отказов по таймауту ожидания
+        wait_total (float): Суммарное время ожидания, секунды
+        wait_max (float): Максимальное время ожидания, секунды
+        wait_buckets (list[int]): Гистограмма времени ожидания по POOL_WAIT_BUCKETS
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_buckets = [0] * (len(POOL_WAIT_BUCKETS) + 1)
+        self._lock = threading.Lock()
+
+    def observe_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """
+        Учитывает одно ожидание соединения.
+
+        Args:
+            seconds: Время ожидания в секундах.
+            timed_out: Завершилось ли ожидание таймаутом.
+        """
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.wait_buckets[bisect_left(POOL_WAIT_BUCKETS, seconds)] += 1
+
+    def snapshot(self, pool) -> dict:
+        """
+        Возвращает текущее состояние пула и накопленные счетчики.
+
+        Args:
+            pool: Пул соединений движка.
+
+        Returns:
+            dict: Размер пула, занятые соединения, переполнение и время ожидания.
+        """
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            return {
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,  # pylint: disable=protected-access
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_total,
+                "wait_seconds_avg": self.wait_total / waits if waits else 0.0,
+                "wait_seconds_max": self.wait_max,
+                "wait_buckets": dict(zip(
+                    [*map(str, POOL_WAIT_BUCKETS), "+Inf"],
+                    self.wait_buckets
+                )),
+            }
+
+
+class _InstrumentedPoolMixin:
+    """
+    Примесь к пулу, измеряющая время ожидания каждой выдачи соединения.
+    """
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.observe_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe_wait(time.perf_counter() - start)
+        return connection
 
-SQLALCHEMY_DATABASE_URL = "postgresql://postgres:postgres@db:5432/book_catalog"
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """Пул синхронного движка с измерением времени ожидания."""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """Пул асинхронного движка с измерением времени ожидания."""
+
+
+def _pool_options(url: str, poolclass) -> dict:
+    """
+    Формирует параметры пула для create_engine.
+
+    Для SQLite используются пулы диалекта по умолчанию.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+class ReadOnlySession(Session):
+    """
+    Сессия только для чтения.
+
+    Транзакция открывается в режиме READ ONLY, а попытка сбросить
+    изменения в базу завершается ошибкой вместо записи.
+    """
+
+    def flush(self, objects=None) -> None:
+        if self.new or self.deleted or self.dirty:
+            raise InvalidRequestError("Сессия открыта только для чтения")
+
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    **_pool_options(SQLALCHEMY_DATABASE_URL, InstrumentedQueuePool)
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadOnlySessionLocal = sessionmaker(
+    bind=engine.execution_options(postgresql_readonly=True),
+    class_=ReadOnlySession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Асинхронный движок для обработчиков async def: ожидание ответа БД
+# не занимает поток из пула Starlette
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    **_pool_options(ASYNC_SQLALCHEMY_DATABASE_URL, InstrumentedAsyncQueuePool)
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+AsyncReadOnlySessionLocal = async_sessionmaker(
+    bind=async_engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    autoflush=False,
+    expire_on_commit=False
+)
 Base = declarative_base()
 
+engine.pool.metrics = PoolMetrics("sync")
+async_engine.sync_engine.pool.metrics = PoolMetrics("async")
+
+
+def parameters_shape(parameters, executemany: bool) -> str:
+    """
+    Описывает параметры запроса без их значений.
+
+    Args:
+        parameters: Параметры DBAPI (кортеж, словарь или список наборов)
+        executemany: Выполнялся ли запрос для нескольких наборов параметров
+
+    Returns:
+        str: Типы параметров, например "(int, str)" или "3 x {id: int}"
+    """
+    if executemany:
+        rows = list(parameters)
+        return f"{len(rows)} x {parameters_shape(rows[0], False)}" if rows else "0 x ()"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}"
+                               for key, value in parameters.items()) + "}"
+    if parameters is None:
+        return "()"
+    return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+
+
+def explain(conn, statement: str, parameters) -> str | None:
+    """
+    Получает план выполнения запроса на том же соединении.
+
+    Используется курсор DBAPI напрямую, чтобы EXPLAIN не попадал
+    в обработчики событий и метрики. Внутри транзакции план запрашивается
+    в точке сохранения: ошибка EXPLAIN в PostgreSQL иначе прерывает
+    всю транзакцию запроса.
+
+    Args:
+        conn: Соединение SQLAlchemy
+        statement: Текст запроса в формате DBAPI
+        parameters: Параметры запроса
+
+    Returns:
+        str | None: Строки плана или None, если план недоступен
+    """
+    prefix = _EXPLAIN_PREFIXES.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    savepoint = conn.in_transaction()
+    cursor = conn.connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(prefix + statement, parameters or ())
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+        except Exception as exc:     # pylint: disable=broad-exception-caught
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return f"EXPLAIN не выполнен: {exc}"
+        finally:
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+    if context is not None:
+        context.query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, _cursor, statement, parameters, context, executemany):
+    start = getattr(context, "query_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    metrics.observe_statement(elapsed, statement)
+    if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+        plan = None
+        if SLOW_QUERY_EXPLAIN and not executemany:
+            plan = explain(conn, statement, parameters)
+        slow_query_logger.warning(
+            "Медленный запрос %.1f мс, маршрут %s, параметры %s\n%s%s",
+            elapsed * 1000,
+            metrics.current_route() or "-",
+            parameters_shape(parameters, executemany),
+            statement,
+            f"\nПлан:\n{plan}" if plan else ""
+        )
+
+
+def instrument_engine(sync_engine: Engine) -> None:
+    """
+    Подключает учет времени SQL-запросов и журнал медленных запросов к движку.
+
+    Args:
+        sync_engine: Синхронный движок (для асинхронного — его sync_engine).
+    """
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+
+def pool_status() -> list[dict]:
+    """
+    Возвращает состояние пулов соединений обоих движков.
+
+    Returns:
+        list[dict]: Снимок метрик для каждого пула с очередью.
+    """
+    status = []
+    for pool in (engine.pool, async_engine.sync_engine.pool):
+        if isinstance(pool, QueuePool) and pool.metrics is not None:
+            status.append({"name": pool.metrics.name, **pool.metrics.snapshot(pool)})
+    return status
+
 
-@contextmanager
 def get_db():
     """
-    Контекстный менеджер для получения сессии базы данных.
+    Зависимость FastAPI для получения сессии базы данных на время запроса.
+
+    Транзакция фиксируется один раз после успешной обработки запроса
+    и откатывается при любой ошибке; соединение возвращается в пул
+    при закрытии сессии. Подключается как Depends(get_db, scope="function"),
+    чтобы фиксация выполнялась до отправки ответа и ее ошибка дошла до клиента.
 
     Yields:
         Session: Сессия базы данных
 
-    Пример использования:
-        with get_db() as db:
-            # работа с базой данных
+    Raises:
+        HTTPException: При возникновении ошибок SQLAlchemy
     """
-    db = SessionLocal()
-    try:
+    with SessionLocal() as db:
+        try:
+            yield db
+            db.commit()
+        except SQLAlchemyError as exc:
+            db.rollback()
+            raise HTTPException(
+                status_code=500,
+                detail=f"Ошибка базы данных: {str(exc)}"
+            ) from exc
+        except Exception:
+            db.rollback()
+            raise
+
+
+def get_read_db():
+    """
+    Зависимость FastAPI для сессии только для чтения.
+
+    Предназначена для GET-маршрутов: транзакция не фиксируется,
+    сброс изменений не выполняется.
+
+    Yields:
+        ReadOnlySession: Сессия базы данных только для чтения
+    """
+    with ReadOnlySessionLocal() as db:
+        yield db
+
+
+async def get_async_db():
+    """
+    Зависимость FastAPI для получения асинхронной сессии на время запроса.
+
+    Транзакция фиксируется один раз после успешной обработки запроса
+    и откатывается при любой ошибке. Подключается как
+    Depends(get_async_db, scope="function"), чтобы фиксация выполнялась
+    до отправки ответа и ее ошибка дошла до клиента.
+
+    Yields:
+        AsyncSession: Асинхронная сессия базы данных
+
+    Raises:
+        HTTPException: При возникновении ошибок SQLAlchemy
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except SQLAlchemyError as exc:
+            await db.rollback()
+            raise HTTPException(
+                status_code=500,
+                detail=f"Ошибка базы данных: {str(exc)}"
+            ) from exc
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def get_async_read_db():
+    """
+    Зависимость FastAPI для асинхронной сессии только для чтения.
+
+    Yields:
+        AsyncSession: Асинхронная сессия поверх ReadOnlySession
+    """
+    async with AsyncReadOnlySessionLocal() as db:
         yield db
-    except SQLAlchemyError as exc:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Ошибка базы данных: {str(exc)}"
-        ) from exc
-    finally:
-        db.close()
 
 
 def handle_db_errors(func):
@@ -1,29 +1,42 @@
 """
 Модуль зависимостей приложения.
 
-Содержит функции для работы с аутентификацией и получения текущего пользователя.
+Содержит функции для работы с аутентификацией, получения текущего пользователя
+и разбора общих параметров запросов.
 """
 
+import hmac
+import os
 from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app import security, crud
+from app.database import get_db, get_read_db, get_async_db, get_async_read_db
+from app import auth_cache, crud
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PageRequest
 from app.schemas.user import User
 
+MAX_BATCH_SIZE = 100
+MAX_GENRE_FILTER = 10
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Токен сервиса SSO для выгрузки учетных записей; если не задан, выгрузка отключена
+PROVISIONING_TOKEN = os.getenv("PROVISIONING_TOKEN")
+
 
 async def get_current_user(
         token: Annotated[str, Depends(oauth2_scheme)],
-        db: Annotated[Session, Depends(get_db)]
+        db: Annotated[AsyncSession, Depends(get_async_db, scope="function")]
 ) -> User:
     """
     Получает текущего аутентифицированного пользователя по JWT-токену.
 
+    Проверенные токены и данные пользователя берутся из app.auth_cache,
+    поэтому повторные запросы с тем же токеном не обращаются к базе.
+
     Args:
         token: JWT-токен из заголовка Authorization
         db: Сессия базы данных
@@ -41,17 +54,155 @@ async def get_current_user(
     )
 
     try:
-        payload = security.decode_token(token)
-        username: str | None = payload.get("sub")
-
-        if not username:
-            raise credentials_exception
-
+        claims = auth_cache.verify_token(token)
     except JWTError as exc:
         raise credentials_exception from exc
+    if not claims or not claims.get("sub"):
+        raise credentials_exception
 
-    user = crud.get_user_by_username(db, username=username)
+    user = await auth_cache.get_user(db, claims)
     if user is None:
         raise credentials_exception
 
     return user
+
+
+def require_provisioning_token(
+        x_provisioning_token: Annotated[
+            str | None,
+            Header(description="Токен сервиса выгрузки учетных записей")
+        ] = None
+) -> None:
+    """
+    Проверяет токен сервиса выгрузки учетных записей из SSO.
+
+    Args:
+        x_provisioning_token: Значение заголовка X-Provisioning-Token
+
+    Raises:
+        HTTPException: 403, если выгрузка отключена или токен неверен
+    """
+    if not PROVISIONING_TOKEN or not x_provisioning_token or not hmac.compare_digest(
+            x_provisioning_token.encode(), PROVISIONING_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Выгрузка учетных записей запрещена"
+        )
+
+
+def book_include(
+        include: Annotated[
+            str | None,
+            Query(description="Связи через запятую: author, genres, reviews")
+        ] = None
+) -> frozenset[str]:
+    """
+    Разбирает параметр include со списком связей книги для загрузки.
+
+    Args:
+        include: Имена связей через запятую
+
+    Returns:
+        frozenset[str]: Множество запрошенных связей
+
+    Raises:
+        HTTPException: 422, если указана неизвестная связь
+    """
+    if not include:
+        return frozenset()
+    names = {name.strip() for name in include.split(",") if name.strip()}
+    unknown = names - crud.BOOK_RELATION_LOADERS.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Неизвестные связи: {', '.join(sorted(unknown))}"
+        )
+    return frozenset(names)
+
+
+def page_request(
+        cursor: Annotated[
+            str | None,
+            Query(description="Курсор next_cursor из предыдущего ответа")
+        ] = None,
+        limit: Annotated[
+            int,
+            Query(ge=1, le=MAX_PAGE_SIZE, description="Размер страницы")
+        ] = DEFAULT_PAGE_SIZE
+) -> PageRequest:
+    """
+    Собирает параметры курсорной пагинации коллекции.
+
+    Args:
+        cursor: Курсор следующей страницы
+        limit: Размер страницы (не более MAX_PAGE_SIZE)
+
+    Returns:
+        PageRequest: Параметры запрошенной страницы
+    """
+    return PageRequest(cursor=cursor, limit=limit)
+
+
+def batch_ids(
+        ids: Annotated[
+            str,
+            Query(description=f"Идентификаторы через запятую, не более {MAX_BATCH_SIZE}")
+        ]
+) -> list[int]:
+    """
+    Разбирает параметр ids пакетной выборки.
+
+    Повторы отбрасываются, порядок первого вхождения сохраняется.
+
+    Args:
+        ids: Идентификаторы через запятую
+
+    Returns:
+        list[int]: Идентификаторы без повторов
+
+    Raises:
+        HTTPException: 422, если идентификатор не является целым числом
+            или их больше MAX_BATCH_SIZE
+    """
+    return _parse_ids("ids", ids, 1, MAX_BATCH_SIZE)
+
+
+def genre_filter(
+        with_genres: Annotated[
+            str | None,
+            Query(description="Дополнительные жанры через запятую: книга должна входить во все")
+        ] = None
+) -> list[int]:
+    """
+    Разбирает параметр with_genres фильтра книг жанра.
+
+    Args:
+        with_genres: Идентификаторы жанров через запятую
+
+    Returns:
+        list[int]: Идентификаторы без повторов (пустой список без фильтра)
+
+    Raises:
+        HTTPException: 422, если идентификатор не является целым числом
+            или их больше MAX_GENRE_FILTER
+    """
+    if not with_genres:
+        return []
+    return _parse_ids("with_genres", with_genres, 0, MAX_GENRE_FILTER)
+
+
+def _parse_ids(name: str, value: str, min_count: int, max_count: int) -> list[int]:
+    try:
+        values = list(dict.fromkeys(int(part) for part in value.split(",") if part.strip()))
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{name} должен содержать целые числа через запятую"
+        ) from exc
+    if not min_count <= len(values) <= max_count:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{name} должен содержать от {min_count} до {max_count} идентификаторов"
+        )
+    return values
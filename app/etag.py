@@ -0,0 +1,176 @@
+"""
+Условные GET-запросы: ETag и ответ 304 Not Modified.
+
+ETag строится из номеров версий, а не из тела ответа: версия читается
+легким запросом, и при совпадении с If-None-Match ответ 304 отдается
+без загрузки строки и сериализации. Сущности получают сильные ETag
+из колонок version, коллекции — слабые ETag из счетчиков table_versions.
+"""
+
+from collections.abc import Awaitable, Callable, Iterable
+from functools import wraps
+from typing import Annotated, Any
+
+from fastapi import Header, status
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+from app import crud
+from app.metrics import serialization
+from app.serializers import dumps
+
+IfNoneMatch = Annotated[
+    str | None,
+    Header(description="ETag ранее полученного ответа для условного запроса")
+]
+
+EtagFunc = Callable[[dict], Awaitable[str | None]]
+
+
+def entity_etag(table: str, entity_id: int, *versions: Any) -> str:
+    """
+    Формирует сильный ETag сущности.
+
+    Args:
+        table: Имя таблицы сущности
+        entity_id: Идентификатор сущности
+        versions: Номера версий сущности и включенных в ответ данных
+
+    Returns:
+        str: ETag вида "table-id-v1-v2"
+    """
+    return '"' + "-".join(str(part) for part in (table, entity_id, *versions)) + '"'
+
+
+def collection_etag(versions: dict[str, int]) -> str:
+    """
+    Формирует слабый ETag коллекции из счетчиков изменений таблиц.
+
+    Args:
+        versions: Версии таблиц, из которых собирается ответ
+
+    Returns:
+        str: ETag вида W/"books.3-authors.1"
+    """
+    return 'W/"' + "-".join(f"{table}.{version}" for table, version in versions.items()) + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Проверяет If-None-Match слабым сравнением (RFC 9110).
+
+    Args:
+        if_none_match: Значение заголовка If-None-Match
+        etag: Текущий ETag ресурса
+
+    Returns:
+        bool: Клиент уже имеет текущую версию ресурса
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Формирует ответ 304 Not Modified.
+
+    Args:
+        etag: Текущий ETag ресурса
+
+    Returns:
+        Response: Пустой ответ с заголовком ETag
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def entity_version(table: str, id_param: str) -> EtagFunc:
+    """
+    Создает функцию сильного ETag сущности по колонке version.
+
+    Args:
+        table: Имя таблицы из crud.VERSIONED_MODELS
+        id_param: Имя параметра обработчика с идентификатором
+
+    Returns:
+        EtagFunc: Корутина (параметры обработчика) -> ETag или None
+    """
+    async def etag(params: dict) -> str | None:
+        version = await crud.aio.get_entity_version(params["db"], table, params[id_param])
+        return None if version is None else entity_etag(table, params[id_param], version)
+    return etag
+
+
+def table_versions(tables: Iterable[str]) -> EtagFunc:
+    """
+    Создает функцию слабого ETag коллекции по счетчикам таблиц.
+
+    Args:
+        tables: Таблицы, из которых собирается ответ
+
+    Returns:
+        EtagFunc: Корутина (параметры обработчика) -> ETag
+    """
+    tables = tuple(tables)
+
+    async def etag(params: dict) -> str:
+        return collection_etag(await crud.aio.get_table_versions(params["db"], tables))
+    return etag
+
+
+def conditional(
+        response_model: Any,
+        etag: EtagFunc,
+        exclude_unset: bool = False,
+        validate: bool = True
+) -> Callable:
+    """
+    Добавляет ETag к ответу GET-обработчика и отвечает 304 при совпадении.
+
+    Обработчик должен принимать параметры db и if_none_match (IfNoneMatch).
+    Если функция ETag вернула None (сущность не найдена), обработчик
+    вызывается как обычно.
+
+    Args:
+        response_model: Схема ответа, которой сериализуется результат
+        etag: Корутина (параметры обработчика) -> ETag
+        exclude_unset: Не выводить незаданные поля (как response_model_exclude_unset)
+        validate: Проверять результат схемой; False — обработчик возвращает
+            словари в форме схемы (app.serializers.RowShape), они кодируются
+            в JSON напрямую
+
+    Returns:
+        Callable: Декоратор обработчика
+    """
+    adapter = TypeAdapter(response_model)
+
+    def serialize(result: Any) -> bytes:
+        if not validate:
+            return dumps(result)
+        result = adapter.validate_python(result, from_attributes=True)
+        return adapter.dump_json(result, exclude_unset=exclude_unset)
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(**kwargs: Any) -> Any:
+            current = await etag(kwargs)
+            if current is None:
+                return await func(**kwargs)
+            if etag_matches(kwargs.get("if_none_match"), current):
+                return not_modified(current)
+            result = await func(**kwargs)
+            with serialization():
+                content = serialize(result)
+            return Response(
+                content,
+                media_type="application/json",
+                headers={"ETag": current}
+            )
+        return wrapper
+    return decorator
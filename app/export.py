@@ -0,0 +1,102 @@
+"""
+Потоковая выгрузка каталога книг в NDJSON и CSV.
+
+Строки читаются серверным курсором (yield_per) порциями по EXPORT_PARTITION_SIZE,
+жанры каждой порции дочитываются одним запросом. В памяти одновременно
+находится не более одной порции, поэтому расход памяти не зависит от размера каталога.
+Формат строк совместим с импортом (app.bulk).
+"""
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterator, Sequence
+
+from sqlalchemy import Row
+
+from app import crud
+from app.bulk import CSV_GENRE_SEPARATOR
+from app.database import AsyncReadOnlySessionLocal
+
+EXPORT_PARTITION_SIZE = 1000
+EXPORT_COLUMNS = ("id", "title", "publication_year", "isbn", "author_id", "author", "genres")
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+GZIP_MEDIA_TYPE = "application/gzip"
+
+
+def _encode_ndjson(rows: Sequence[Row], genres: dict[int, list[str]]) -> str:
+    lines = []
+    for row in rows:
+        record = row._asdict()
+        record["genres"] = genres.get(row.id, [])
+        lines.append(json.dumps(record, ensure_ascii=False))
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _encode_csv(rows: Sequence[Row], genres: dict[int, list[str]]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows(
+        (*row, CSV_GENRE_SEPARATOR.join(genres.get(row.id, []))) for row in rows
+    )
+    return buffer.getvalue()
+
+
+def _csv_header() -> str:
+    return ",".join(EXPORT_COLUMNS) + "\n"
+
+
+async def stream_books(
+        fmt: str = "ndjson",
+        year_from: int | None = None,
+        year_to: int | None = None
+) -> AsyncIterator[str]:
+    """
+    Генерирует выгрузку каталога порциями текста.
+
+    Генератор открывает собственную сессию только для чтения: он выполняется
+    уже после выхода из зависимостей запроса.
+
+    Args:
+        fmt: Формат выгрузки: ndjson или csv с заголовком
+        year_from: Минимальный год публикации включительно
+        year_to: Максимальный год публикации включительно
+
+    Yields:
+        str: Строки выгрузки одной порции
+    """
+    encode = _encode_csv if fmt == "csv" else _encode_ndjson
+    if fmt == "csv":
+        yield _csv_header()
+
+    stmt = crud.book_export_statement(year_from, year_to).execution_options(
+        yield_per=EXPORT_PARTITION_SIZE
+    )
+    async with AsyncReadOnlySessionLocal() as session:
+        result = await session.stream(stmt)
+        async for rows in result.partitions():
+            genres = await crud.aio.get_genre_names(session, [row.id for row in rows])
+            yield encode(rows, genres)
+
+
+async def gzip_chunks(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """
+    Сжимает поток текста в формат gzip без накопления всего ответа.
+
+    Args:
+        chunks: Порции текста в UTF-8
+
+    Yields:
+        bytes: Сжатые данные
+    """
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
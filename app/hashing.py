@@ -0,0 +1,160 @@
+"""
+Пул процессов для хэширования и проверки паролей.
+
+bcrypt занимает процессор на сотни миллисекунд, поэтому вызовы выполняются
+в отдельном пуле процессов ограниченного размера, а не в потоке запроса
+и не в цикле событий. Одновременно принимается не больше
+HASH_WORKERS + HASH_QUEUE_SIZE задач; сверх этого вызов сразу завершается
+ошибкой HashingBusyError, которую приложение превращает в ответ 503
+с заголовком Retry-After.
+
+Настройки: HASH_WORKERS, HASH_QUEUE_SIZE, HASH_RETRY_AFTER (секунды).
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from app import security
+
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+HASH_QUEUE_SIZE = int(os.getenv("HASH_QUEUE_SIZE", str(HASH_WORKERS * 4)))
+HASH_RETRY_AFTER = int(os.getenv("HASH_RETRY_AFTER", "1"))
+
+
+class HashingBusyError(Exception):
+    """
+    Очередь пула хэширования заполнена.
+    """
+
+    def __init__(self, retry_after: int = HASH_RETRY_AFTER):
+        super().__init__("Сервис перегружен, повторите запрос позже")
+        self.retry_after = retry_after
+
+
+class HashingPool:
+    """
+    Пул процессов bcrypt с ограничением числа принятых задач.
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS, queue_size: int = HASH_QUEUE_SIZE):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: дочерние процессы не наследуют потоки и соединения приложения
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        """
+        Ставит вызов в очередь пула.
+
+        Args:
+            func: Функция модуля app.security
+            args: Аргументы функции
+
+        Returns:
+            Future: Результат вызова
+
+        Raises:
+            HashingBusyError: Если все места в очереди заняты
+        """
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HashingBusyError()
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _future: self._slots.release())
+        return future
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Выполняет вызов в пуле, не блокируя цикл событий.
+
+        Args:
+            func: Функция модуля app.security
+            args: Аргументы функции
+
+        Returns:
+            Any: Результат функции
+
+        Raises:
+            HashingBusyError: Если все места в очереди заняты
+        """
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    def warm(self) -> None:
+        """
+        Запускает процессы пула заранее, чтобы первый вход не ждал их старта.
+        """
+        executor = self._get_executor()
+        for future in [executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def stats(self) -> dict:
+        """
+        Возвращает размер пула и число отклоненных задач.
+
+        Returns:
+            dict: Снимок счетчиков пула.
+        """
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """
+        Останавливает процессы пула.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+hashing_pool = HashingPool()
+
+
+async def hash_password(password: str) -> str:
+    """
+    Хэширует пароль в пуле процессов.
+
+    Args:
+        password: Пароль в открытом виде
+
+    Returns:
+        str: Хэш bcrypt с текущей стоимостью BCRYPT_ROUNDS
+    """
+    return await hashing_pool.run(security.get_password_hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Проверяет пароль в пуле процессов.
+
+    Args:
+        plain_password: Введенный пароль
+        hashed_password: Сохраненный хэш
+
+    Returns:
+        tuple[bool, str | None]: Результат проверки и новый хэш,
+        если сохраненный создан с другой стоимостью
+    """
+    return await hashing_pool.run(security.verify_and_update, plain_password, hashed_password)
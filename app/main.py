@@ -1,19 +1,26 @@
 """
 Основной файл приложения REST API для каталога книг.
+
+Импорт модуля не обращается к базе данных: схема создается миграциями
+Alembic (alembic upgrade head), прогрев выполняется в lifespan (app.startup).
 """
 
-from fastapi import FastAPI
-from app.database import engine, Base
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from app.pagination import InvalidCursorError
+from app.hashing import HashingBusyError
+from app.review_queue import ReviewQueueFullError
+from app.metrics import MetricsMiddleware, instrument_serialization
+from app.startup import lifespan
 
 from app.api.books import router as books_router
 from app.api.authors import router as authors_router
 from app.api.genres import router as genres_router
 from app.api.auth import router as auth_router
 from app.api.reviews import router as reviews_router
-
-
-# Создаёт таблицы в базе данных
-Base.metadata.create_all(bind=engine)
+from app.api.users import router as users_router
+from app.api.health import router as health_router
+from app.api.metrics import router as metrics_router
 
 
 # Настройка основного экземпляра приложения FastAPI
@@ -22,13 +29,57 @@ app = FastAPI(
     description="REST API для управления каталогом книг.",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    lifespan=lifespan
 )
 
 
+# Метрики запросов для /metrics
+app.add_middleware(MetricsMiddleware)
+instrument_serialization()
+
+
 # Регистрация маршрутов
 app.include_router(auth_router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(books_router, prefix="/api/books", tags=["Books"])
 app.include_router(authors_router, prefix="/api/authors", tags=["Authors"])
 app.include_router(genres_router, prefix="/api/genres", tags=["Genres"])
 app.include_router(reviews_router, prefix="/api/reviews", tags=["Reviews"])
+app.include_router(users_router, prefix="/api", tags=["Users"])
+app.include_router(health_router, prefix="/api", tags=["Health"])
+app.include_router(metrics_router)
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(_request: Request, exc: InvalidCursorError) -> JSONResponse:
+    """
+    Преобразует ошибку разбора курсора пагинации в ответ 400.
+    """
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": str(exc)}
+    )
+
+
+@app.exception_handler(HashingBusyError)
+async def hashing_busy_handler(_request: Request, exc: HashingBusyError) -> JSONResponse:
+    """
+    Отвечает 503 с Retry-After, если очередь пула хэширования паролей заполнена.
+    """
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+@app.exception_handler(ReviewQueueFullError)
+async def review_queue_full_handler(_request: Request, exc: ReviewQueueFullError) -> JSONResponse:
+    """
+    Отвечает 503 с Retry-After, если очередь записи отзывов заполнена.
+    """
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
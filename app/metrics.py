@@ -0,0 +1,397 @@
+"""
+Метрики запросов и базы данных в формате Prometheus.
+
+MetricsMiddleware измеряет каждый HTTP-запрос и относит к шаблону маршрута
+(например, /api/books/{book_id}) общее время, время SQL и число запросов
+к базе. SQL учитывается обработчиками событий движков из app.database
+(observe_statement): запросы, выполненные во время обработки HTTP-запроса,
+накапливаются в RequestStats из contextvar.
+Время сериализации ответа измеряется контекстным менеджером serialization():
+его используют app.cache и app.etag, а ответы остальных маршрутов (проверка
+и сериализация по response_model в FastAPI) — instrument_serialization().
+
+При SQL_PROFILING=true запрос с заголовком X-SQL-Profile получает в ответе
+заголовок X-SQL-Profile с временем каждого SQL-запроса и Server-Timing.
+Без заголовка профиль не собирается.
+
+Метрики хранятся в памяти процесса и выводятся эндпоинтом /metrics
+в текстовом формате экспозиции Prometheus (render()).
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any
+
+from fastapi import routing
+
+# Границы корзин гистограмм времени, в секундах
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Границы корзин гистограммы числа SQL-запросов на HTTP-запрос
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Границы корзин гистограммы размера пакета записи
+BATCH_BUCKETS = (1, 10, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Метка маршрута для запросов, не совпавших ни с одним маршрутом
+UNMATCHED_ROUTE = "unmatched"
+
+# Профилирование SQL по заголовку запроса (раскрывает текст запросов, по умолчанию выключено)
+SQL_PROFILING = os.getenv("SQL_PROFILING", "false").lower() in ("1", "true", "yes", "on")
+PROFILE_HEADER = b"x-sql-profile"
+# Ограничения профиля, чтобы заголовок ответа оставался небольшим
+PROFILE_MAX_STATEMENTS = 50
+PROFILE_SQL_LENGTH = 200
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Counter:
+    """
+    Монотонный счетчик с метками.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """
+        Увеличивает счетчик.
+
+        Args:
+            labels: Значения меток в порядке labelnames
+            amount: Величина увеличения
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self) -> Iterator[str]:
+        """Возвращает строки экспозиции счетчика."""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {value}"
+
+
+class Histogram:
+    """
+    Гистограмма с метками.
+
+    Корзины хранятся некумулятивно и суммируются при выводе,
+    поэтому наблюдение стоит одного bisect и одного инкремента.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Iterable[str] = (),
+            buckets: tuple[float, ...] = TIME_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Учитывает одно наблюдение.
+
+        Args:
+            value: Наблюдаемое значение
+            labels: Значения меток в порядке labelnames
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def collect(self) -> Iterator[str]:
+        """Возвращает строки экспозиции гистограммы."""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = [(labels, list(counts), total, count)
+                      for labels, (counts, total, count) in self._series.items()]
+        names = (*self.labelnames, "le")
+        for labels, counts, total, count in series:
+            cumulative = 0
+            for bound, bucket in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket
+                yield f"{self.name}_bucket{_labels(names, (*labels, bound))} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {total}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {count}"
+
+
+def snapshot(
+        name: str,
+        documentation: str,
+        samples: Iterable[tuple[dict, float]],
+        kind: str = "gauge"
+) -> Iterator[str]:
+    """
+    Формирует строки экспозиции метрики, значения которой снимаются при выводе.
+
+    Args:
+        name: Имя метрики
+        documentation: Описание метрики
+        samples: Пары (метки, значение)
+        kind: Тип метрики: gauge или counter
+
+    Returns:
+        Iterator[str]: Строки экспозиции
+    """
+    yield f"# HELP {name} {documentation}"
+    yield f"# TYPE {name} {kind}"
+    for labels, value in samples:
+        yield f"{name}{_labels(tuple(labels), tuple(labels.values()))} {value}"
+
+
+REQUESTS = Counter(
+    "http_requests_total", "Количество HTTP-запросов", ("method", "route", "status")
+)
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Общее время обработки HTTP-запроса", ("method", "route")
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "http_request_sql_seconds", "Время SQL-запросов за HTTP-запрос", ("method", "route")
+)
+REQUEST_SQL_STATEMENTS = Histogram(
+    "http_request_sql_statements", "Количество SQL-запросов за HTTP-запрос",
+    ("method", "route"), COUNT_BUCKETS
+)
+SERIALIZATION_SECONDS = Histogram(
+    "http_response_serialization_seconds", "Время проверки и сериализации ответа в JSON",
+    ("method", "route")
+)
+SQL_STATEMENTS = Counter("db_statements_total", "Количество выполненных SQL-запросов")
+SQL_SECONDS = Counter("db_statement_seconds_total", "Суммарное время SQL-запросов")
+REVIEW_FLUSH_SECONDS = Histogram(
+    "review_queue_flush_seconds", "Время записи пакета отзывов из очереди, включая фиксацию"
+)
+REVIEW_FLUSH_ROWS = Histogram(
+    "review_queue_flush_rows", "Количество отзывов в пакете записи", buckets=BATCH_BUCKETS
+)
+
+REGISTRY = [
+    REQUESTS, REQUEST_SECONDS, REQUEST_SQL_SECONDS, REQUEST_SQL_STATEMENTS,
+    SERIALIZATION_SECONDS, SQL_STATEMENTS, SQL_SECONDS, REVIEW_FLUSH_SECONDS, REVIEW_FLUSH_ROWS
+]
+
+
+@dataclass
+class RequestStats:
+    """
+    Счетчики одного HTTP-запроса.
+
+    Attributes:
+        sql_seconds: Суммарное время SQL-запросов
+        statements: Количество SQL-запросов
+        serialization_seconds: Время сериализации ответа
+        scope: ASGI scope запроса
+        profile: Пары (время, текст) SQL-запросов, если запрошено профилирование
+    """
+    sql_seconds: float = 0.0
+    statements: int = 0
+    serialization_seconds: float = 0.0
+    scope: dict | None = None
+    profile: list[tuple[float, str]] | None = None
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+@contextmanager
+def serialization() -> Iterator[None]:
+    """
+    Измеряет время сериализации ответа текущего HTTP-запроса.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.serialization_seconds += time.perf_counter() - start
+
+
+def instrument_serialization() -> None:
+    """
+    Измеряет проверку и сериализацию ответов по response_model во всех маршрутах.
+
+    FastAPI выполняет их в routing.serialize_response; функция оборачивается
+    один раз замером serialization(). Обработчики, сами возвращающие
+    Response (app.cache, app.etag), ее не вызывают и не учитываются дважды.
+    """
+    serialize = routing.serialize_response
+    if getattr(serialize, "__wrapped__", None) is not None:
+        return
+
+    @wraps(serialize)
+    async def timed(**kwargs: Any) -> Any:
+        with serialization():
+            return await serialize(**kwargs)
+    routing.serialize_response = timed
+
+
+def observe_statement(elapsed: float, statement: str) -> None:
+    """
+    Учитывает выполненный SQL-запрос (вызывается обработчиками событий app.database).
+
+    Args:
+        elapsed: Время выполнения в секундах
+        statement: Текст запроса
+    """
+    SQL_STATEMENTS.inc()
+    SQL_SECONDS.inc(amount=elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.sql_seconds += elapsed
+        stats.statements += 1
+        if stats.profile is not None:
+            stats.profile.append((elapsed, statement))
+
+
+def current_route() -> str | None:
+    """
+    Возвращает шаблон маршрута обрабатываемого HTTP-запроса.
+
+    Returns:
+        str | None: Шаблон маршрута или None вне HTTP-запроса
+    """
+    stats = _request_stats.get()
+    if stats is None or stats.scope is None:
+        return None
+    return f"{stats.scope['method']} {route_template(stats.scope)}"
+
+
+def route_template(scope: dict) -> str:
+    """
+    Возвращает шаблон пути маршрута, обработавшего запрос.
+
+    Маршрут вложенного роутера может хранить шаблон без префикса
+    включения; префикс восстанавливается из фактического пути запроса.
+
+    Args:
+        scope: ASGI scope после маршрутизации
+
+    Returns:
+        str: Шаблон вида /api/books/{book_id} или UNMATCHED_ROUTE
+    """
+    template = getattr(scope.get("route"), "path_format", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    try:
+        suffix = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = scope["path"]
+    if suffix != path and path.endswith(suffix):
+        return path[:len(path) - len(suffix)] + template
+    return template
+
+
+def _profile_headers(stats: RequestStats) -> list[tuple[bytes, bytes]]:
+    statements = [
+        {"ms": round(elapsed * 1000, 3), "sql": " ".join(statement.split())[:PROFILE_SQL_LENGTH]}
+        for elapsed, statement in stats.profile[:PROFILE_MAX_STATEMENTS]
+    ]
+    profile = {
+        "count": stats.statements,
+        "total_ms": round(stats.sql_seconds * 1000, 3),
+        "omitted": max(len(stats.profile) - PROFILE_MAX_STATEMENTS, 0),
+        "statements": statements,
+    }
+    timing = f'db;dur={stats.sql_seconds * 1000:.3f};desc="{stats.statements} SQL"'
+    return [
+        (PROFILE_HEADER, json.dumps(profile, ensure_ascii=True).encode()),
+        (b"server-timing", timing.encode()),
+    ]
+
+
+class MetricsMiddleware:     # pylint: disable=too-few-public-methods
+    """
+    ASGI-middleware, измеряющее HTTP-запросы по шаблонам маршрутов.
+
+    Реализовано на уровне ASGI, а не BaseHTTPMiddleware: не создает
+    дополнительную задачу на запрос и не буферизует потоковые ответы.
+    """
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope=scope)
+        if SQL_PROFILING and any(name == PROFILE_HEADER for name, _ in scope["headers"]):
+            stats.profile = []
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if stats.profile is not None:
+                    message["headers"] = [*message.get("headers", ()), *_profile_headers(stats)]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stats.reset(token)
+            path = route_template(scope)
+            method = scope["method"]
+            REQUESTS.inc(method, path, str(status_code))
+            REQUEST_SECONDS.observe(elapsed, method, path)
+            REQUEST_SQL_SECONDS.observe(stats.sql_seconds, method, path)
+            REQUEST_SQL_STATEMENTS.observe(stats.statements, method, path)
+            if stats.serialization_seconds:
+                SERIALIZATION_SECONDS.observe(stats.serialization_seconds, method, path)
+
+
+def render(*extra: Iterable[str]) -> str:
+    """
+    Выводит все метрики в текстовом формате экспозиции Prometheus.
+
+    Args:
+        extra: Дополнительные строки экспозиции (измерители, снятые при выводе)
+
+    Returns:
+        str: Текст экспозиции
+    """
+    lines = [line for metric in REGISTRY for line in metric.collect()]
+    for block in extra:
+        lines.extend(block)
+    return "\n".join(lines) + "\n"
@@ -7,5 +7,11 @@ from .author import Author
 from .genre import Genre
 from .user import User
 from .review import Review
+from .rating import BookRating
+from .ranking import LeaderboardEntry, RankingParam
+from .version import TableVersion
 
-__all__ = ["Book", "Author", "Genre", "User", "Review"]
+__all__ = [
+    "Book", "Author", "Genre", "User", "Review", "BookRating", "LeaderboardEntry",
+    "RankingParam", "TableVersion"
+]
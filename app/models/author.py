@@ -7,6 +7,7 @@
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.book import search_indexes
 
 
 class Author(Base):     # pylint: disable=too-few-public-methods
@@ -18,6 +19,7 @@ class Author(Base):     # pylint: disable=too-few-public-methods
         name (str): Полное имя автора (уникальное)
         bio (str): Биографическая информация об авторе
         books (Relationship): Связь один-ко-многим с книгами автора
+        version (int): Номер версии строки, увеличивается при каждом обновлении
     """
 
     __tablename__ = "authors"
@@ -25,5 +27,9 @@ class Author(Base):     # pylint: disable=too-few-public-methods
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True)
     bio = Column(String)
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __table_args__ = search_indexes("authors", "name", name)
+    __mapper_args__ = {"version_id_col": version}
 
     books = relationship("Book", back_populates="author")
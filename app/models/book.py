@@ -4,10 +4,61 @@
 Содержит определение таблицы books в базе данных и связи с другими таблицами.
 """
 
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import DDL, Column, ForeignKey, Index, Integer, String, event, func, literal_column
 from sqlalchemy.orm import relationship
 from app.database import Base
 
+# Конфигурация полнотекстового поиска: без стемминга, названия бывают на разных языках
+SEARCH_CONFIG = "simple"
+
+# Триграммные индексы требуют расширения pg_trgm
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+
+def search_vector(column):
+    """
+    Строит выражение to_tsvector для колонки.
+
+    Конфигурация подставляется литералом, чтобы выражение в запросе
+    совпадало с выражением GIN-индекса.
+
+    Args:
+        column: Текстовая колонка
+
+    Returns:
+        Выражение to_tsvector(SEARCH_CONFIG, column)
+    """
+    return func.to_tsvector(literal_column(f"'{SEARCH_CONFIG}'"), column)
+
+
+def search_indexes(table: str, name: str, column) -> tuple[Index, Index]:
+    """
+    Создает GIN-индексы полнотекстового и триграммного поиска по колонке.
+
+    Индексы создаются только в PostgreSQL.
+
+    Args:
+        table: Имя таблицы для имен индексов
+        name: Имя колонки (в теле класса модели колонка еще не названа)
+        column: Текстовая колонка
+
+    Returns:
+        tuple[Index, Index]: Индекс tsvector и индекс gin_trgm_ops
+    """
+    return (
+        Index(
+            f"ix_{table}_{name}_fts", search_vector(column), postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            f"ix_{table}_{name}_trgm", column,
+            postgresql_using="gin", postgresql_ops={name: "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+
 
 class Book(Base):       # pylint: disable=too-few-public-methods
     """
@@ -22,6 +73,7 @@ class Book(Base):       # pylint: disable=too-few-public-methods
         author (Relationship): Связь многие-к-одному с автором
         reviews (Relationship): Связь один-ко-многим с отзывами
         genres (Relationship): Связь многие-ко-многим с жанрами
+        version (int): Номер версии строки, увеличивается при каждом обновлении
     """
 
     __tablename__ = "books"
@@ -31,6 +83,10 @@ class Book(Base):       # pylint: disable=too-few-public-methods
     publication_year = Column(Integer)
     isbn = Column(String, unique=True, index=True)
     author_id = Column(Integer, ForeignKey("authors.id"))
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __table_args__ = search_indexes("books", "title", title)
+    __mapper_args__ = {"version_id_col": version}
 
     author = relationship("Author", back_populates="books")
     reviews = relationship("Review", back_populates="book")
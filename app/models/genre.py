@@ -2,10 +2,11 @@
 Модуль с моделью данных для жанров книг.
 
 Содержит определение таблицы genres и ассоциативной таблицы book_genre
-для связи многие-ко-многим с книгами.
+для связи многие-ко-многим с книгами. Первичный ключ book_genre начинается
+с book_id (жанры книги), обратный индекс (genre_id, book_id) — для книг жанра.
 """
 
-from sqlalchemy import Column, ForeignKey, Integer, String, Table
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Table
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -14,7 +15,8 @@ book_genre = Table(
     "book_genre",
     Base.metadata,
     Column("book_id", Integer, ForeignKey("books.id"), primary_key=True),
-    Column("genre_id", Integer, ForeignKey("genres.id"), primary_key=True)
+    Column("genre_id", Integer, ForeignKey("genres.id"), primary_key=True),
+    Index("ix_book_genre_genre_book", "genre_id", "book_id")
 )
 
 
@@ -26,15 +28,22 @@ class Genre(Base):      # pylint: disable=too-few-public-methods
         id (int): Уникальный идентификатор жанра (первичный ключ)
         name (str): Название жанра (уникальное)
         books (Relationship): Связь многие-ко-многим с книгами через book_genre
+        version (int): Номер версии строки, увеличивается при каждом обновлении
+        book_count (int): Количество книг жанра, поддерживается при изменении связей
+            (app.crud.genre_counts)
     """
 
     __tablename__ = "genres"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True)
+    version = Column(Integer, nullable=False, server_default="1")
+    book_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     books = relationship(
         "Book",
         secondary=book_genre,
         back_populates="genres"
     )
+
+    __mapper_args__ = {"version_id_col": version}
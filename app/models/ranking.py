@@ -0,0 +1,57 @@
+"""
+Модуль с моделями предрассчитанных рейтингов книг.
+
+Содержит таблицу leaderboard_entries с оценками книг в каждом рейтинге
+(общем, по жанру и по десятилетию публикации) и таблицу ranking_params
+с параметрами расчета оценок.
+"""
+
+from sqlalchemy import Column, Float, ForeignKey, Index, Integer, String
+from app.database import Base
+
+
+class LeaderboardEntry(Base):     # pylint: disable=too-few-public-methods
+    """
+    Модель строки рейтинга книг.
+
+    Рейтинг задается парой (board, board_key): ("all", 0) — общий,
+    ("genre", genre_id) — по жанру, ("decade", 1990) — по десятилетию.
+    Индексы по (board, board_key, оценка DESC, book_id) позволяют читать
+    страницу рейтинга без сортировки.
+
+    Атрибуты:
+        board (str): Вид рейтинга: all, genre или decade
+        board_key (int): Жанр или первый год десятилетия; 0 для общего рейтинга
+        book_id (int): Идентификатор книги
+        bayesian (float): Байесовская средняя оценка
+        wilson (float): Нижняя граница доверительного интервала Уилсона в шкале оценок
+    """
+
+    __tablename__ = "leaderboard_entries"
+
+    board = Column(String, primary_key=True)
+    board_key = Column(Integer, primary_key=True)
+    book_id = Column(Integer, ForeignKey("books.id"), primary_key=True)
+    bayesian = Column(Float, nullable=False)
+    wilson = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index("ix_leaderboard_bayesian", board, board_key, bayesian.desc(), book_id),
+        Index("ix_leaderboard_wilson", board, board_key, wilson.desc(), book_id),
+        Index("ix_leaderboard_entries_book_id", book_id),
+    )
+
+
+class RankingParam(Base):     # pylint: disable=too-few-public-methods
+    """
+    Модель параметра расчета рейтингов.
+
+    Атрибуты:
+        name (str): Имя параметра (первичный ключ), например prior_mean
+        value (float): Значение параметра
+    """
+
+    __tablename__ = "ranking_params"
+
+    name = Column(String, primary_key=True)
+    value = Column(Float, nullable=False)
@@ -0,0 +1,32 @@
+"""
+Модуль с моделью агрегатов рейтинга книг.
+
+Содержит определение таблицы book_ratings, в которой хранятся
+предрассчитанные количество, сумма и среднее значение оценок по каждой книге.
+"""
+
+from sqlalchemy import Column, Float, ForeignKey, Integer
+from app.database import Base
+
+
+class BookRating(Base):     # pylint: disable=too-few-public-methods
+    """
+    Модель агрегированного рейтинга книги.
+
+    Строка обновляется инкрементально при каждом новом отзыве,
+    поэтому рейтинги книг (app.crud.ranking) строятся без пересчета
+    по таблице reviews.
+
+    Атрибуты:
+        book_id (int): Идентификатор книги (первичный ключ)
+        review_count (int): Количество отзывов с оценкой
+        rating_sum (int): Сумма оценок
+        rating_avg (float): Средняя оценка
+    """
+
+    __tablename__ = "book_ratings"
+
+    book_id = Column(Integer, ForeignKey("books.id"), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    rating_avg = Column(Float)
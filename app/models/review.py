@@ -4,7 +4,7 @@
 Содержит определение таблицы reviews и связей с пользователями и книгами.
 """
 
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -24,6 +24,13 @@ class Review(Base):     # pylint: disable=too-few-public-methods
     """
 
     __tablename__ = "reviews"
+    __table_args__ = (
+        # Отзывы книги и лента отзывов пользователя по порядку идентификаторов
+        Index("ix_reviews_book_id", "book_id", "id"),
+        Index("ix_reviews_user_id", "user_id", "id"),
+        # Один отзыв пользователя на книгу; NULL в user_id не ограничивается
+        Index("uq_reviews_user_book", "user_id", "book_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     book_id = Column(Integer, ForeignKey("books.id"))
@@ -0,0 +1,25 @@
+"""
+Модуль с моделью счетчиков изменений таблиц.
+
+Содержит определение таблицы table_versions: номер версии каждой таблицы
+увеличивается после фиксации транзакции, изменившей ее строки. Используется
+для слабых ETag коллекций.
+"""
+
+from sqlalchemy import BigInteger, Column, String
+from app.database import Base
+
+
+class TableVersion(Base):     # pylint: disable=too-few-public-methods
+    """
+    Модель счетчика изменений таблицы.
+
+    Атрибуты:
+        table_name (str): Имя таблицы (первичный ключ)
+        version (int): Количество транзакций, изменивших таблицу
+    """
+
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,156 @@
+"""
+Курсорная (keyset) пагинация.
+
+Курсор — непрозрачный токен с ключом сортировки последней строки страницы.
+Следующая страница выбирается условием «ключ строго после курсора» по индексу,
+поэтому стоимость запроса не растет с глубиной пролистывания.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from typing import Any, NamedTuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursorError(ValueError):
+    """
+    Исключение для поврежденного или чужого курсора пагинации.
+    """
+
+
+class PageRequest(NamedTuple):
+    """
+    Параметры запрошенной страницы.
+
+    Attributes:
+        cursor: Курсор из предыдущего ответа или None для первой страницы
+        limit: Размер страницы
+    """
+    cursor: str | None = None
+    limit: int = DEFAULT_PAGE_SIZE
+
+
+class KeysetPage(NamedTuple):
+    """
+    Страница результатов курсорной пагинации.
+
+    Attributes:
+        items: Элементы страницы
+        next_cursor: Курсор следующей страницы или None, если она последняя
+    """
+    items: list
+    next_cursor: str | None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Кодирует значения ключа сортировки в непрозрачный курсор.
+
+    Args:
+        values: Значения ключа сортировки последней строки.
+
+    Returns:
+        str: Курсор в кодировке base64url без выравнивания.
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _matches_column(column: Any, value: Any) -> bool:
+    if value is None:
+        return True
+    try:
+        expected = column.type.python_type
+    except (AttributeError, NotImplementedError):
+        return isinstance(value, (int, float, str)) and not isinstance(value, bool)
+    if isinstance(value, bool):
+        return expected is bool
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> list[Any]:
+    """
+    Декодирует курсор в значения ключа сортировки.
+
+    Значения сверяются с типами столбцов ключа, чтобы подделанный курсор
+    отклонялся до сравнения в SQL, а не ошибкой драйвера базы данных.
+
+    Args:
+        cursor: Курсор из ответа API.
+        columns: Столбцы ключа сортировки.
+
+    Returns:
+        list[Any]: Значения ключа сортировки.
+
+    Raises:
+        InvalidCursorError: Если курсор поврежден или не подходит к запросу.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Некорректный курсор пагинации") from exc
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise InvalidCursorError("Некорректный курсор пагинации")
+    if not all(_matches_column(column, value) for column, value in zip(columns, values)):
+        raise InvalidCursorError("Некорректный курсор пагинации")
+    return values
+
+
+def keyset_condition(order: Sequence[tuple[Any, bool]], values: Sequence[Any]):
+    """
+    Строит условие «строка следует после ключа» для составного порядка.
+
+    Args:
+        order: Пары (столбец, по убыванию) в порядке сортировки.
+        values: Значения ключа последней строки предыдущей страницы.
+
+    Returns:
+        ColumnElement: Условие для WHERE.
+    """
+    clauses = []
+    for index, (column, descending) in enumerate(order):
+        after = column < values[index] if descending else column > values[index]
+        equal = [order[i][0] == values[i] for i in range(index)]
+        clauses.append(and_(*equal, after))
+    return or_(*clauses)
+
+
+def paginate(
+        query: Query,
+        order: Sequence[tuple[Any, bool]],
+        page: PageRequest,
+        key: Callable[[Any], Sequence[Any]]
+) -> KeysetPage:
+    """
+    Выбирает страницу запроса по курсору.
+
+    Args:
+        query: Запрос без сортировки и ограничения.
+        order: Пары (столбец, по убыванию); последний столбец должен быть уникальным.
+        page: Курсор и размер страницы.
+        key: Функция, возвращающая значения ключа сортировки для строки результата.
+
+    Returns:
+        KeysetPage: Элементы страницы и курсор следующей.
+    """
+    if page.cursor is not None:
+        columns = [column for column, _ in order]
+        query = query.filter(keyset_condition(order, decode_cursor(page.cursor, columns)))
+    query = query.order_by(*(
+        column.desc() if descending else column for column, descending in order
+    ))
+    rows = query.limit(page.limit + 1).all()
+    if len(rows) <= page.limit:
+        return KeysetPage(rows, None)
+    rows = rows[:page.limit]
+    return KeysetPage(rows, encode_cursor(key(rows[-1])))
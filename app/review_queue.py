@@ -0,0 +1,268 @@
+"""
+Очередь отложенной записи отзывов (write-behind).
+
+POST /api/reviews/reviews/queue проверяет отзыв, ставит его в ограниченную
+очередь и отвечает 202. Фоновый поток забирает отзывы пакетами: пакет
+записывается, когда набралось REVIEW_FLUSH_ROWS отзывов или прошло
+REVIEW_FLUSH_MS миллисекунд с первого отзыва пакета. Пакет вставляется
+одним многострочным INSERT, агрегаты рейтинга обновляются одним запросом,
+транзакция фиксируется один раз на пакет.
+
+Надежность задается REVIEW_QUEUE_DURABILITY:
+
+- commit: ответ отправляется после фиксации пакета с отзывом
+  (групповая фиксация, отзывы не теряются при сбое процесса);
+- enqueue: ответ отправляется сразу после постановки в очередь,
+  при аварийной остановке процесса отзывы из очереди теряются;
+- relaxed: как enqueue, и пакет в PostgreSQL фиксируется
+  с synchronous_commit = off (без ожидания сброса WAL на диск).
+
+При штатной остановке (lifespan) очередь дописывается до конца.
+Если очередь заполнена, вызов сразу завершается ошибкой ReviewQueueFullError,
+которую приложение превращает в ответ 503 с заголовком Retry-After.
+Второй отзыв пользователя о книге, еще ожидающий записи, отклоняется
+ошибкой ReviewAlreadyQueuedError. Ошибка записи пакета любого рода
+передается ожидающим вызовам и не останавливает поток записи.
+
+Настройки: REVIEW_QUEUE_SIZE, REVIEW_FLUSH_ROWS, REVIEW_FLUSH_MS,
+REVIEW_QUEUE_DURABILITY, REVIEW_QUEUE_RETRY_AFTER (секунды).
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future, InvalidStateError
+from typing import Optional
+
+from sqlalchemy import text
+
+from app import crud, metrics, schemas
+from app.database import SessionLocal
+
+REVIEW_QUEUE_SIZE = int(os.getenv("REVIEW_QUEUE_SIZE", "10000"))
+REVIEW_FLUSH_ROWS = int(os.getenv("REVIEW_FLUSH_ROWS", "500"))
+REVIEW_FLUSH_MS = int(os.getenv("REVIEW_FLUSH_MS", "50"))
+REVIEW_QUEUE_DURABILITY = os.getenv("REVIEW_QUEUE_DURABILITY", "commit").lower()
+REVIEW_QUEUE_RETRY_AFTER = int(os.getenv("REVIEW_QUEUE_RETRY_AFTER", "1"))
+
+DURABILITY_MODES = ("commit", "enqueue", "relaxed")
+
+logger = logging.getLogger("app.review_queue")
+
+# Маркер остановки потока записи
+_STOP = object()
+
+
+class ReviewQueueFullError(Exception):
+    """
+    Очередь отзывов заполнена.
+    """
+
+    def __init__(self, retry_after: int = REVIEW_QUEUE_RETRY_AFTER):
+        super().__init__("Очередь отзывов заполнена, повторите запрос позже")
+        self.retry_after = retry_after
+
+
+class ReviewAlreadyQueuedError(Exception):
+    """
+    Отзыв пользователя о книге уже ожидает записи в очереди.
+    """
+
+
+def _settle(future: Future, exc: BaseException | None = None) -> None:
+    try:
+        if exc is None:
+            future.set_result(None)
+        else:
+            future.set_exception(exc)
+    except InvalidStateError:
+        # Ожидание отменено вызывающим запросом
+        pass
+
+
+class ReviewQueue:
+    """
+    Ограниченная очередь отзывов с фоновым потоком пакетной записи.
+    """
+
+    def __init__(
+            self,
+            capacity: int = REVIEW_QUEUE_SIZE,
+            flush_rows: int = REVIEW_FLUSH_ROWS,
+            flush_ms: int = REVIEW_FLUSH_MS,
+            durability: str = REVIEW_QUEUE_DURABILITY
+    ):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Неизвестный режим REVIEW_QUEUE_DURABILITY: {durability}")
+        self.capacity = capacity
+        self.flush_rows = flush_rows
+        self.flush_ms = flush_ms
+        self.durability = durability
+        self.enqueued = 0
+        self.rejected = 0
+        self.written = 0
+        self.failed = 0
+        self._queue: queue.Queue = queue.Queue(capacity)
+        self._lock = threading.Lock()
+        # Пары (пользователь, книга) отзывов, поставленных в очередь и еще не записанных
+        self._pending: set[tuple[int, int]] = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="review-queue", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, review: schemas.ReviewCreate, user_id: int) -> Future:
+        """
+        Ставит отзыв в очередь записи.
+
+        Args:
+            review: Проверенные данные отзыва
+            user_id: Идентификатор автора отзыва
+
+        Returns:
+            Future: Завершается после фиксации пакета с отзывом
+
+        Raises:
+            ReviewQueueFullError: Если очередь заполнена
+            ReviewAlreadyQueuedError: Если отзыв пользователя о книге уже в очереди
+        """
+        self._ensure_started()
+        key = (user_id, review.book_id)
+        with self._lock:
+            if key in self._pending:
+                raise ReviewAlreadyQueuedError()
+            self._pending.add(key)
+        future: Future = Future()
+        try:
+            self._queue.put_nowait(({**review.dict(), "user_id": user_id}, future))
+        except queue.Full:
+            self._release([key])
+            self.rejected += 1
+            raise ReviewQueueFullError() from None
+        self.enqueued += 1
+        return future
+
+    def _release(self, keys: Iterable[tuple[int, int]]) -> None:
+        with self._lock:
+            self._pending.difference_update(keys)
+
+    async def enqueue(self, review: schemas.ReviewCreate, user_id: int) -> bool:
+        """
+        Ставит отзыв в очередь и ждет фиксации, если этого требует режим надежности.
+
+        Args:
+            review: Проверенные данные отзыва
+            user_id: Идентификатор автора отзыва
+
+        Returns:
+            bool: Зафиксирован ли отзыв к моменту возврата
+
+        Raises:
+            ReviewQueueFullError: Если очередь заполнена
+            ReviewAlreadyQueuedError: Если отзыв пользователя о книге уже в очереди
+            SQLAlchemyError: Если отзыв не удалось записать (режим commit)
+        """
+        future = self.submit(review, user_id)
+        if self.durability != "commit":
+            return False
+        await asyncio.wrap_future(future)
+        return True
+
+    def _next_batch(self, first) -> tuple[list, bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.flush_ms / 1000
+        while len(batch) < self.flush_rows:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch, stopping = self._next_batch(item)
+            self._flush(batch)
+
+    def _write(self, rows: list[dict]) -> None:
+        with SessionLocal() as db:
+            if self.durability == "relaxed" and db.get_bind().dialect.name == "postgresql":
+                db.execute(text("SET LOCAL synchronous_commit TO OFF"))
+            crud.create_reviews_batch(db, rows)
+            db.commit()
+
+    def _flush(self, batch: list[tuple[dict, Future]]) -> None:
+        start = time.perf_counter()
+        try:
+            self._write([row for row, _ in batch])
+        except Exception:     # pylint: disable=broad-exception-caught
+            # Пакет целиком откатывается из-за одной строки (например, повторного отзыва
+            # о книге): записываем отзывы по одному, чтобы потерять только ошибочные.
+            # Перехватываются любые ошибки: поток записи не должен завершаться,
+            # иначе ожидающие запросы не получат ответ, а очередь переполнится
+            logger.warning("Пакет из %d отзывов не записан, запись по одному", len(batch))
+            for row, future in batch:
+                try:
+                    self._write([row])
+                except Exception as exc:     # pylint: disable=broad-exception-caught
+                    self.failed += 1
+                    logger.error("Отзыв не записан: %s", exc)
+                    _settle(future, exc)
+                else:
+                    self.written += 1
+                    _settle(future)
+        else:
+            self.written += len(batch)
+            for _, future in batch:
+                _settle(future)
+        finally:
+            self._release((row["user_id"], row["book_id"]) for row, _ in batch)
+        metrics.REVIEW_FLUSH_SECONDS.observe(time.perf_counter() - start)
+        metrics.REVIEW_FLUSH_ROWS.observe(len(batch))
+
+    def stop(self) -> None:
+        """
+        Дописывает отзывы из очереди и останавливает поток записи.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def stats(self) -> dict:
+        """
+        Возвращает глубину очереди и счетчики записи.
+
+        Returns:
+            dict: Снимок счетчиков очереди.
+        """
+        return {
+            "depth": self._queue.qsize(),
+            "capacity": self.capacity,
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "written": self.written,
+            "failed": self.failed,
+        }
+
+
+review_queue = ReviewQueue()
@@ -2,16 +2,25 @@
 Маркер, который сообщает интерпретатору, что каталог содержит код для модуля Python.
 """
 
-from .book import Book, BookCreate
-from .user import User, UserCreate, Token
+from .book import Book, BookCreate, BookDetail, BookSearchHit
+from .user import (
+    User, UserBase, UserCreate, UserProvision, UserProvisionBatch, ProvisionReport, Token
+)
 from .author import Author, AuthorCreate
-from .genre import Genre, GenreCreate
-from .review import Review, ReviewCreate
+from .genre import Genre, GenreCreate, GenreAssignment, GenreAssignmentReport
+from .review import Review, ReviewCreate, ReviewRate, ReviewQueued
+from .pagination import Page
+from .batch import Batch
+from .bulk import BookImport, ImportRowError, ImportReport
 
 __all__ = [
-    "Book", "BookCreate",
-    "User", "UserCreate", "Token",
+    "Book", "BookCreate", "BookDetail", "BookSearchHit",
+    "User", "UserBase", "UserCreate", "UserProvision", "UserProvisionBatch", "ProvisionReport",
+    "Token",
     "Author", "AuthorCreate",
-    "Genre", "GenreCreate",
-    "Review", "ReviewCreate"
+    "Genre", "GenreCreate", "GenreAssignment", "GenreAssignmentReport",
+    "Review", "ReviewCreate", "ReviewRate", "ReviewQueued",
+    "Page",
+    "Batch",
+    "BookImport", "ImportRowError", "ImportReport"
 ]
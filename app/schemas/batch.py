@@ -0,0 +1,20 @@
+"""
+Модуль с Pydantic-схемой ответа пакетной выборки по идентификаторам.
+"""
+
+from typing import Generic, TypeVar
+from pydantic import BaseModel
+
+ItemT = TypeVar("ItemT")
+
+
+class Batch(BaseModel, Generic[ItemT]):     # pylint: disable=too-few-public-methods
+    """
+    Пакет сущностей, запрошенных по идентификаторам.
+
+    Attributes:
+        items: Найденные элементы в порядке запрошенных идентификаторов
+        missing: Идентификаторы, для которых сущности не найдены
+    """
+    items: list[ItemT]
+    missing: list[int]
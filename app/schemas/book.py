@@ -5,7 +5,13 @@
 """
 
 from datetime import datetime
-from pydantic import BaseModel, field_validator, constr
+from typing import Any
+from pydantic import BaseModel, field_validator, model_validator, constr
+from sqlalchemy import inspect
+
+from .author import Author
+from .genre import Genre
+from .review import Review
 
 
 class BookBase(BaseModel):        # pylint: disable=too-few-public-methods
@@ -63,3 +69,54 @@ class Book(BookBase):         # pylint: disable=too-few-public-methods
     class Config:         # pylint: disable=too-few-public-methods
         """Настройки для работы с ORM."""
         from_attributes = True
+
+
+class BookSearchHit(Book):        # pylint: disable=too-few-public-methods
+    """
+    Результат поиска книги.
+
+    Attributes:
+        author: Имя автора
+        score: Оценка релевантности (больше — лучше)
+    """
+    author: str | None = None
+    score: float
+
+
+class BookDetail(Book):       # pylint: disable=too-few-public-methods
+    """
+    Схема книги со связанными данными, запрошенными параметром include.
+
+    Незагруженные связи ORM-объекта не читаются и не попадают в ответ,
+    поэтому сериализация не порождает дополнительных запросов.
+
+    Attributes:
+        author: Автор книги
+        genres: Жанры книги
+        reviews: Отзывы о книге
+    """
+    author: Author | None = None
+    genres: list[Genre] | None = None
+    reviews: list[Review] | None = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def skip_unloaded(cls, data: Any) -> Any:
+        """
+        Оставляет только загруженные атрибуты ORM-объекта.
+
+        Args:
+            data: ORM-объект или словарь с данными книги
+
+        Returns:
+            Any: Словарь загруженных полей или исходные данные
+        """
+        state = inspect(data, raiseerr=False)
+        if state is None:
+            return data
+        unloaded = state.unloaded
+        return {
+            name: getattr(data, name)
+            for name in cls.model_fields
+            if name not in unloaded and hasattr(data, name)
+        }
@@ -0,0 +1,68 @@
+"""
+Модуль с Pydantic-схемами массового импорта каталога.
+
+Содержит схему строки импорта книги и отчет о результатах загрузки.
+"""
+
+from pydantic import BaseModel, model_validator
+
+from .book import BookBase
+
+
+class BookImport(BookBase):       # pylint: disable=too-few-public-methods
+    """
+    Строка импорта книги.
+
+    Автор задается идентификатором author_id или именем author;
+    отсутствующие авторы и жанры создаются при импорте.
+
+    Attributes:
+        author_id: Идентификатор существующего автора (опционально)
+        author: Имя автора (опционально)
+        genres: Названия жанров книги
+    """
+    author_id: int | None = None
+    author: str | None = None
+    genres: list[str] = []
+
+    @model_validator(mode="after")
+    def check_author(self) -> "BookImport":
+        """
+        Проверяет, что автор указан идентификатором или именем.
+
+        Raises:
+            ValueError: Если автор не указан
+        """
+        if self.author_id is None and not self.author:
+            raise ValueError("Необходимо указать author_id или author")
+        return self
+
+
+class ImportRowError(BaseModel):      # pylint: disable=too-few-public-methods
+    """
+    Ошибка в строке импорта.
+
+    Attributes:
+        line: Номер строки во входных данных
+        errors: Описания ошибок
+    """
+    line: int
+    errors: list[str]
+
+
+class ImportReport(BaseModel):        # pylint: disable=too-few-public-methods
+    """
+    Отчет о массовом импорте.
+
+    Attributes:
+        received: Количество прочитанных строк
+        inserted: Количество добавленных книг
+        skipped: Количество книг, пропущенных из-за существующего ISBN
+        failed: Количество строк с ошибками
+        errors: Ошибки по строкам (не более MAX_REPORTED_ERRORS)
+    """
+    received: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = []
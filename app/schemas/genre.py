@@ -4,7 +4,10 @@
 Содержит схемы для валидации данных при операциях CRUD с жанрами.
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+MAX_ASSIGNMENT_BOOKS = 1000
+MAX_ASSIGNMENT_GENRES = 100
 
 
 class GenreBase(BaseModel):     # pylint: disable=too-few-public-methods
@@ -35,3 +38,27 @@ class Genre(GenreBase):     # pylint: disable=too-few-public-methods
     class Config:       # pylint: disable=too-few-public-methods
         """Настройки для работы с ORM."""
         from_attributes = True
+
+
+class GenreAssignment(BaseModel):      # pylint: disable=too-few-public-methods
+    """
+    Наборы книг и жанров для массовой привязки.
+
+    Attributes:
+        book_ids: Идентификаторы книг
+        genre_ids: Идентификаторы жанров (при замене может быть пустым)
+    """
+    book_ids: list[int] = Field(min_length=1, max_length=MAX_ASSIGNMENT_BOOKS)
+    genre_ids: list[int] = Field(max_length=MAX_ASSIGNMENT_GENRES)
+
+
+class GenreAssignmentReport(BaseModel):        # pylint: disable=too-few-public-methods
+    """
+    Отчет о массовой привязке книг к жанрам.
+
+    Attributes:
+        added: Количество добавленных связей книга-жанр
+        removed: Количество удаленных связей книга-жанр
+    """
+    added: int = 0
+    removed: int = 0
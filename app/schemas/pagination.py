@@ -0,0 +1,20 @@
+"""
+Модуль с Pydantic-схемой страницы курсорной пагинации.
+"""
+
+from typing import Generic, TypeVar
+from pydantic import BaseModel
+
+ItemT = TypeVar("ItemT")
+
+
+class Page(BaseModel, Generic[ItemT]):     # pylint: disable=too-few-public-methods
+    """
+    Страница коллекции.
+
+    Attributes:
+        items: Элементы страницы
+        next_cursor: Курсор следующей страницы или None, если страница последняя
+    """
+    items: list[ItemT]
+    next_cursor: str | None = None
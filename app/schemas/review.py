@@ -21,6 +21,24 @@ class ReviewCreate(ReviewBase):     # pylint: disable=too-few-public-methods
     """
 
 
+class ReviewRate(BaseModel):       # pylint: disable=too-few-public-methods
+    """
+    Схема оценки книги: создает отзыв пользователя или заменяет существующий.
+    """
+    rating: int = Field(..., description="Рейтинг отзыва", ge=1, le=5)
+    comment: Optional[str] = None
+
+
+class ReviewQueued(BaseModel):     # pylint: disable=too-few-public-methods
+    """
+    Ответ на постановку отзыва в очередь записи.
+
+    Attributes:
+        committed: Зафиксирован ли отзыв к моменту ответа (режим надежности commit)
+    """
+    committed: bool
+
+
 class Review(ReviewBase):       # pylint: disable=too-few-public-methods
     """
     Полная схема отзыва.
@@ -3,7 +3,13 @@
 """
 
 from typing import Optional
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, EmailStr, Field, field_validator
+
+# Максимальное количество учетных записей в одном запросе выгрузки из SSO
+MAX_PROVISION_BATCH = 1000
+
+# Формат хэша bcrypt (Modular Crypt Format): $2b$<стоимость>$<соль и хэш>
+BCRYPT_HASH_PATTERN = r"^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$"
 
 
 class UserBase(BaseModel):      # pylint: disable=too-few-public-methods
@@ -36,6 +42,37 @@ class UserCreate(UserBase):     # pylint: disable=too-few-public-methods
         return value
 
 
+class UserProvision(UserBase):      # pylint: disable=too-few-public-methods
+    """
+    Схема учетной записи, выгружаемой из SSO с готовым хэшем пароля.
+
+    Хэш сохраняется как есть, без повторного хэширования; проверяется
+    только его формат.
+    """
+    hashed_password: str = Field(pattern=BCRYPT_HASH_PATTERN)
+
+
+class UserProvisionBatch(BaseModel):      # pylint: disable=too-few-public-methods
+    """
+    Пакет учетных записей для выгрузки из SSO.
+    """
+    users: list[UserProvision] = Field(min_length=1, max_length=MAX_PROVISION_BATCH)
+
+
+class ProvisionReport(BaseModel):     # pylint: disable=too-few-public-methods
+    """
+    Отчет о выгрузке учетных записей.
+
+    Attributes:
+        received: Количество записей в запросе
+        created: Количество созданных пользователей
+        skipped: Количество записей с уже занятыми именем или email
+    """
+    received: int
+    created: int
+    skipped: int
+
+
 class UserUpdate(BaseModel):        # pylint: disable=too-few-public-methods
     """
     Схема для обновления профиля пользователя.
@@ -0,0 +1,315 @@
+"""
+Резервный поисковый индекс каталога в памяти.
+
+Используется вместо tsvector/pg_trgm, когда база не PostgreSQL (SQLite в тестах
+и при локальной разработке). Повторяет семантику поиска в PostgreSQL:
+совпадение всех слов запроса в названии или имени автора, поиск по префиксам
+и нечеткое совпадение по триграммам (аналог word_similarity из pg_trgm).
+Ранжирование приближенное.
+
+Индекс строится лениво и помечается устаревшим после фиксации любой
+транзакции, изменявшей данные.
+"""
+
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Пороги совпадают со значениями по умолчанию pg_trgm
+WORD_SIMILARITY_THRESHOLD = 0.6
+AUTHOR_WEIGHT = 0.5
+
+_WORD = re.compile(r"\w+")
+
+
+def words(text: str | None) -> list[str]:
+    """
+    Разбивает текст на слова в нижнем регистре.
+
+    Args:
+        text: Исходный текст
+
+    Returns:
+        list[str]: Слова текста
+    """
+    return _WORD.findall(text.lower()) if text else []
+
+
+@lru_cache(maxsize=65536)
+def _word_trigrams(word: str) -> frozenset[str]:
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def trigrams(text_words: Iterable[str]) -> set[str]:
+    """
+    Строит множество триграмм так же, как pg_trgm.
+
+    Каждое слово дополняется двумя пробелами слева и одним справа.
+
+    Args:
+        text_words: Слова текста
+
+    Returns:
+        set[str]: Триграммы
+    """
+    result = set()
+    for word in text_words:
+        result |= _word_trigrams(word)
+    return result
+
+
+def word_similarity(query: set[str], text_words: list[str]) -> float:
+    """
+    Оценивает долю триграмм запроса, встречающихся в тексте.
+
+    Как и word_similarity из pg_trgm, нормируется на число триграмм запроса,
+    поэтому длинный текст не снижает оценку совпавшего слова.
+
+    Args:
+        query: Триграммы запроса
+        text_words: Слова текста
+
+    Returns:
+        float: Сходство от 0 до 1
+    """
+    if not query:
+        return 0.0
+    return len(query & trigrams(text_words)) / len(query)
+
+
+class SearchRow(NamedTuple):
+    """
+    Строка каталога в индексе (совпадает с колонками crud.book_export_statement).
+    """
+    id: int
+    title: str
+    publication_year: int
+    isbn: str
+    author_id: int | None
+    author: str | None
+
+
+class SearchHit(NamedTuple):
+    """
+    Результат поиска: строка каталога и оценка релевантности.
+    """
+    id: int
+    title: str
+    publication_year: int
+    isbn: str
+    author_id: int | None
+    author: str | None
+    score: float
+
+
+class _Entry(NamedTuple):
+    row: SearchRow
+    title_words: list[str]
+    author_words: list[str]
+    genres: frozenset[str]
+
+
+class MemorySearchIndex:
+    """
+    Инвертированный индекс слов и триграмм названий книг и имен авторов.
+
+    Атрибуты:
+        stale (bool): Индекс нужно перестроить перед следующим поиском
+        generation (int): Номер изменения данных, увеличивается при invalidate()
+    """
+
+    def __init__(self):
+        self.stale = True
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._entries: dict[int, _Entry] = {}
+        self._title_postings: dict[str, set[int]] = {}
+        self._author_postings: dict[str, set[int]] = {}
+        self._trigram_postings: dict[str, set[int]] = {}
+        self._vocabulary: list[str] = []
+
+    def invalidate(self) -> None:
+        """
+        Помечает индекс устаревшим после изменения данных.
+        """
+        with self._lock:
+            self.generation += 1
+            self.stale = True
+
+    def rebuild(
+            self,
+            rows: Iterable[tuple],
+            genres: dict[int, Iterable[str]],
+            generation: int
+    ) -> None:
+        """
+        Перестраивает индекс по строкам каталога.
+
+        Args:
+            rows: Строки с колонками SearchRow
+            genres: Названия жанров по идентификатору книги
+            generation: Значение generation до чтения строк; если данные
+                изменились во время чтения, индекс остается устаревшим
+        """
+        entries = {}
+        title_postings = defaultdict(set)
+        author_postings = defaultdict(set)
+        trigram_postings = defaultdict(set)
+        for values in rows:
+            row = SearchRow(*values)
+            entry = _Entry(
+                row, words(row.title), words(row.author), frozenset(genres.get(row.id, ()))
+            )
+            entries[row.id] = entry
+            for word in entry.title_words:
+                title_postings[word].add(row.id)
+            for word in entry.author_words:
+                author_postings[word].add(row.id)
+            for trigram in trigrams(entry.title_words + entry.author_words):
+                trigram_postings[trigram].add(row.id)
+
+        with self._lock:
+            self._entries = entries
+            self._title_postings = dict(title_postings)
+            self._author_postings = dict(author_postings)
+            self._trigram_postings = dict(trigram_postings)
+            self._vocabulary = sorted(title_postings.keys() | author_postings.keys())
+            self.stale = generation != self.generation
+
+    def _expand(self, word: str, prefix: bool) -> list[str]:
+        if not prefix:
+            return [word]
+        start = bisect_left(self._vocabulary, word)
+        end = bisect_left(self._vocabulary, word + "\U0010ffff")
+        return self._vocabulary[start:end]
+
+    def _matching(self, postings: dict[str, set[int]], query: list[str], prefix: bool) -> set[int]:
+        matched = None
+        for word in query:
+            ids = set()
+            for token in self._expand(word, prefix):
+                ids.update(postings.get(token, ()))
+            matched = ids if matched is None else matched & ids
+            if not matched:
+                return set()
+        return matched
+
+    def search(   # pylint: disable=too-many-arguments,too-many-locals
+            self,
+            query: str,
+            prefix: bool = False,
+            genre: str | None = None,
+            year_from: int | None = None,
+            year_to: int | None = None,
+            limit: int = 20
+    ) -> list[SearchHit]:
+        """
+        Ищет книги по названию и имени автора.
+
+        Args:
+            query: Поисковый запрос
+            prefix: Сопоставлять слова запроса как префиксы (автодополнение)
+            genre: Название жанра для фильтрации
+            year_from: Минимальный год публикации включительно
+            year_to: Максимальный год публикации включительно
+            limit: Максимальное количество результатов
+
+        Returns:
+            list[SearchHit]: Найденные книги по убыванию оценки
+        """
+        query_words = words(query)
+        if not query_words:
+            return []
+        query_trigrams = trigrams(query_words)
+
+        with self._lock:
+            title_ids = self._matching(self._title_postings, query_words, prefix)
+            author_ids = self._matching(self._author_postings, query_words, prefix)
+            # Сходство не ниже порога требует required общих триграмм, поэтому
+            # кандидат обязан встретиться хотя бы в одном из самых редких
+            # len(query) - required + 1 списков; остальные списки только проверяются
+            postings = sorted(
+                (self._trigram_postings.get(trigram, set()) for trigram in query_trigrams),
+                key=len
+            )
+            required = math.ceil(WORD_SIMILARITY_THRESHOLD * len(postings))
+            split = len(postings) - required + 1
+            shared = Counter()
+            for ids in postings[:split]:
+                shared.update(ids)
+            fuzzy_ids = {
+                book_id for book_id, count in shared.items()
+                if count + sum(book_id in ids for ids in postings[split:]) >= required
+            }
+            candidates = [self._entries[book_id] for book_id in title_ids | author_ids | fuzzy_ids]
+
+        hits = []
+        for entry in candidates:
+            row = entry.row
+            if genre is not None and genre not in entry.genres:
+                continue
+            if year_from is not None and row.publication_year < year_from:
+                continue
+            if year_to is not None and row.publication_year > year_to:
+                continue
+            title_similarity = word_similarity(query_trigrams, entry.title_words)
+            author_similarity = word_similarity(query_trigrams, entry.author_words)
+            in_title = row.id in title_ids
+            in_author = row.id in author_ids
+            if not (in_title or in_author
+                    or title_similarity >= WORD_SIMILARITY_THRESHOLD
+                    or author_similarity >= WORD_SIMILARITY_THRESHOLD):
+                continue
+            score = (in_title + title_similarity
+                     + AUTHOR_WEIGHT * (in_author + author_similarity))
+            hits.append(SearchHit(*row, score))
+
+        hits.sort(key=lambda hit: (-hit.score, hit.id))
+        return hits[:limit]
+
+
+memory_index = MemorySearchIndex()
+
+
+def _mark_written(session: Session, *_) -> None:
+    if session.new or session.dirty or session.deleted:
+        session.info["search_index_dirty"] = True
+
+
+def _mark_executed(orm_execute_state) -> None:
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["search_index_dirty"] = True
+
+
+def _invalidate(session: Session) -> None:
+    if session.info.pop("search_index_dirty", False):
+        memory_index.invalidate()
+
+
+def _forget(session: Session) -> None:
+    session.info.pop("search_index_dirty", None)
+
+
+def track_changes() -> None:
+    """
+    Подключает отслеживание изменений: индекс устаревает после фиксации записи.
+
+    Вызывается при первом построении индекса, поэтому при работе
+    с PostgreSQL обработчики событий не регистрируются.
+    """
+    if event.contains(Session, "after_commit", _invalidate):
+        return
+    event.listen(Session, "after_flush", _mark_written)
+    event.listen(Session, "do_orm_execute", _mark_executed)
+    event.listen(Session, "after_commit", _invalidate)
+    event.listen(Session, "after_rollback", _forget)
@@ -1,10 +1,13 @@
 """
 Реализация функционала безопасности: шифрования паролей и работы с JWT-токенами.
+
+Функции хэширования выполняют bcrypt синхронно; в обработчиках запросов
+они вызываются через пул процессов app.hashing.
 """
 
 import os
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
 from dotenv import load_dotenv
 from jose import JWTError, jwt
@@ -19,7 +22,10 @@ ALGORITHM = os.getenv("JWT_ALGORITHM")
 if not SECRET_KEY or not ALGORITHM:
     raise RuntimeError("Missing environment variables SECRET_KEY or JWT_ALGORITHM")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Стоимость bcrypt (2^rounds итераций); хэши с другой стоимостью пересчитываются при входе
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -36,6 +42,23 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Проверяет пароль и при необходимости пересчитывает его хэш.
+
+    Новый хэш возвращается, если сохраненный создан с другой стоимостью
+    (BCRYPT_ROUNDS) или устаревшей схемой.
+
+    Arguments:
+        plain_password (str): Исходный пароль.
+        hashed_password (str): Хэшированный пароль из базы данных.
+
+    Returns:
+        Tuple[bool, Optional[str]]: Результат сравнения и новый хэш или None.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """
     Генерирует хэшированное представление пароля.
@@ -0,0 +1,85 @@
+"""
+Сериализация ответов из строк колонок без ORM-объектов.
+
+Списочные эндпоинты выбирают только колонки, нужные схеме ответа, и
+собирают из строк словари в форме схемы. Такие ответы не проверяются
+Pydantic повторно (данные уже прошли проверку при записи) и кодируются
+в JSON напрямую через orjson — см. параметр validate декораторов
+app.etag.conditional и app.cache.cached.
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+
+
+class RowShape:     # pylint: disable=too-few-public-methods
+    """
+    Колонки модели SQLAlchemy в порядке полей схемы ответа.
+
+    Attributes:
+        fields: Поля схемы, для которых в таблице есть колонки
+        columns: Колонки для select() с метками prefix + имя поля
+        defaults: Значения по умолчанию полей схемы без колонок
+    """
+
+    def __init__(
+            self,
+            schema: type[BaseModel],
+            entity: type,
+            prefix: str = "",
+            defaults: bool = False
+    ) -> None:
+        """
+        Args:
+            schema: Схема ответа
+            entity: Модель SQLAlchemy
+            prefix: Префикс меток колонок (для строк с колонками нескольких таблиц)
+            defaults: Добавлять в словарь значения по умолчанию полей без колонок
+                (для ответов без response_model_exclude_unset)
+        """
+        table_columns = entity.__table__.c
+        self.fields = tuple(name for name in schema.model_fields if name in table_columns)
+        self.columns = tuple(
+            getattr(entity, name).label(prefix + name) if prefix else getattr(entity, name)
+            for name in self.fields
+        )
+        self.defaults = {
+            name: field.default
+            for name, field in schema.model_fields.items()
+            if defaults and name not in table_columns and not field.is_required()
+        }
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def to_dict(self, row: Sequence[Any], start: int = 0) -> dict:
+        """
+        Собирает словарь ответа из строки запроса.
+
+        Args:
+            row: Строка с колонками self.columns начиная с позиции start
+            start: Позиция первой колонки в строке
+
+        Returns:
+            dict: Поля схемы и их значения
+        """
+        item = dict(zip(self.fields, row[start:start + len(self.fields)]))
+        if self.defaults:
+            item.update(self.defaults)
+        return item
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Кодирует уже подготовленный ответ (словари, списки, скаляры) в JSON.
+
+    Args:
+        content: Данные ответа
+
+    Returns:
+        bytes: JSON
+    """
+    return orjson.dumps(content)
@@ -0,0 +1,149 @@
+"""
+Запуск и остановка приложения (lifespan).
+
+Импорт app.main не обращается к базе: схема создается миграциями Alembic
+(alembic upgrade head) один раз при развертывании, а не каждым процессом.
+При старте процесса выполняются фазы прогрева, время каждой пишется
+в журнал app.startup и доступно на /api/health/startup:
+
+- db_pool: открытие соединений синхронного и асинхронного пулов;
+- hashing_pool: запуск процессов пула хэширования паролей;
+- warm_paths: GET-запросы к часто читаемым эндпоинтам внутри процесса:
+  заполняют кэш скомпилированных запросов SQLAlchemy и схем Pydantic,
+  а для эндпоинтов с @cached — кэш ответов.
+
+Ошибка фазы записывается в отчет и не прерывает запуск.
+При остановке очередь отзывов дописывается в базу до закрытия пулов.
+Настройки: STARTUP_WARM_CONNECTIONS, STARTUP_WARM_HASHING, STARTUP_WARM_PATHS.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from app.database import async_engine, engine
+from app.hashing import hashing_pool
+from app.review_queue import review_queue
+
+STARTUP_WARM_CONNECTIONS = int(os.getenv("STARTUP_WARM_CONNECTIONS", "2"))
+STARTUP_WARM_HASHING = os.getenv("STARTUP_WARM_HASHING", "true").lower() in ("1", "true", "yes")
+STARTUP_WARM_PATHS = [
+    path.strip()
+    for path in os.getenv(
+        "STARTUP_WARM_PATHS", "/api/books/books/top-rated/,/api/genres/genres/"
+    ).split(",")
+    if path.strip()
+]
+
+logger = logging.getLogger("app.startup")
+
+
+async def warm_pools(connections: int | None = None) -> None:
+    """
+    Открывает соединения пулов заранее, чтобы первые запросы не ждали подключения.
+
+    Args:
+        connections: Количество одновременно открываемых соединений каждого пула
+            (по умолчанию STARTUP_WARM_CONNECTIONS)
+    """
+    if connections is None:
+        connections = STARTUP_WARM_CONNECTIONS
+    async def touch_async() -> None:
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    def touch_sync() -> None:
+        opened = [engine.connect() for _ in range(connections)]
+        for connection in opened:
+            connection.execute(text("SELECT 1"))
+            connection.close()
+
+    await asyncio.gather(
+        asyncio.to_thread(touch_sync), *(touch_async() for _ in range(connections))
+    )
+
+
+async def warm_hashing() -> None:
+    """
+    Запускает процессы пула хэширования паролей.
+    """
+    if STARTUP_WARM_HASHING:
+        await asyncio.to_thread(hashing_pool.warm)
+
+
+async def warm_paths(app: FastAPI, paths: list[str] | None = None) -> None:
+    """
+    Выполняет GET-запросы к эндпоинтам внутри процесса без сети.
+
+    Args:
+        app: Приложение
+        paths: Пути для прогрева (по умолчанию STARTUP_WARM_PATHS)
+
+    Raises:
+        RuntimeError: Если эндпоинт ответил ошибкой
+    """
+    if paths is None:
+        paths = STARTUP_WARM_PATHS
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+        for path in paths:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{path}: HTTP {response.status_code}")
+
+
+async def run_phases(phases: list[tuple[str, Callable[[], Awaitable[None]]]]) -> list[dict]:
+    """
+    Выполняет фазы запуска по очереди и измеряет их время.
+
+    Args:
+        phases: Пары (имя фазы, корутинная функция)
+
+    Returns:
+        list[dict]: Имя, длительность в миллисекундах и ошибка каждой фазы
+    """
+    report = []
+    for name, phase in phases:
+        start = time.perf_counter()
+        error = None
+        try:
+            await phase()
+        except Exception as exc:     # pylint: disable=broad-exception-caught
+            error = str(exc)
+        elapsed = (time.perf_counter() - start) * 1000
+        report.append({"phase": name, "ms": round(elapsed, 1), "error": error})
+        if error:
+            logger.warning("Фаза запуска %s завершилась ошибкой за %.1f мс: %s",
+                           name, elapsed, error)
+        else:
+            logger.info("Фаза запуска %s: %.1f мс", name, elapsed)
+    return report
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Прогревает процесс при запуске и освобождает ресурсы при остановке.
+
+    Args:
+        app: Приложение; отчет о фазах сохраняется в app.state.startup
+    """
+    start = time.perf_counter()
+    app.state.startup = await run_phases([
+        ("db_pool", warm_pools),
+        ("hashing_pool", warm_hashing),
+        ("warm_paths", lambda: warm_paths(app)),
+    ])
+    logger.info("Запуск завершен за %.1f мс", (time.perf_counter() - start) * 1000)
+    yield
+    await asyncio.to_thread(review_queue.stop)
+    hashing_pool.shutdown()
+    await async_engine.dispose()
+    engine.dispose()
@@ -0,0 +1,96 @@
+"""
+Бенчмарк накладных расходов аутентификации на один запрос.
+
+Сравнивает get_current_user без кэша (проверка подписи JWT и запрос
+пользователя на каждый вызов) и с кэшем app.auth_cache, а также время
+запроса GET /api/users/me целиком.
+
+Запуск: DATABASE_URL=... python -m benchmarks.bench_auth [--repeat N]
+Без DATABASE_URL используется временная база SQLite.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+# pylint: disable=wrong-import-position
+from fastapi.testclient import TestClient
+
+from app import auth_cache, crud, schemas, security
+from app.database import AsyncSessionLocal, Base, SessionLocal, engine
+from app.dependencies import get_current_user
+from app.main import app
+
+
+def create_token() -> str:
+    """Создает пользователя и выдает ему токен, как эндпоинт /token."""
+    with SessionLocal() as db:
+        user = crud.get_user_by_username(db, "bench_user")
+        if user is None:
+            user = crud.create_user(
+                db,
+                schemas.UserBase(username="bench_user", email="bench@example.com"),
+                security.get_password_hash("BenchPass1")
+            )
+            db.commit()
+        return security.create_access_token({"sub": user.username, "uid": user.id})
+
+
+async def dependency_timings(token: str, repeat: int, cached: bool) -> list[float]:
+    """Измеряет время вызова get_current_user в микросекундах."""
+    timings = []
+    for _ in range(repeat):
+        if not cached:
+            auth_cache.clear()
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await get_current_user(token, db)
+            timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def request_timings(client: TestClient, token: str, repeat: int, cached: bool) -> list[float]:
+    """Измеряет время запроса GET /api/users/me в микросекундах."""
+    headers = {"Authorization": f"Bearer {token}"}
+    timings = []
+    for _ in range(repeat):
+        if not cached:
+            auth_cache.clear()
+        start = time.perf_counter()
+        client.get("/api/users/me", headers=headers).raise_for_status()
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    """Печатает медиану и p99."""
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{name:>24} {statistics.median(timings):>10.1f} {p99:>10.1f}")
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    token = create_token()
+    client = TestClient(app)
+
+    print(f"{'':>24} {'p50 us':>10} {'p99 us':>10}")
+    for cached in (False, True):
+        label = "cached" if cached else "uncached"
+        report(f"get_current_user {label}",
+               asyncio.run(dependency_timings(token, args.repeat, cached)))
+        report(f"GET /users/me {label}", request_timings(client, token, args.repeat, cached))
+
+
+if __name__ == "__main__":
+    main()
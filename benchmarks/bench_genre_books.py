@@ -0,0 +1,98 @@
+"""
+Бенчмарк книг жанра и пересечения жанров на большом числе связей book_genre.
+
+Заполняет базу книгами с распределением жанров от частых к редким
+(жанр g содержит примерно каждую (g+1)-ю книгу) и измеряет время первой
+и глубокой страницы книг жанра и пересечения частого жанра с редким.
+
+Запуск: python -m benchmarks.bench_genre_books [--url URL] [--links N] [--limit N]
+По умолчанию используется временная база SQLite и 1 000 000 связей;
+для проверки на 10M связей: --links 10000000.
+"""
+
+import argparse
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.database import Base
+from app.models import Author, Book, Genre
+from app.models.genre import book_genre
+from app.pagination import PageRequest, encode_cursor
+
+GENRES = 20
+BATCH_SIZE = 50_000
+
+
+def populate(db: Session, links: int) -> int:
+    """Заполняет базу и возвращает число книг."""
+    # Книга i входит в жанры g, для которых i делится на g + 1
+    per_book = sum(1 / (genre + 1) for genre in range(GENRES))
+    books = int(links / per_book)
+    db.execute(insert(Author), [{"id": 1, "name": "Bench Author"}])
+    db.execute(insert(Genre), [{"id": g + 1, "name": f"Genre {g}"} for g in range(GENRES)])
+    for start in range(1, books + 1, BATCH_SIZE):
+        ids = range(start, min(start + BATCH_SIZE, books + 1))
+        db.execute(insert(Book), [
+            {"id": i, "title": f"Book {i}", "publication_year": 2000,
+             "isbn": f"000-{i:010d}", "author_id": 1}
+            for i in ids
+        ])
+        db.execute(insert(book_genre), [
+            {"book_id": i, "genre_id": g + 1}
+            for i in ids for g in range(GENRES) if i % (g + 1) == 0
+        ])
+    db.commit()
+    crud.rebuild_genre_counts(db)
+    db.commit()
+    return books
+
+
+def timed(func_, repeat: int) -> float:
+    """Возвращает лучшее время выполнения в миллисекундах."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func_()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--links", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as db:
+        books = populate(db, args.links)
+        total = db.scalar(select(Genre.book_count).where(Genre.id == 1))
+        print(f"{books} books, {args.links} links, genre 1: {total} books")
+        deep = encode_cursor([books // 2])
+        cases = [
+            ("genre 1, first page", [1], None),
+            ("genre 1, middle page", [1], deep),
+            ("genre 2 AND genre 20", [2, GENRES], None),
+            ("genres 2, 3, 5 middle", [2, 3, 5], deep),
+        ]
+        for name, genre_ids, cursor in cases:
+            page = PageRequest(cursor=cursor, limit=args.limit)
+            ms = timed(
+                lambda: crud.get_books_by_genres(db, genre_ids, page=page), args.repeat
+            )
+            print(f"{name:>24}: {ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
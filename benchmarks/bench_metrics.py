@@ -0,0 +1,77 @@
+"""
+Бенчмарк накладных расходов сбора метрик на один запрос.
+
+Сравнивает вызов пустого ASGI-приложения напрямую и через MetricsMiddleware,
+а также выполнение SQL-запроса с обработчиками событий метрик и без них.
+
+Запуск: python -m benchmarks.bench_metrics [--repeat N]
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import create_engine, text
+
+from app.database import instrument_engine
+from app.metrics import MetricsMiddleware
+
+
+class _Route:     # pylint: disable=too-few-public-methods
+    path_format = "/api/books/{book_id}"
+
+
+async def _empty_app(scope, _receive, send) -> None:
+    scope["route"] = _Route()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _noop(*_args) -> None:
+    return None
+
+
+async def asgi_timing(app, repeat: int) -> float:
+    """Возвращает среднее время вызова ASGI-приложения в микросекундах."""
+    start = time.perf_counter()
+    for book_id in range(repeat):
+        scope = {
+            "type": "http", "method": "GET", "path": f"/api/books/{book_id % 100}",
+            "path_params": {"book_id": book_id % 100}, "headers": [],
+        }
+        await app(scope, _noop, _noop)
+    return (time.perf_counter() - start) / repeat * 1_000_000
+
+
+def sql_timing(repeat: int, instrumented: bool) -> float:
+    """Возвращает среднее время SELECT 1 в микросекундах."""
+    engine = create_engine("sqlite://")
+    if instrumented:
+        instrument_engine(engine)
+    with engine.connect() as connection:
+        statement = text("SELECT 1")
+        start = time.perf_counter()
+        for _ in range(repeat):
+            connection.execute(statement).scalar()
+        return (time.perf_counter() - start) / repeat * 1_000_000
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=100_000)
+    args = parser.parse_args()
+
+    bare = asyncio.run(asgi_timing(_empty_app, args.repeat))
+    measured = asyncio.run(asgi_timing(MetricsMiddleware(_empty_app), args.repeat))
+    print(f"ASGI call: {bare:.2f} us bare, {measured:.2f} us with middleware, "
+          f"overhead {measured - bare:.2f} us")
+
+    without_hooks = sql_timing(args.repeat, instrumented=False)
+    with_hooks = sql_timing(args.repeat, instrumented=True)
+    print(f"SELECT 1: {without_hooks:.2f} us bare, {with_hooks:.2f} us with hooks, "
+          f"overhead {with_hooks - without_hooks:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Бенчмарк глубокого пролистывания: OFFSET/LIMIT против курсорной пагинации.
+
+Запуск: python -m benchmarks.bench_pagination [--url URL] [--rows N] [--limit N]
+По умолчанию используется временная база SQLite.
+"""
+
+import argparse
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import Author, Book
+from app.pagination import PageRequest, encode_cursor
+from app import crud
+
+BATCH_SIZE = 50_000
+
+
+def populate(db: Session, rows: int) -> None:
+    """Заполняет базу книгами одного автора."""
+    db.execute(insert(Author), [{"id": 1, "name": "Bench Author"}])
+    for start in range(1, rows + 1, BATCH_SIZE):
+        db.execute(insert(Book), [
+            {"id": i, "title": f"Book {i}", "publication_year": 2000,
+             "isbn": f"000-{i:010d}", "author_id": 1}
+            for i in range(start, min(start + BATCH_SIZE, rows + 1))
+        ])
+    db.commit()
+
+
+def offset_page(db: Session, skip: int, limit: int) -> list[Book]:
+    """Прежний способ: пропуск skip строк при каждом запросе."""
+    return db.query(Book).order_by(Book.id).offset(skip).limit(limit).all()
+
+
+def timed(func_, repeat: int) -> float:
+    """Возвращает лучшее время выполнения в миллисекундах."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func_()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as db:
+        populate(db, args.rows)
+        print(f"{'depth':>10} {'offset ms':>12} {'keyset ms':>12}")
+        depths = sorted({0, *(d for d in (1_000, 10_000, 100_000) if d < args.rows),
+                         args.rows - args.limit})
+        for depth in depths:
+            # Курсор страницы на глубине depth — идентификатор предыдущей строки
+            page = PageRequest(cursor=encode_cursor([depth]) if depth else None,
+                               limit=args.limit)
+            offset_ms = timed(lambda: offset_page(db, depth, args.limit), args.repeat)
+            keyset_ms = timed(lambda: crud.get_books(db, page=page), args.repeat)
+            print(f"{depth:>10} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Бенчмарк отзывов книги и ленты отзывов пользователя на большом числе отзывов.
+
+Заполняет базу отзывами USERS пользователей (каждый оценивает книги
+по порядку, по одному отзыву на книгу) и измеряет время первой и глубокой
+страницы отзывов книги и ленты пользователя, а также повторной оценки книги.
+
+Запуск: python -m benchmarks.bench_reviews [--url URL] [--reviews N] [--limit N]
+По умолчанию используется временная база SQLite и 1 000 000 отзывов;
+для проверки на 10M отзывов: --reviews 10000000.
+"""
+
+import argparse
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.database import Base
+from app.models import Author, Book, Review, User
+from app.pagination import PageRequest, encode_cursor
+
+USERS = 1000
+BATCH_SIZE = 50_000
+
+
+def populate(db: Session, reviews: int) -> int:
+    """Заполняет базу и возвращает число книг."""
+    books = max(reviews // USERS, 1)
+    db.execute(insert(Author), [{"id": 1, "name": "Bench Author"}])
+    db.execute(insert(User), [
+        {"id": u + 1, "username": f"user{u}", "email": f"user{u}@example.com",
+         "hashed_password": "-"}
+        for u in range(USERS)
+    ])
+    db.execute(insert(Book), [
+        {"id": b + 1, "title": f"Book {b}", "publication_year": 2000,
+         "isbn": f"000-{b:010d}", "author_id": 1}
+        for b in range(books)
+    ])
+    # Отзыв i: пользователь i % USERS, книга i // USERS — пары не повторяются
+    for start in range(0, reviews, BATCH_SIZE):
+        db.execute(insert(Review), [
+            {"id": i + 1, "user_id": i % USERS + 1, "book_id": i // USERS + 1,
+             "rating": i % 5 + 1}
+            for i in range(start, min(start + BATCH_SIZE, reviews))
+        ])
+    db.commit()
+    crud.rebuild_book_ratings(db)
+    db.commit()
+    return books
+
+
+def timed(func_, repeat: int) -> float:
+    """Возвращает лучшее время выполнения в миллисекундах."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func_()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as db:
+        books = populate(db, args.reviews)
+        print(f"{args.reviews} reviews, {books} books, {USERS} users")
+        book_id, user_id = books // 2, USERS // 2
+        # Отзывы книги b имеют идентификаторы (b - 1) * USERS + 1 .. b * USERS
+        book_middle = encode_cursor([(book_id - 1) * USERS + USERS // 2])
+        feed_middle = encode_cursor([args.reviews // 2])
+        cases = [
+            ("book reviews, first page", crud.get_reviews_by_book, book_id, None),
+            ("book reviews, middle page", crud.get_reviews_by_book, book_id, book_middle),
+            ("user feed, first page", crud.get_reviews_by_user, user_id, None),
+            ("user feed, middle page", crud.get_reviews_by_user, user_id, feed_middle),
+        ]
+        for name, read, key, cursor in cases:
+            page = PageRequest(cursor=cursor, limit=args.limit)
+            ms = timed(lambda: read(db, key, page), args.repeat)
+            print(f"{name:>26}: {ms:8.2f} ms")
+
+        ratings = iter(range(10 ** 9))
+
+        def rate() -> None:
+            crud.rate_book(db, user_id, schemas.ReviewCreate(
+                book_id=book_id, rating=next(ratings) % 5 + 1
+            ))
+            db.commit()
+        print(f"{'rate book (update)':>26}: {timed(rate, args.repeat):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Бенчмарк поиска книг: задержка точного, нечеткого и префиксного поиска.
+
+Запуск: python -m benchmarks.bench_search [--url URL] [--rows N] [--repeat N]
+По умолчанию используется временная база SQLite и резервный индекс в памяти;
+с --url postgresql://... измеряется поиск по GIN-индексам tsvector и pg_trgm.
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import Author, Book
+from app import crud
+
+BATCH_SIZE = 50_000
+AUTHORS = 10_000
+SYLLABLES = "ka ri mo del san tor vel in ar um es lo nat gri fen dor ul bra sei on".split()
+
+
+def make_vocabulary(rnd: random.Random, size: int = 20_000) -> list[str]:
+    """Создает словарь псевдослов из 2-4 слогов."""
+    vocabulary = set()
+    while len(vocabulary) < size:
+        vocabulary.add("".join(rnd.choices(SYLLABLES, k=rnd.randint(2, 4))))
+    return sorted(vocabulary)
+
+
+def make_queries(vocabulary: list[str]) -> dict[str, dict]:
+    """Формирует запросы: слово, слово с опечаткой, префикс и имя автора."""
+    word = max(vocabulary[:100], key=len)
+    return {
+        "exact": {"query": word},
+        "typo": {"query": word[:2] + word[3:]},
+        "prefix": {"query": word[:4], "prefix": True},
+        "author": {"query": "Author 4242"},
+    }
+
+
+def populate(db: Session, rows: int, vocabulary: list[str]) -> None:
+    """Заполняет базу книгами со случайными названиями из словаря."""
+    rnd = random.Random(42)
+    db.execute(insert(Author), [
+        {"id": i, "name": f"Author {i}"} for i in range(1, AUTHORS + 1)
+    ])
+    for start in range(1, rows + 1, BATCH_SIZE):
+        db.execute(insert(Book), [
+            {"id": i, "title": " ".join(rnd.sample(vocabulary, 3)).title() + f" {i}",
+             "publication_year": rnd.randint(1900, 2020),
+             "isbn": f"000-{i:010d}", "author_id": rnd.randint(1, AUTHORS)}
+            for i in range(start, min(start + BATCH_SIZE, rows + 1))
+        ])
+    db.commit()
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    vocabulary = make_vocabulary(random.Random(42))
+    with Session(engine) as db:
+        populate(db, args.rows, vocabulary)
+
+        start = time.perf_counter()
+        crud.search_books(db, "warmup")
+        print(f"first search (index build on SQLite): {time.perf_counter() - start:.2f} s")
+
+        print(f"{'query':>8} {'text':>16} {'hits':>6} {'p50 ms':>10} {'p99 ms':>10}")
+        for name, params in make_queries(vocabulary).items():
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                hits = crud.search_books(db, **params)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+            print(f"{name:>8} {params['query']:>16} {len(hits):>6} "
+                  f"{statistics.median(timings):>10.2f} {p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Бенчмарк сериализации страниц книг: ORM-объекты с проверкой схемой
+против строк колонок с прямым кодированием orjson.
+
+Для каждого набора include печатает число сериализованных строк в секунду
+(запрос к базе и кодирование ответа) обоими способами.
+
+Запуск: python -m benchmarks.bench_serialization [--url URL] [--books N] [--limit N]
+По умолчанию используется временная база SQLite.
+"""
+
+import argparse
+import tempfile
+import time
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.database import Base
+from app.models import Author, Book, Genre, Review, User
+from app.models.genre import book_genre
+from app.pagination import PageRequest, paginate
+from app.serializers import dumps
+
+INCLUDES = ((), ("author",), ("author", "genres"), ("author", "genres", "reviews"))
+
+
+def populate(db: Session, books: int) -> None:
+    """Заполняет базу книгами с автором, двумя жанрами и двумя отзывами."""
+    db.execute(insert(Author), [{"id": i, "name": f"Author {i}", "bio": "bio"}
+                                for i in range(1, 11)])
+    db.execute(insert(Genre), [{"id": i, "name": f"Genre {i}"} for i in range(1, 11)])
+    db.execute(insert(User), [{"id": 1, "username": "bench", "email": "bench@example.com",
+                               "hashed_password": "-"}])
+    db.execute(insert(Book), [
+        {"id": i, "title": f"Book {i}", "publication_year": 2000,
+         "isbn": f"000-{i:010d}", "author_id": i % 10 + 1}
+        for i in range(1, books + 1)
+    ])
+    db.execute(insert(book_genre), [
+        {"book_id": i, "genre_id": (i + shift) % 10 + 1}
+        for i in range(1, books + 1) for shift in (0, 5)
+    ])
+    db.execute(insert(Review), [
+        {"book_id": i, "user_id": 1, "rating": 4, "comment": "ok"}
+        for i in range(1, books + 1) for _ in range(2)
+    ])
+    db.commit()
+
+
+def orm_page(db: Session, adapter: TypeAdapter, limit: int, include: tuple) -> bytes:
+    """Прежний способ: ORM-объекты со связями, проверка и сериализация схемой."""
+    books, next_cursor = paginate(
+        db.query(Book).options(*crud.book_load_options(include)),
+        [(Book.id, False)], PageRequest(limit=limit), key=lambda book: (book.id,)
+    )
+    page = adapter.validate_python(
+        {"items": books, "next_cursor": next_cursor}, from_attributes=True
+    )
+    return adapter.dump_json(page, exclude_unset=True)
+
+
+def row_page(db: Session, limit: int, include: tuple) -> bytes:
+    """Строки колонок, собранные в словари и закодированные orjson."""
+    books, next_cursor = crud.get_books(db, page=PageRequest(limit=limit), include=include)
+    return dumps({"items": books, "next_cursor": next_cursor})
+
+
+def rows_per_second(func_, rows: int, repeat: int) -> float:
+    """Возвращает число строк в секунду по лучшему из repeat запусков."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func_()
+        best = min(best, time.perf_counter() - start)
+    return rows / best
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--books", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    adapter = TypeAdapter(schemas.Page[schemas.BookDetail])
+
+    with Session(engine) as db:
+        populate(db, args.books)
+        print(f"{'include':>22} {'orm rows/s':>12} {'rows rows/s':>12} {'speedup':>8}")
+        for include in INCLUDES:
+            orm = rows_per_second(
+                lambda: orm_page(db, adapter, args.limit, include), args.limit, args.repeat
+            )
+            db.expunge_all()
+            rows = rows_per_second(
+                lambda: row_page(db, args.limit, include), args.limit, args.repeat
+            )
+            print(f"{','.join(include) or '-':>22} {orm:>12.0f} {rows:>12.0f} "
+                  f"{rows / orm:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Бенчмарк запуска процесса приложения.
+
+Измеряет в отдельных процессах время импорта app.main и число SQL-запросов
+при импорте, а также время и запросы Base.metadata.create_all на уже
+созданной схеме — то, что раньше выполнял при импорте каждый рабочий процесс.
+Затем выполняет lifespan и печатает фазы прогрева.
+
+Запуск: DATABASE_URL=... python -m benchmarks.bench_startup [--repeat N]
+Без DATABASE_URL используется временная база SQLite со схемой из миграций.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+# Выполняется в дочернем процессе: события Engine подключаются до импорта приложения
+CHILD = """
+import json, sys, time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+statements = []
+event.listen(Engine, "before_cursor_execute", lambda *args: statements.append(1))
+if sys.argv[1] == "import":
+    start = time.perf_counter()
+    import app.main
+else:
+    from app.database import Base, engine
+    import app.models
+    start = time.perf_counter()
+    Base.metadata.create_all(bind=engine)
+print(json.dumps({"ms": (time.perf_counter() - start) * 1000, "statements": len(statements)}))
+"""
+
+
+def measure(mode: str, repeat: int) -> tuple[float, int]:
+    """Возвращает медиану времени и число SQL-запросов для режима import или create_all."""
+    timings, statements = [], 0
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD, mode],
+            check=True, capture_output=True, text=True, env=os.environ
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result["ms"])
+        statements = result["statements"]
+    return statistics.median(timings), statements
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], check=True,
+                   capture_output=True, env=os.environ)
+
+    ms, statements = measure("create_all", args.repeat)
+    print(f"create_all on existing schema (previous import-time cost): "
+          f"{ms:.1f} ms, {statements} SQL statements")
+    ms, statements = measure("import", args.repeat)
+    print(f"import app.main: {ms:.1f} ms, {statements} SQL statements")
+
+    # pylint: disable=import-outside-toplevel
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        for phase in client.get("/api/health/startup").json()["phases"]:
+            print(f"lifespan phase {phase['phase']:>13}: {phase['ms']:.1f} ms"
+                  + (f" ({phase['error']})" if phase["error"] else ""))
+
+
+if __name__ == "__main__":
+    main()
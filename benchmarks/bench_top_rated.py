@@ -0,0 +1,100 @@
+"""
+Бенчмарк топа книг: GROUP BY по reviews против предрассчитанного рейтинга.
+
+Запуск: python -m benchmarks.bench_top_rated [--url URL] [--reviews N] [--books N]
+По умолчанию используется временная база SQLite.
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, func, insert
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import Author, Book, Review
+from app import crud
+from app.pagination import PageRequest
+
+BATCH_SIZE = 50_000
+
+
+def populate(db: Session, books: int, reviews: int) -> None:
+    """Заполняет базу книгами и случайными отзывами."""
+    db.execute(insert(Author), [{"id": 1, "name": "Bench Author"}])
+    db.execute(insert(Book), [
+        {"id": i, "title": f"Book {i}", "publication_year": 2000,
+         "isbn": f"000-{i:010d}", "author_id": 1}
+        for i in range(1, books + 1)
+    ])
+    rng = random.Random(42)
+    for start in range(0, reviews, BATCH_SIZE):
+        size = min(BATCH_SIZE, reviews - start)
+        db.execute(insert(Review), [
+            {"book_id": rng.randint(1, books), "rating": rng.randint(1, 5)}
+            for _ in range(size)
+        ])
+    db.commit()
+
+
+def legacy_top_rated(db: Session, limit: int) -> list[Book]:
+    """Прежняя реализация: агрегирование всех отзывов на каждый запрос."""
+    return (
+        db.query(Book)
+        .join(Review)
+        .group_by(Book.id)
+        .order_by(func.avg(Review.rating).desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def measure(label: str, func_, repeat: int) -> None:
+    """Выполняет функцию repeat раз и печатает среднее и лучшее время."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func_()
+        timings.append(time.perf_counter() - start)
+    print(f"{label:<28} mean {sum(timings) / repeat * 1000:9.2f} ms"
+          f"   best {min(timings) * 1000:9.2f} ms")
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    parser.add_argument("--books", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as db:
+        start = time.perf_counter()
+        populate(db, args.books, args.reviews)
+        print(f"populated {args.reviews} reviews in {time.perf_counter() - start:.1f} s")
+
+        start = time.perf_counter()
+        crud.rebuild_book_ratings(db)
+        print(f"rebuild-ratings took {time.perf_counter() - start:.1f} s")
+
+        start = time.perf_counter()
+        crud.rebuild_leaderboards(db)
+        db.commit()
+        print(f"rebuild-leaderboards took {time.perf_counter() - start:.1f} s")
+
+        page = PageRequest(limit=args.limit)
+        measure("GROUP BY reviews", lambda: legacy_top_rated(db, args.limit), args.repeat)
+        measure("leaderboard index", lambda: crud.get_top_rated_books(db, page), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
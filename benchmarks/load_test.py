@@ -0,0 +1,79 @@
+"""
+Нагрузочный тест HTTP API: пропускная способность и p99 задержки.
+
+Запуск: python -m benchmarks.load_test --url http://localhost:8000/api/books/1
+        [--clients 500] [--duration 30]
+
+Для сравнения синхронной и асинхронной версий запустите тест против
+обеих сборок сервиса с одинаковыми параметрами и данными.
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+async def client_loop(
+        client: httpx.AsyncClient,
+        url: str,
+        deadline: float,
+        latencies: list[float],
+        errors: list[int]
+) -> None:
+    """Отправляет запросы последовательно до наступления deadline."""
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(url)
+            if response.status_code >= 500:
+                errors.append(response.status_code)
+        except httpx.HTTPError:
+            errors.append(0)
+        latencies.append(time.perf_counter() - start)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Возвращает перцентиль по отсортированному списку значений."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(len(ordered) * fraction))
+    return ordered[index]
+
+
+async def run(url: str, clients: int, duration: float) -> None:
+    """Запускает clients параллельных клиентов на duration секунд."""
+    latencies: list[float] = []
+    errors: list[int] = []
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(
+            client_loop(client, url, deadline, latencies, errors)
+            for _ in range(clients)
+        ))
+        elapsed = time.perf_counter() - started
+
+    if not latencies:
+        print("no requests completed")
+        return
+    print(f"clients   {clients}")
+    print(f"requests  {len(latencies)} ({len(errors)} errors)")
+    print(f"req/s     {len(latencies) / elapsed:.1f}")
+    print(f"p50       {percentile(latencies, 0.50) * 1000:.1f} ms")
+    print(f"p99       {percentile(latencies, 0.99) * 1000:.1f} ms")
+
+
+def main() -> None:
+    """Точка входа нагрузочного теста."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.clients, args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Окружение Alembic: миграции схемы каталога книг.
+
+Строка подключения берется из app.database (DATABASE_URL), метаданные —
+из моделей app.models. Схема создается и обновляется только миграциями:
+
+    alembic upgrade head
+
+Базу, созданную ранее через Base.metadata.create_all исходной версией
+приложения, нужно один раз пометить начальной ревизией
+(alembic stamp 0001) и затем обновить до head.
+"""
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from app.database import SQLALCHEMY_DATABASE_URL, Base
+import app.models     # pylint: disable=unused-import
+
+config = context.config
+config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL.replace("%", "%%"))
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """
+    Формирует SQL миграций без подключения к базе (alembic upgrade --sql).
+    """
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """
+    Применяет миграции через отдельное соединение без пула.
+    """
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,84 @@
+"""
+Начальная схема каталога: авторы, книги, жанры, пользователи и отзывы.
+
+Соответствует схеме, которую исходная версия приложения создавала
+через Base.metadata.create_all при импорте app.main.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "authors",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String()),
+        sa.Column("bio", sa.String()),
+    )
+    op.create_index("ix_authors_id", "authors", ["id"])
+    op.create_index("ix_authors_name", "authors", ["name"], unique=True)
+
+    op.create_table(
+        "genres",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String()),
+    )
+    op.create_index("ix_genres_id", "genres", ["id"])
+    op.create_index("ix_genres_name", "genres", ["name"], unique=True)
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String()),
+        sa.Column("hashed_password", sa.String()),
+        sa.Column("email", sa.String(), unique=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "books",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String()),
+        sa.Column("publication_year", sa.Integer()),
+        sa.Column("isbn", sa.String()),
+        sa.Column("author_id", sa.Integer(), sa.ForeignKey("authors.id")),
+    )
+    op.create_index("ix_books_id", "books", ["id"])
+    op.create_index("ix_books_title", "books", ["title"])
+    op.create_index("ix_books_isbn", "books", ["isbn"], unique=True)
+
+    op.create_table(
+        "book_genre",
+        sa.Column("book_id", sa.Integer(), sa.ForeignKey("books.id"), primary_key=True),
+        sa.Column("genre_id", sa.Integer(), sa.ForeignKey("genres.id"), primary_key=True),
+    )
+
+    op.create_table(
+        "reviews",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("book_id", sa.Integer(), sa.ForeignKey("books.id")),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("rating", sa.Integer()),
+        sa.Column("comment", sa.String()),
+    )
+    op.create_index("ix_reviews_id", "reviews", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("reviews")
+    op.drop_table("book_genre")
+    op.drop_table("books")
+    op.drop_table("users")
+    op.drop_table("genres")
+    op.drop_table("authors")
@@ -0,0 +1,78 @@
+"""
+Агрегаты рейтинга, версии строк и счетчики таблиц, поисковые индексы.
+
+- book_ratings: предрассчитанные оценки книг, заполняются по reviews;
+- колонки version у books, authors и genres и таблица table_versions для ETag;
+- в PostgreSQL: расширение pg_trgm и GIN-индексы tsvector и триграмм
+  по названиям книг и именам авторов.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# Таблицы и колонки с полнотекстовым и триграммным поиском
+SEARCH_COLUMNS = (("books", "title"), ("authors", "name"))
+VERSIONED_TABLES = ("books", "authors", "genres")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "book_ratings",
+        sa.Column("book_id", sa.Integer(), sa.ForeignKey("books.id"), primary_key=True),
+        sa.Column("review_count", sa.Integer(), nullable=False),
+        sa.Column("rating_sum", sa.Integer(), nullable=False),
+        sa.Column("rating_avg", sa.Float()),
+    )
+    op.create_index(
+        "ix_book_ratings_rank", "book_ratings", [sa.text("rating_avg DESC"), "book_id"]
+    )
+    op.execute(
+        "INSERT INTO book_ratings (book_id, review_count, rating_sum, rating_avg) "
+        "SELECT book_id, COUNT(rating), SUM(rating), "
+        "CAST(SUM(rating) AS FLOAT) / COUNT(rating) "
+        "FROM reviews WHERE rating IS NOT NULL GROUP BY book_id"
+    )
+
+    for table in VERSIONED_TABLES:
+        op.add_column(
+            table, sa.Column("version", sa.Integer(), nullable=False, server_default="1")
+        )
+    op.create_table(
+        "table_versions",
+        sa.Column("table_name", sa.String(), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table, column in SEARCH_COLUMNS:
+            op.create_index(
+                f"ix_{table}_{column}_fts", table,
+                [sa.text(f"to_tsvector('simple', {column})")],
+                postgresql_using="gin"
+            )
+            op.create_index(
+                f"ix_{table}_{column}_trgm", table, [column],
+                postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for table, column in SEARCH_COLUMNS:
+            op.drop_index(f"ix_{table}_{column}_trgm", table_name=table)
+            op.drop_index(f"ix_{table}_{column}_fts", table_name=table)
+    op.drop_table("table_versions")
+    for table in VERSIONED_TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("version")
+    op.drop_table("book_ratings")
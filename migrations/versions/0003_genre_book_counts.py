@@ -0,0 +1,39 @@
+"""
+Обратный индекс связей жанров и счетчик книг в жанре.
+
+- ix_book_genre_genre_book (genre_id, book_id): книги жанра по порядку
+  идентификаторов без просмотра всей таблицы book_genre (первичный ключ
+  начинается с book_id);
+- genres.book_count: количество книг жанра, заполняется по book_genre
+  и далее поддерживается приложением.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_book_genre_genre_book", "book_genre", ["genre_id", "book_id"])
+    op.add_column(
+        "genres", sa.Column("book_count", sa.Integer(), nullable=False, server_default="0")
+    )
+    op.execute(
+        "UPDATE genres SET book_count = "
+        "(SELECT COUNT(*) FROM book_genre WHERE book_genre.genre_id = genres.id), "
+        "version = version + 1"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("genres") as batch:
+        batch.drop_column("book_count")
+    op.drop_index("ix_book_genre_genre_book", table_name="book_genre")
@@ -0,0 +1,44 @@
+"""
+Индексы отзывов и один отзыв пользователя на книгу.
+
+- ix_reviews_book_id (book_id, id): отзывы книги по порядку идентификаторов;
+- ix_reviews_user_id (user_id, id): лента отзывов пользователя;
+- uq_reviews_user_book (user_id, book_id): уникальность отзыва пользователя
+  о книге. Перед созданием индекса повторные отзывы удаляются (остается
+  последний), агрегаты book_ratings пересчитываются.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_reviews_book_id", "reviews", ["book_id", "id"])
+    op.create_index("ix_reviews_user_id", "reviews", ["user_id", "id"])
+    op.execute(
+        "DELETE FROM reviews WHERE user_id IS NOT NULL AND EXISTS ("
+        "SELECT 1 FROM reviews AS newer WHERE newer.user_id = reviews.user_id "
+        "AND newer.book_id = reviews.book_id AND newer.id > reviews.id)"
+    )
+    op.create_index("uq_reviews_user_book", "reviews", ["user_id", "book_id"], unique=True)
+    op.execute("DELETE FROM book_ratings")
+    op.execute(
+        "INSERT INTO book_ratings (book_id, review_count, rating_sum, rating_avg) "
+        "SELECT book_id, COUNT(rating), SUM(rating), "
+        "CAST(SUM(rating) AS FLOAT) / COUNT(rating) "
+        "FROM reviews WHERE rating IS NOT NULL GROUP BY book_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_reviews_user_book", table_name="reviews")
+    op.drop_index("ix_reviews_user_id", table_name="reviews")
+    op.drop_index("ix_reviews_book_id", table_name="reviews")
@@ -0,0 +1,83 @@
+"""
+Предрассчитанные рейтинги книг.
+
+- leaderboard_entries: байесовская оценка и нижняя граница Уилсона книги
+  в общем рейтинге, рейтинге жанра и десятилетия, с индексами для чтения
+  страницы рейтинга по убыванию каждой оценки;
+- ranking_params: параметры расчета (априорная средняя оценка).
+
+Индекс ix_book_ratings_rank по средней оценке удаляется: топ книг читается
+из leaderboard_entries, а индекс лишь замедлял каждую запись оценки.
+
+Таблицы заполняются по book_ratings с параметрами по умолчанию
+(RANKING_PRIOR_WEIGHT = 10, RANKING_WILSON_Z = 1.96); при других значениях
+после миграции выполняется python -m app.cli rebuild-leaderboards.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "leaderboard_entries",
+        sa.Column("board", sa.String(), primary_key=True),
+        sa.Column("board_key", sa.Integer(), primary_key=True),
+        sa.Column("book_id", sa.Integer(), sa.ForeignKey("books.id"), primary_key=True),
+        sa.Column("bayesian", sa.Float(), nullable=False),
+        sa.Column("wilson", sa.Float(), nullable=False),
+    )
+    for method in ("bayesian", "wilson"):
+        op.create_index(
+            f"ix_leaderboard_{method}", "leaderboard_entries",
+            ["board", "board_key", sa.text(f"{method} DESC"), "book_id"]
+        )
+    op.create_index("ix_leaderboard_entries_book_id", "leaderboard_entries", ["book_id"])
+    op.create_table(
+        "ranking_params",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("value", sa.Float(), nullable=False),
+    )
+    op.execute(
+        "INSERT INTO ranking_params (name, value) "
+        "SELECT 'prior_mean', COALESCE("
+        "CAST(SUM(rating_sum) AS FLOAT) / NULLIF(SUM(review_count), 0), 3.0) "
+        "FROM book_ratings"
+    )
+    # Нижняя граница Уилсона при z = 1.96: z^2 = 3.8416, z^2 / 2 = 1.9208, z^2 / 4 = 0.9604
+    op.execute(
+        "INSERT INTO leaderboard_entries (board, board_key, book_id, bayesian, wilson) "
+        "SELECT boards.board, boards.board_key, scored.book_id, "
+        "(10 * prior.value + scored.total) / (10 + scored.n), "
+        "1 + 4 * (scored.p + 1.9208 / scored.n "
+        "- 1.96 * SQRT((scored.p * (1 - scored.p) + 0.9604 / scored.n) / scored.n)) "
+        "/ (1 + 3.8416 / scored.n) "
+        "FROM (SELECT book_id, CAST(review_count AS FLOAT) AS n, "
+        "CAST(rating_sum AS FLOAT) AS total, "
+        "(CAST(rating_sum AS FLOAT) / review_count - 1) / 4 AS p "
+        "FROM book_ratings WHERE review_count > 0) AS scored "
+        "JOIN (SELECT 'all' AS board, 0 AS board_key, id AS book_id FROM books "
+        "UNION ALL SELECT 'decade', publication_year / 10 * 10, id FROM books "
+        "WHERE publication_year IS NOT NULL "
+        "UNION ALL SELECT 'genre', genre_id, book_id FROM book_genre) AS boards "
+        "ON boards.book_id = scored.book_id "
+        "JOIN ranking_params AS prior ON prior.name = 'prior_mean'"
+    )
+    op.drop_index("ix_book_ratings_rank", table_name="book_ratings")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_book_ratings_rank", "book_ratings", [sa.text("rating_avg DESC"), "book_id"]
+    )
+    op.drop_table("ranking_params")
+    op.drop_table("leaderboard_entries")
@@ -0,0 +1,77 @@
+"""
+Общие настройки тестов.
+
+Если DATABASE_URL не задан, тесты работают с временной базой SQLite,
+схема которой создается один раз на сессию тестов.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+import pytest     # pylint: disable=wrong-import-position
+from sqlalchemy import event     # pylint: disable=wrong-import-position
+
+from app.cache import response_cache     # pylint: disable=wrong-import-position
+from app.database import Base, engine, async_engine     # pylint: disable=wrong-import-position
+import app.models     # pylint: disable=wrong-import-position,unused-import
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database_schema():
+    """
+    Создает таблицы перед тестами и удаляет их после.
+    """
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def empty_response_cache():
+    """
+    Очищает кэш ответов перед каждым тестом.
+    """
+    response_cache.clear()
+
+
+@pytest.fixture
+def pool_checkouts():
+    """
+    Считает выдачи соединений из пула асинхронного движка.
+
+    Yields:
+        list: Список, в который добавляется запись на каждую выдачу.
+    """
+    checkouts = []
+    pool = async_engine.sync_engine.pool
+
+    def on_checkout(*_args):
+        checkouts.append(1)
+
+    event.listen(pool, "checkout", on_checkout)
+    yield checkouts
+    event.remove(pool, "checkout", on_checkout)
+
+
+@pytest.fixture
+def sql_statements():
+    """
+    Собирает SQL-запросы, выполненные асинхронным движком.
+
+    Yields:
+        list[str]: Тексты выполненных запросов в порядке выполнения.
+    """
+    statements = []
+    sync_engine = async_engine.sync_engine
+
+    def before_cursor_execute(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,75 @@
+"""
+Тесты кэша проверенных токенов и пользователей в get_current_user.
+"""
+
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app import auth_cache, crud, schemas, security
+from app.crud.user import update_user_password
+
+client = TestClient(app)
+
+
+def _login(username: str) -> tuple[int, str]:
+    with SessionLocal() as db:
+        user = crud.create_user(
+            db,
+            schemas.UserBase(username=username, email=f"{username}@example.com"),
+            security.get_password_hash("Secret123")
+        )
+        db.commit()
+        user_id = user.id
+    response = client.post(
+        "/api/auth/token", data={"username": username, "password": "Secret123"}
+    )
+    return user_id, response.json()["access_token"]
+
+
+def test_repeated_requests_skip_database(sql_statements):
+    """
+    Повторный запрос с тем же токеном не обращается к базе.
+    """
+    auth_cache.clear()
+    user_id, token = _login("cached_user")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/api/users/me", headers=headers)
+    assert first.status_code == 200
+    assert first.json()["id"] == user_id
+    sql_statements.clear()
+    second = client.get("/api/users/me", headers=headers)
+    assert second.json() == first.json()
+    assert not sql_statements
+
+
+def test_password_change_drops_cached_user():
+    """
+    Смена пароля сбрасывает кэшированные токен и пользователя после фиксации.
+    """
+    auth_cache.clear()
+    user_id, token = _login("rotating_user")
+    client.get("/api/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert auth_cache.stats()["users"]["entries"] == 1
+
+    with SessionLocal() as db:
+        update_user_password(db, user_id, security.get_password_hash("Changed123"))
+        assert auth_cache.stats()["users"]["entries"] == 1
+        db.commit()
+    assert auth_cache.stats()["users"]["entries"] == 0
+    assert auth_cache.stats()["tokens"]["entries"] == 0
+
+
+def test_cached_claims_expire_with_token():
+    """
+    Запись о токене живет не дольше срока его действия, невалидный токен отклоняется.
+    """
+    auth_cache.clear()
+    token = security.create_access_token({"sub": "ghost"}, timedelta(seconds=-1))
+    assert auth_cache.verify_token(token) is None
+    assert auth_cache.stats()["tokens"]["entries"] == 0
+
+    response = client.get("/api/users/me", headers={"Authorization": "Bearer broken"})
+    assert response.status_code == 401
@@ -0,0 +1,97 @@
+"""
+Тесты пакетной выборки книг, авторов, жанров и отзывов по списку идентификаторов.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.main import app
+from app.database import SessionLocal
+from app import models
+from app.crud.utils import id_in
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def shelf():
+    """
+    Создает автора, жанр, три книги и отзыв.
+
+    Returns:
+        dict: Идентификаторы созданных сущностей по типу.
+    """
+    with SessionLocal() as db:
+        author = models.Author(name="Batch Author")
+        genre = models.Genre(name="Batch Genre")
+        user = models.User(username="batch_user", email="batch@example.com", hashed_password="-")
+        books = [
+            models.Book(title=f"Batch Book {i}", publication_year=1990 + i,
+                        isbn=f"444-{i:010d}", author=author, genres=[genre])
+            for i in range(3)
+        ]
+        db.add_all([author, genre, user, *books])
+        db.flush()
+        review = models.Review(book_id=books[0].id, user_id=user.id, rating=3)
+        db.add(review)
+        db.commit()
+        return {
+            "books": [book.id for book in books], "authors": [author.id],
+            "genres": [genre.id], "reviews": [review.id],
+        }
+
+
+def test_books_batch_preserves_order_and_reports_missing(shelf, sql_statements):
+    """
+    Книги возвращаются в порядке запроса, ненайденные идентификаторы перечислены отдельно.
+    """
+    first, second, third = shelf["books"]
+    ids = f"{third},999999,{first},{third},{second}"
+    response = client.get("/api/books/batch", params={"ids": ids, "include": "author,genres"})
+    assert response.status_code == 200
+    body = response.json()
+    assert [book["id"] for book in body["items"]] == [third, first, second]
+    assert body["missing"] == [999999]
+    assert body["items"][0]["author"]["name"] == "Batch Author"
+    assert [genre["name"] for genre in body["items"][0]["genres"]] == ["Batch Genre"]
+    assert "reviews" not in body["items"][0]
+    # ETag, книги с автором, жанры
+    assert len(sql_statements) == 3
+
+
+@pytest.mark.parametrize("path, kind", [
+    ("/api/authors/batch", "authors"),
+    ("/api/genres/genres/batch", "genres"),
+    ("/api/reviews/reviews/batch", "reviews"),
+])
+def test_entity_batches(shelf, path, kind):
+    """
+    Пакеты авторов, жанров и отзывов выбираются по идентификаторам.
+    """
+    entity_id = shelf[kind][0]
+    response = client.get(path, params={"ids": f"999998,{entity_id}"})
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["items"]] == [entity_id]
+    assert body["missing"] == [999998]
+
+
+@pytest.mark.parametrize("ids", ["", "1,x", ",".join(str(i) for i in range(101))])
+def test_invalid_ids_rejected(ids):
+    """
+    Пустой, нечисловой или слишком длинный список идентификаторов отклоняется с кодом 422.
+    """
+    assert client.get("/api/books/batch", params={"ids": ids}).status_code == 422
+
+
+def test_postgresql_uses_single_array_parameter():
+    """
+    В PostgreSQL набор идентификаторов передается одним параметром-массивом.
+    """
+    engine = create_engine("postgresql+psycopg2://batch@localhost/batch")
+    with Session(engine) as db:
+        condition = id_in(db, models.Book.id, [3, 1, 2])
+    compiled = condition.compile(dialect=engine.dialect)
+    assert str(compiled) == "books.id = ANY (%(param_1)s::INTEGER[])"
+    assert compiled.params == {"param_1": [3, 1, 2]}
@@ -0,0 +1,110 @@
+"""
+Тесты массового импорта книг.
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app import crud, models, schemas, security
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def uploader() -> dict:
+    """
+    Создает пользователя, выполняющего импорт, и получает для него токен.
+
+    Returns:
+        dict: Заголовки авторизации.
+    """
+    with SessionLocal() as db:
+        user = crud.create_user(
+            db,
+            schemas.UserBase(username="bulk_uploader", email="bulk_uploader@example.com"),
+            security.get_password_hash("Secret123")
+        )
+        db.commit()
+        user_id = user.id
+    token = security.create_access_token({"sub": "bulk_uploader", "uid": user_id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_ndjson_import_reports_per_row_errors(uploader):
+    """
+    Корректные строки импортируются, ошибки возвращаются с номерами строк.
+    """
+    rows = [
+        {"title": "Bulk 1", "publication_year": 1999, "isbn": "321-0000000001",
+         "author": "Bulk Author", "genres": ["Bulk Genre A", "Bulk Genre B"]},
+        {"title": "Bulk 2", "publication_year": 2001, "isbn": "321-0000000002",
+         "author": "Bulk Author", "genres": ["Bulk Genre A"]},
+        {"title": "Bad ISBN", "publication_year": 2001, "isbn": "nope", "author": "X"},
+        {"title": "Dup", "publication_year": 2001, "isbn": "321-0000000001",
+         "author": "Bulk Author"},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\n{broken"
+
+    response = client.post("/api/books/import", content=body, headers=uploader)
+    assert response.status_code == 200
+    report = response.json()
+    assert report["received"] == 5
+    assert report["inserted"] == 2
+    assert report["skipped"] == 1
+    assert sorted(error["line"] for error in report["errors"]) == [3, 5]
+
+    with SessionLocal() as db:
+        book = db.query(models.Book).filter(models.Book.isbn == "321-0000000001").one()
+        assert book.author.name == "Bulk Author"
+        assert sorted(genre.name for genre in book.genres) == ["Bulk Genre A", "Bulk Genre B"]
+
+
+def test_csv_import_is_idempotent(uploader):
+    """
+    Повторная загрузка того же CSV пропускает существующие книги.
+    """
+    body = (
+        "title,publication_year,isbn,author,genres\n"
+        "Csv 1,2010,321-0000000101,Csv Author,Csv Genre|Other Csv Genre\n"
+        "Csv 2,2011,321-0000000102,Csv Author,\n"
+    )
+    first = client.post(
+        "/api/books/import", params={"format": "csv"}, content=body, headers=uploader
+    ).json()
+    second = client.post(
+        "/api/books/import", params={"format": "csv"}, content=body, headers=uploader
+    ).json()
+
+    assert (first["inserted"], first["skipped"], first["failed"]) == (2, 0, 0)
+    assert (second["inserted"], second["skipped"], second["failed"]) == (0, 2, 0)
+
+
+def test_csv_quoted_fields_span_lines(uploader):
+    """
+    Поле CSV в кавычках может содержать перевод строки.
+    """
+    body = (
+        "title,publication_year,isbn,author,genres\r\n"
+        '"Multi\r\nline ""title""",2012,321-0000000201,Csv Author,\r\n'
+        'Stray "quote,2013,321-0000000202,Csv Author,\r\n'
+        "Csv 3,2014,321-0000000203,Csv Author,\r\n"
+    )
+    report = client.post(
+        "/api/books/import", params={"format": "csv"}, content=body, headers=uploader
+    ).json()
+    assert (report["received"], report["inserted"], report["failed"]) == (3, 3, 0)
+
+    with SessionLocal() as db:
+        book = db.query(models.Book).filter(models.Book.isbn == "321-0000000201").one()
+        assert book.title == 'Multi\nline "title"'
+
+
+def test_import_requires_authentication():
+    """
+    Импорт без токена отклоняется.
+    """
+    response = client.post("/api/books/import", content="{}")
+    assert response.status_code == 401
@@ -0,0 +1,103 @@
+"""
+Тесты кэша ответов и его инвалидации CRUD-функциями записи.
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.cache import LocalCache, RedisCache, response_cache
+from app.database import SessionLocal
+from app import crud, models, schemas
+
+client = TestClient(app)
+
+
+def test_cached_read_skips_database_until_write(sql_statements):
+    """
+    Повторное чтение отдается из кэша, обновление автора сбрасывает запись.
+    """
+    author_id = client.post("/api/authors/", json={"name": "Cached Author"}).json()["id"]
+
+    first = client.get(f"/api/authors/{author_id}")
+    assert first.headers["X-Cache"] == "MISS"
+    sql_statements.clear()
+    second = client.get(f"/api/authors/{author_id}")
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert not sql_statements
+
+    with SessionLocal() as db:
+        crud.update_author(db, author_id, schemas.AuthorCreate(name="Renamed Author"))
+        db.commit()
+
+    third = client.get(f"/api/authors/{author_id}")
+    assert third.headers["X-Cache"] == "MISS"
+    assert third.json()["name"] == "Renamed Author"
+    assert response_cache.stats()["hits"] == 1
+
+
+def test_rolled_back_write_keeps_cache():
+    """
+    Откат транзакции не сбрасывает кэш.
+    """
+    with SessionLocal() as db:
+        author = models.Author(name="Rollback Author")
+        db.add(author)
+        db.commit()
+        author_id = author.id
+
+    client.get(f"/api/authors/{author_id}")
+    with SessionLocal() as db:
+        crud.update_author(db, author_id, schemas.AuthorCreate(name="Never Saved"))
+        db.rollback()
+
+    response = client.get(f"/api/authors/{author_id}")
+    assert response.headers["X-Cache"] == "HIT"
+    assert response.json()["name"] == "Rollback Author"
+
+
+def test_local_cache_evicts_least_recently_used_and_expired():
+    """
+    LRU вытесняет давно не использованные записи, TTL удаляет устаревшие.
+    """
+    cache = LocalCache(max_entries=2, ttl=60)
+    cache.set("a", b"1", ["tag:a"])
+    cache.set("b", b"2", [])
+    assert cache.get("a") == b"1"
+    cache.set("c", b"3", [])
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.invalidate(["tag:a"]) == 1
+    assert cache.get("a") is None
+
+    short = LocalCache(max_entries=2, ttl=0.01)
+    short.set("a", b"1", [])
+    time.sleep(0.02)
+    assert short.get("a") is None
+    assert short.stats()["expirations"] == 1
+
+
+def test_stale_generation_is_not_stored():
+    """
+    Значение, собранное до инвалидации хранилища, не сохраняется.
+    """
+    cache = LocalCache(max_entries=2, ttl=60)
+    generation = cache.generation()
+    cache.invalidate(["tag:a"])
+    cache.set("a", b"1", ["tag:a"], generation=generation)
+    assert cache.get("a") is None
+    cache.set("a", b"1", ["tag:a"], ttl=30, generation=cache.generation())
+    assert cache.get("a") == b"1"
+
+
+def test_unavailable_redis_is_a_miss():
+    """
+    Недоступный Redis не ломает запросы: чтение — промах, запись пропускается.
+    """
+    pytest.importorskip("redis")
+    cache = RedisCache("redis://127.0.0.1:1/0")
+    cache.set("a", b"1", ["tag:a"], generation=cache.generation())
+    assert cache.get("a") is None
+    assert cache.invalidate(["tag:a"]) == 0
@@ -0,0 +1,65 @@
+"""
+Тесты условных GET-запросов: ETag и ответ 304.
+"""
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.cache import response_cache
+from app.database import SessionLocal
+from app import crud, schemas
+
+client = TestClient(app)
+
+
+def test_entity_etag_answers_304_from_version_only(sql_statements):
+    """
+    Совпавший ETag автора дает 304 одним запросом версии, изменение меняет ETag.
+    """
+    author_id = client.post("/api/authors/", json={"name": "Etag Author"}).json()["id"]
+    first = client.get(f"/api/authors/{author_id}")
+    etag = first.headers["ETag"]
+    assert etag.startswith('"authors-')
+
+    response_cache.clear()
+    sql_statements.clear()
+    response = client.get(f"/api/authors/{author_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert not response.content
+    assert len(sql_statements) == 1
+    assert "authors.version" in sql_statements[0]
+
+    with SessionLocal() as db:
+        crud.update_author(db, author_id, schemas.AuthorCreate(name="Etag Author 2"))
+        db.commit()
+    response = client.get(f"/api/authors/{author_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["name"] == "Etag Author 2"
+
+
+def test_cached_entity_answers_304_without_database(sql_statements):
+    """
+    ETag хранится в кэше вместе с ответом: 304 отдается без запросов к базе.
+    """
+    author_id = client.post("/api/authors/", json={"name": "Cached Etag Author"}).json()["id"]
+    etag = client.get(f"/api/authors/{author_id}").headers["ETag"]
+    sql_statements.clear()
+    response = client.get(f"/api/authors/{author_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert not sql_statements
+
+
+def test_collection_weak_etag_follows_table_changes():
+    """
+    Слабый ETag списка жанров меняется после добавления жанра.
+    """
+    etag = client.get("/api/genres/genres/").headers["ETag"]
+    assert etag.startswith('W/"genres.')
+    assert client.get(
+        "/api/genres/genres/", headers={"If-None-Match": etag}
+    ).status_code == 304
+
+    client.post("/api/genres/genres/", json={"name": "Etag Genre"})
+    response = client.get("/api/genres/genres/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,65 @@
+"""
+Тесты потоковой выгрузки каталога.
+"""
+
+import csv
+import gzip
+import io
+import json
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app import models
+
+client = TestClient(app)
+
+
+def _seed() -> None:
+    with SessionLocal() as db:
+        author = models.Author(name="Export Author")
+        genres = [models.Genre(name="Export Genre B"), models.Genre(name="Export Genre A")]
+        db.add_all([
+            models.Book(title="Export 1", publication_year=1950, isbn="654-0000000001",
+                        author=author, genres=genres),
+            models.Book(title="Export 2", publication_year=1990, isbn="654-0000000002",
+                        author=author),
+        ])
+        db.commit()
+
+
+def _exported(records: list[dict]) -> dict[str, dict]:
+    return {record["isbn"]: record for record in records if record["isbn"].startswith("654-")}
+
+
+def test_ndjson_export_includes_author_and_genres():
+    """
+    NDJSON содержит имя автора и отсортированный список жанров.
+    """
+    _seed()
+    response = client.get("/api/books/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    records = _exported(json.loads(line) for line in response.text.splitlines())
+    first = records["654-0000000001"]
+    assert first["author"] == "Export Author"
+    assert first["genres"] == ["Export Genre A", "Export Genre B"]
+    assert records["654-0000000002"]["genres"] == []
+
+
+def test_csv_gzip_export_filters_by_year():
+    """
+    Сжатая CSV-выгрузка учитывает диапазон годов публикации.
+    """
+    response = client.get(
+        "/api/books/export",
+        params={"format": "csv", "gzip": True, "year_from": 1940, "year_to": 1960}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+
+    text = gzip.decompress(response.content).decode()
+    records = _exported(csv.DictReader(io.StringIO(text)))
+    assert list(records) == ["654-0000000001"]
+    assert records["654-0000000001"]["genres"] == "Export Genre A|Export Genre B"
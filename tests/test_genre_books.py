@@ -0,0 +1,155 @@
+"""
+Тесты книг жанра, пересечения жанров и счетчиков genres.book_count.
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.main import app
+from app.database import SessionLocal
+from app import crud, models, schemas, security
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def uploader() -> dict:
+    """
+    Создает пользователя, выполняющего импорт, и получает для него токен.
+
+    Returns:
+        dict: Заголовки авторизации.
+    """
+    with SessionLocal() as db:
+        user = crud.create_user(
+            db,
+            schemas.UserBase(username="genre_uploader", email="genre_uploader@example.com"),
+            security.get_password_hash("Secret123")
+        )
+        db.commit()
+        user_id = user.id
+    token = security.create_access_token({"sub": "genre_uploader", "uid": user_id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="module")
+def genres():
+    """
+    Создает жанры: fiction содержит все 6 книг, classic — четные, short — книги 0 и 4.
+
+    Returns:
+        dict: Идентификаторы жанров по имени и книг по порядку.
+    """
+    with SessionLocal() as db:
+        fiction, classic, short = (
+            models.Genre(name=f"Genre Books {name}") for name in ("fiction", "classic", "short")
+        )
+        author = models.Author(name="Genre Books Author")
+        books = [
+            models.Book(
+                title=f"Genre Books {i}", publication_year=1950 + i, isbn=f"222-{i:010d}",
+                author=author,
+                genres=[fiction]
+                + ([classic] if i % 2 == 0 else [])
+                + ([short] if i % 4 == 0 else [])
+            )
+            for i in range(6)
+        ]
+        db.add_all([author, fiction, classic, short, *books])
+        db.commit()
+        return {
+            "fiction": fiction.id, "classic": classic.id, "short": short.id,
+            "books": [book.id for book in books],
+        }
+
+
+def test_book_counts_follow_orm_changes(genres):
+    """
+    Счетчики обновляются при добавлении и удалении связей через ORM и меняют версию жанра.
+    """
+    response = client.get(f"/api/genres/genres/{genres['classic']}")
+    assert response.json()["book_count"] == 3
+    etag = response.headers["ETag"]
+
+    with SessionLocal() as db:
+        book = db.get(models.Book, genres["books"][1])
+        book.genres.append(db.get(models.Genre, genres["classic"]))
+        db.commit()
+    response = client.get(
+        f"/api/genres/genres/{genres['classic']}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["book_count"] == 4
+
+    with SessionLocal() as db:
+        book = db.get(models.Book, genres["books"][1])
+        book.genres = [genre for genre in book.genres if genre.id != genres["classic"]]
+        db.commit()
+        assert db.get(models.Genre, genres["classic"]).book_count == 3
+
+
+def test_book_counts_follow_bulk_import(uploader):
+    """
+    Массовый импорт увеличивает счетчики жанров одним UPDATE.
+    """
+    rows = [
+        {"title": f"Counted {i}", "publication_year": 2000, "isbn": f"223-{i:010d}",
+         "author": "Counted Author", "genres": ["Counted Genre"]}
+        for i in range(3)
+    ]
+    body = "\n".join(json.dumps(row) for row in rows)
+    assert client.post("/api/books/import", content=body, headers=uploader).json()["inserted"] == 3
+
+    with SessionLocal() as db:
+        genre = crud.get_genre_by_name(db, "Counted Genre")
+        assert genre.book_count == 3
+        genre.book_count = 0
+        db.commit()
+        crud.rebuild_genre_counts(db)
+        db.commit()
+        assert crud.get_genre_by_name(db, "Counted Genre").book_count == 3
+
+
+def test_genre_books_keyset_pages(genres):
+    """
+    Книги жанра выдаются страницами по курсору в порядке идентификаторов.
+    """
+    path = f"/api/genres/genres/{genres['fiction']}/books"
+    first = client.get(path, params={"limit": 4, "include": "author"}).json()
+    assert [book["id"] for book in first["items"]] == genres["books"][:4]
+    assert first["items"][0]["author"]["name"] == "Genre Books Author"
+
+    second = client.get(path, params={"limit": 4, "cursor": first["next_cursor"]}).json()
+    assert [book["id"] for book in second["items"]] == genres["books"][4:]
+    assert second["next_cursor"] is None
+
+
+def test_genre_intersection(genres):
+    """
+    with_genres оставляет книги, входящие во все жанры.
+    """
+    books = genres["books"]
+    response = client.get(
+        f"/api/genres/genres/{genres['fiction']}/books",
+        params={"with_genres": f"{genres['classic']},{genres['short']}"}
+    )
+    assert [book["id"] for book in response.json()["items"]] == [books[0], books[4]]
+
+    missing = client.get(
+        f"/api/genres/genres/{genres['fiction']}/books", params={"with_genres": "999999"}
+    )
+    assert missing.status_code == 404
+
+
+def test_genre_books_use_reverse_index(genres):
+    """
+    Книги жанра читаются по индексу (genre_id, book_id), а не просмотром book_genre.
+    """
+    with SessionLocal() as db:
+        plan = db.execute(text(
+            "EXPLAIN QUERY PLAN SELECT book_id FROM book_genre "
+            "WHERE genre_id = :genre_id AND book_id > 0 ORDER BY book_id LIMIT 20"
+        ), {"genre_id": genres["fiction"]}).all()
+    assert any("ix_book_genre_genre_book" in row[-1] for row in plan)
@@ -0,0 +1,104 @@
+"""
+Тесты массовой привязки книг к жанрам.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app import crud, models
+
+client = TestClient(app)
+
+PATH = "/api/genres/genres/assignments"
+
+# Запросы привязки не должны строить неявное декартово произведение
+pytestmark = pytest.mark.filterwarnings("error::sqlalchemy.exc.SAWarning")
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    """
+    Создает 4 книги без жанров и 3 жанра.
+
+    Returns:
+        dict: Идентификаторы книг и жанров.
+    """
+    with SessionLocal() as db:
+        author = models.Author(name="Tagging Author")
+        genres = [models.Genre(name=f"Tagging Genre {i}") for i in range(3)]
+        books = [
+            models.Book(title=f"Tagging Book {i}", publication_year=2001,
+                        isbn=f"224-{i:010d}", author=author)
+            for i in range(4)
+        ]
+        db.add_all([author, *genres, *books])
+        db.commit()
+        return {"books": [book.id for book in books], "genres": [genre.id for genre in genres]}
+
+
+def _counts(genre_ids: list[int]) -> list[int]:
+    with SessionLocal() as db:
+        return [db.get(models.Genre, genre_id).book_count for genre_id in genre_ids]
+
+
+def _book_genres(book_id: int) -> set[int]:
+    with SessionLocal() as db:
+        return {genre.id for genre in db.get(models.Book, book_id).genres}
+
+
+def test_add_and_remove_are_idempotent(catalog):
+    """
+    Повторная привязка и отвязка не меняют связей и счетчиков.
+    """
+    books, genres = catalog["books"], catalog["genres"]
+    body = {"book_ids": books + [999999], "genre_ids": genres[:2] + [999999]}
+    assert client.post(PATH, json=body).json() == {"added": 8, "removed": 0}
+    assert client.post(PATH, json=body).json() == {"added": 0, "removed": 0}
+    assert _counts(genres) == [4, 4, 0]
+
+    body = {"book_ids": books[:3], "genre_ids": [genres[1]]}
+    assert client.post(f"{PATH}/remove", json=body).json()["removed"] == 3
+    assert client.post(f"{PATH}/remove", json=body).json()["removed"] == 0
+    assert _counts(genres) == [4, 1, 0]
+
+
+def test_replace_keeps_counts_consistent(catalog):
+    """
+    Замена удаляет только лишние связи, счетчики совпадают с пересчетом.
+    """
+    books, genres = catalog["books"], catalog["genres"]
+    response = client.put(PATH, json={"book_ids": books[:2], "genre_ids": [genres[0], genres[2]]})
+    assert response.json() == {"added": 2, "removed": 0}
+    assert _book_genres(books[0]) == {genres[0], genres[2]}
+
+    response = client.put(PATH, json={"book_ids": books, "genre_ids": []})
+    assert response.json() == {"added": 0, "removed": 7}
+    assert _book_genres(books[3]) == set()
+
+    expected = _counts(genres)
+    with SessionLocal() as db:
+        crud.rebuild_genre_counts(db)
+        db.commit()
+    assert _counts(genres) == expected == [0, 0, 0]
+
+
+def test_assignment_invalidates_loaded_book(catalog):
+    """
+    Коллекция жанров загруженной в сессию книги перечитывается после привязки.
+    """
+    books, genres = catalog["books"], catalog["genres"]
+    with SessionLocal() as db:
+        book = db.get(models.Book, books[0])
+        before = {genre.id for genre in book.genres}
+        assert crud.add_book_genres(db, [books[0]], [genres[1]]) == 1
+        assert {genre.id for genre in book.genres} == before | {genres[1]}
+        db.rollback()
+
+
+def test_assignment_limits():
+    """
+    Пустой список книг отклоняется валидацией.
+    """
+    response = client.post(PATH, json={"book_ids": [], "genre_ids": [1]})
+    assert response.status_code == 422
@@ -0,0 +1,77 @@
+"""
+Тесты пула хэширования паролей и пересчета хэша при входе.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+from sqlalchemy import select
+
+from app.main import app
+from app.database import SessionLocal
+from app import hashing, models
+
+client = TestClient(app)
+
+
+def _create_user(username: str, hashed_password: str) -> None:
+    with SessionLocal() as db:
+        db.add(models.User(
+            username=username, email=f"{username}@example.com", hashed_password=hashed_password
+        ))
+        db.commit()
+
+
+def test_login_rehashes_password_with_new_cost():
+    """
+    Хэш с другой стоимостью bcrypt пересчитывается при успешном входе.
+    """
+    old_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5)
+    _create_user("legacy_user", old_context.hash("Secret123"))
+
+    response = client.post(
+        "/api/auth/token", data={"username": "legacy_user", "password": "Secret123"}
+    )
+    assert response.status_code == 200
+
+    with SessionLocal() as db:
+        stored = db.scalar(
+            select(models.User.hashed_password).where(models.User.username == "legacy_user")
+        )
+    assert stored.startswith("$2b$04$")
+    assert client.post(
+        "/api/auth/token", data={"username": "legacy_user", "password": "Secret123"}
+    ).status_code == 200
+
+
+def test_full_pool_rejects_immediately():
+    """
+    Задача сверх емкости пула отклоняется без ожидания.
+    """
+    pool = hashing.HashingPool(workers=1, queue_size=0)
+    try:
+        future = pool.submit(hashing.security.get_password_hash, "Secret123")
+        with pytest.raises(hashing.HashingBusyError):
+            pool.submit(hashing.security.get_password_hash, "Secret123")
+        assert future.result().startswith("$2b$")
+        assert pool.stats()["rejected"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_busy_pool_returns_503(monkeypatch):
+    """
+    При заполненной очереди вход отвечает 503 с заголовком Retry-After.
+    """
+    _create_user("storm_user", hashing.security.get_password_hash("Secret123"))
+
+    def busy(*_args):
+        raise hashing.HashingBusyError(retry_after=2)
+
+    monkeypatch.setattr(hashing.hashing_pool, "submit", busy)
+
+    response = client.post(
+        "/api/auth/token", data={"username": "storm_user", "password": "Secret123"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
@@ -0,0 +1,150 @@
+"""
+Тесты предрассчитанных рейтингов книг (байесовская оценка и граница Уилсона).
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from app.main import app
+from app.database import SessionLocal
+from app import crud, models, schemas, security
+
+client = TestClient(app)
+
+PATH = "/api/books/books/leaderboard/"
+
+
+@pytest.fixture(scope="module")
+def ranked():
+    """
+    Создает книги жанра: single — одна пятерка (1895), many — 20 оценок
+    со средней 4.95 (1898); вне жанра — steady с десятью тройками (1905).
+
+    Returns:
+        dict: Идентификаторы жанра, книг и ста оценивающих пользователей.
+    """
+    with SessionLocal() as db:
+        password = security.get_password_hash("Secret123")
+        users = [
+            crud.create_user(
+                db, schemas.UserBase(username=f"ranker_{i}", email=f"ranker_{i}@example.com"),
+                password
+            )
+            for i in range(100)
+        ]
+        genre = models.Genre(name="Ranked Genre")
+        author = models.Author(name="Ranked Author")
+        single, many, steady = (
+            models.Book(title=f"Ranked {name}", publication_year=year,
+                        isbn=f"227-{i:010d}", author=author)
+            for i, (name, year) in enumerate((("single", 1895), ("many", 1898), ("steady", 1905)))
+        )
+        single.genres = [genre]
+        many.genres = [genre]
+        db.add_all([genre, single, many, steady])
+        db.flush()
+        crud.create_reviews_batch(db, [
+            {"book_id": single.id, "rating": 5, "user_id": users[0].id},
+            *({"book_id": many.id, "rating": 5 if i else 4, "user_id": users[i].id}
+              for i in range(20)),
+            *({"book_id": steady.id, "rating": 3, "user_id": users[i].id} for i in range(10)),
+        ])
+        db.commit()
+        crud.rebuild_leaderboards(db)
+        db.commit()
+        return {
+            "genre": genre.id, "single": single.id, "many": many.id, "steady": steady.id,
+            "users": [user.id for user in users]
+        }
+
+
+@pytest.mark.parametrize("method", ["bayesian", "wilson"])
+def test_many_ratings_outrank_single_rating(ranked, method):
+    """
+    Книга с одной пятеркой не опережает книгу с двадцатью высокими оценками.
+    """
+    by_genre = client.get(PATH, params={"method": method, "genre_id": ranked["genre"]}).json()
+    assert [book["id"] for book in by_genre["items"]] == [ranked["many"], ranked["single"]]
+
+    by_decade = client.get(PATH, params={"method": method, "decade": 1893}).json()
+    assert [book["id"] for book in by_decade["items"]] == [ranked["many"], ranked["single"]]
+
+
+def test_top_rated_uses_bayesian_board(ranked):
+    """
+    Топ книг упорядочен по байесовской оценке, а не по средней.
+    """
+    ids, params = [], {"limit": 100}
+    while True:
+        body = client.get("/api/books/books/top-rated/", params=params).json()
+        ids.extend(book["id"] for book in body["items"])
+        if body["next_cursor"] is None:
+            break
+        params["cursor"] = body["next_cursor"]
+    assert ids.index(ranked["many"]) < ids.index(ranked["single"])
+
+
+def test_leaderboards_refresh_on_commit(ranked):
+    """
+    Новые оценки и жанры книги попадают в рейтинги при фиксации транзакции.
+    """
+    with SessionLocal() as db:
+        crud.create_reviews_batch(db, [
+            {"book_id": ranked["steady"], "rating": 5, "user_id": user_id}
+            for user_id in ranked["users"][10:]
+        ])
+        crud.add_book_genres(db, [ranked["steady"]], [ranked["genre"]])
+        db.commit()
+        scores = db.execute(
+            select(models.LeaderboardEntry.board, models.LeaderboardEntry.board_key)
+            .where(models.LeaderboardEntry.book_id == ranked["steady"])
+        ).all()
+    assert sorted(scores) == [("all", 0), ("decade", 1900), ("genre", ranked["genre"])]
+
+    response = client.get(PATH, params={"genre_id": ranked["genre"], "limit": 1})
+    assert [book["id"] for book in response.json()["items"]] == [ranked["steady"]]
+
+
+def test_deleted_genre_leaves_no_leaderboard(ranked):
+    """
+    Рейтинг удаленного жанра удаляется вместе с ним.
+    """
+    with SessionLocal() as db:
+        genre = crud.create_genre(db, schemas.GenreCreate(name="Short-lived Genre"))
+        crud.add_book_genres(db, [ranked["many"]], [genre.id])
+        db.commit()
+        response = client.get(PATH, params={"genre_id": genre.id})
+        assert [book["id"] for book in response.json()["items"]] == [ranked["many"]]
+
+        crud.delete_genre(db, genre.id)
+        db.commit()
+        remaining = db.execute(
+            select(models.LeaderboardEntry.book_id).where(
+                models.LeaderboardEntry.board == "genre",
+                models.LeaderboardEntry.board_key == genre.id
+            )
+        ).all()
+    assert not remaining
+    assert client.get(PATH, params={"genre_id": genre.id}).json()["items"] == []
+
+
+def test_leaderboard_arguments():
+    """
+    Жанр и десятилетие одновременно не задаются, неизвестная оценка отклоняется.
+    """
+    assert client.get(PATH, params={"genre_id": 1, "decade": 1990}).status_code == 400
+    assert client.get(PATH, params={"method": "average"}).status_code == 422
+
+
+def test_leaderboard_reads_index():
+    """
+    Страница рейтинга читается по индексу без сортировки.
+    """
+    with SessionLocal() as db:
+        plan = db.execute(text(
+            "EXPLAIN QUERY PLAN SELECT book_id FROM leaderboard_entries "
+            "WHERE board = 'genre' AND board_key = 1 ORDER BY wilson DESC, book_id LIMIT 20"
+        )).all()
+    details = [row[-1] for row in plan]
+    assert any("ix_leaderboard_wilson" in detail for detail in details)
+    assert not any("TEMP B-TREE" in detail for detail in details)
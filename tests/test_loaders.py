@@ -0,0 +1,66 @@
+"""
+Тесты пакетных загрузчиков сессии.
+"""
+
+from sqlalchemy import event
+from app.database import SessionLocal, engine
+from app import crud, models
+from app.crud.loaders import SESSION_LOADERS, loader
+from app.schemas import AuthorCreate
+
+
+def _count_statements(statements: list):
+    def before_cursor_execute(*_args):
+        statements.append(1)
+    return before_cursor_execute
+
+
+def test_loaders_coalesce_and_memoize_within_session():
+    """
+    Повторные обращения в сессии не выполняют запросов, жанры книг выбираются одним запросом.
+    """
+    with SessionLocal() as db:
+        author = models.Author(name="Loader Author")
+        genre = models.Genre(name="Loader Genre")
+        books = [
+            models.Book(title=f"Loader Book {i}", publication_year=2010,
+                        isbn=f"333-{i:010d}", author=author, genres=[genre])
+            for i in range(4)
+        ]
+        db.add_all([author, genre, *books])
+        db.commit()
+        author_id = author.id
+        book_ids = [book.id for book in books]
+        genre_id = genre.id
+
+    statements = []
+    listener = _count_statements(statements)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        with SessionLocal() as db:
+            assert crud.get_author(db, author_id).name == "Loader Author"
+            assert crud.get_author(db, author_id).name == "Loader Author"
+            assert len(statements) == 1
+
+            genres = loader(db, "book_genre_rows")
+            first = genres.load_many(book_ids[:2])
+            genres.load_many(book_ids)
+            genres.load_many(book_ids)
+            assert genres.queries == 2
+            assert first[0] == [{"name": "Loader Genre", "id": genre_id, "book_count": 4}]
+
+            crud.update_author(db, author_id, AuthorCreate(name="Loader Author 2"))
+            assert SESSION_LOADERS not in db.info
+            db.rollback()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+
+def test_missing_keys_are_memoized():
+    """
+    Отсутствующая сущность запоминается как None.
+    """
+    with SessionLocal() as db:
+        assert crud.get_genre(db, 987654) is None
+        assert crud.get_genre(db, 987654) is None
+        assert loader(db, "genre").queries == 1
@@ -0,0 +1,103 @@
+"""
+Тесты метрик запросов и эндпоинта /metrics.
+"""
+
+import json
+import logging
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app import database, metrics
+from app.cache import response_cache
+from app.metrics import Histogram
+
+client = TestClient(app)
+
+
+def _sample(text: str, prefix: str) -> float:
+    return next(float(line.rsplit(" ", 1)[1]) for line in text.splitlines()
+                if line.startswith(prefix))
+
+
+def test_route_metrics_use_path_template():
+    """
+    Запросы учитываются по шаблону маршрута вместе с числом SQL-запросов.
+    """
+    author_id = client.post("/api/authors/", json={"name": "Metrics Author"}).json()["id"]
+    client.get(f"/api/authors/{author_id}")
+    client.get("/no/such/path")
+
+    text = client.get("/metrics").text
+    labels = 'method="GET",route="/api/authors/{author_id}"'
+    assert _sample(text, f'http_requests_total{{{labels},status="200"}}') >= 1
+    assert _sample(text, f"http_request_duration_seconds_count{{{labels}}}") >= 1
+    assert _sample(text, f"http_request_sql_statements_sum{{{labels}}}") >= 1
+    assert _sample(text, f"http_response_serialization_seconds_count{{{labels}}}") >= 1
+    assert 'route="unmatched",status="404"' in text
+
+    created = 'method="POST",route="/api/authors/"'
+    assert _sample(text, f"http_response_serialization_seconds_count{{{created}}}") >= 1
+
+
+def test_histogram_buckets_are_cumulative():
+    """
+    Корзины гистограммы выводятся накопленными, последней идет +Inf.
+    """
+    histogram = Histogram("test_seconds", "Тестовая гистограмма", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "/x")
+
+    lines = list(histogram.collect())
+    assert 'test_seconds_bucket{route="/x",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{route="/x",le="1.0"} 3' in lines
+    assert 'test_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 'test_seconds_count{route="/x"} 4' in lines
+
+
+def test_slow_query_logged_with_route_and_plan(monkeypatch, caplog):
+    """
+    Запрос дольше порога попадает в журнал с маршрутом, типами параметров и планом.
+    """
+    author_id = client.post("/api/authors/", json={"name": "Slow Author"}).json()["id"]
+    monkeypatch.setattr(database, "SLOW_QUERY_MS", 1e-6)
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+        client.get(f"/api/authors/{author_id}")
+
+    message = next(record.getMessage() for record in caplog.records
+                   if "FROM authors" in record.getMessage())
+    assert "GET /api/authors/{author_id}" in message
+    assert "(int" in message
+    assert "План:" in message
+
+
+def test_failed_explain_keeps_transaction_usable():
+    """
+    Ошибка EXPLAIN откатывается к точке сохранения и не прерывает транзакцию запроса.
+    """
+    with database.SessionLocal() as db:
+        conn = db.connection()
+        conn.exec_driver_sql("INSERT INTO authors (name) VALUES ('Explained Author')")
+        plan = database.explain(conn, "SELECT * FROM missing_table", ())
+        assert plan.startswith("EXPLAIN не выполнен")
+        count = conn.exec_driver_sql(
+            "SELECT COUNT(*) FROM authors WHERE name = 'Explained Author'"
+        ).scalar()
+        assert count == 1
+        db.rollback()
+
+
+def test_sql_profile_header(monkeypatch):
+    """
+    Заголовок X-SQL-Profile возвращает время каждого запроса только при включенном профилировании.
+    """
+    author_id = client.post("/api/authors/", json={"name": "Profiled Author"}).json()["id"]
+    headers = {"X-SQL-Profile": "1"}
+    assert "X-SQL-Profile" not in client.get(f"/api/authors/{author_id}", headers=headers).headers
+
+    monkeypatch.setattr(metrics, "SQL_PROFILING", True)
+    response_cache.clear()
+    response = client.get(f"/api/authors/{author_id}", headers=headers)
+    profile = json.loads(response.headers["X-SQL-Profile"])
+    assert profile["count"] == len(profile["statements"]) >= 1
+    assert any("FROM authors" in item["sql"] for item in profile["statements"])
+    assert response.headers["Server-Timing"].startswith("db;dur=")
@@ -0,0 +1,101 @@
+"""
+Тесты курсорной пагинации коллекций.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app import crud, models
+
+client = TestClient(app)
+
+
+def test_cursor_round_trip():
+    """
+    Курсор восстанавливает исходные значения ключа.
+    """
+    columns = [models.BookRating.rating_avg, models.BookRating.book_id]
+    assert decode_cursor(encode_cursor([4.5, 17]), columns) == [4.5, 17]
+    assert decode_cursor(encode_cursor([4, 17]), columns) == [4, 17]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor", encode_cursor([1, 2]), encode_cursor(["abc"]), encode_cursor([1.5]),
+    encode_cursor([True])
+])
+def test_invalid_cursor_rejected(cursor):
+    """
+    Поврежденный курсор, курсор другой арности или с чужими типами значений отклоняются.
+    """
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, [models.Author.id])
+
+
+def test_wrong_type_cursor_returns_400():
+    """
+    Курсор со строкой вместо идентификатора отклоняется до запроса к базе.
+    """
+    response = client.get("/api/authors/", params={"cursor": encode_cursor(["abc"])})
+    assert response.status_code == 400
+
+
+def collect(path: str, limit: int) -> list[dict]:
+    """Пролистывает коллекцию до конца и возвращает все элементы."""
+    items, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["items"]) <= limit
+        items.extend(body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items
+
+
+def test_genres_pages_cover_collection_once():
+    """
+    Страницы жанров не пересекаются и покрывают всю коллекцию.
+    """
+    with SessionLocal() as db:
+        db.add_all([models.Genre(name=f"Paged Genre {i}") for i in range(7)])
+        db.commit()
+
+    ids = [genre["id"] for genre in collect("/api/genres/genres/", limit=3)]
+    assert ids == sorted(set(ids))
+    assert len(ids) >= 7
+
+
+def test_top_rated_pages_follow_rating_order():
+    """
+    Страницы топа упорядочены по (байесовская оценка desc, id) без пропусков на равных оценках.
+    """
+    with SessionLocal() as db:
+        author = models.Author(name="Paged Author")
+        books = [
+            models.Book(title=f"Paged {i}", publication_year=2001,
+                        isbn=f"777-{i:010d}", author=author)
+            for i in range(6)
+        ]
+        db.add_all(books)
+        db.flush()
+        crud.apply_rating_deltas(db, {book.id: (1, i % 3 + 1) for i, book in enumerate(books)})
+        db.commit()
+        entry = models.LeaderboardEntry
+        expected = [
+            book_id for book_id, in db.query(entry.book_id).filter(entry.board == "all")
+            .order_by(entry.bayesian.desc(), entry.book_id)
+        ]
+
+    ids = [book["id"] for book in collect("/api/books/books/top-rated/", limit=4)]
+    assert ids == expected
+
+
+def test_page_size_is_capped():
+    """
+    Размер страницы больше максимального отклоняется.
+    """
+    assert client.get("/api/authors/", params={"limit": 1000}).status_code == 422
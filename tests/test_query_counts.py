@@ -0,0 +1,95 @@
+"""
+Тесты количества SQL-запросов, выполняемых эндпоинтами книг.
+
+Число запросов не должно зависеть от количества книг в ответе.
+Первый запрос каждого ответа — чтение версий для ETag.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app import models
+from app.crud import apply_rating_deltas
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    """
+    Создает автора, жанры, книги, пользователя и отзывы.
+
+    Returns:
+        list[int]: Идентификаторы созданных книг.
+    """
+    with SessionLocal() as db:
+        author = models.Author(name="Query Count Author")
+        genres = [models.Genre(name=f"Query Count Genre {i}") for i in range(3)]
+        user = models.User(
+            username="query_count_user",
+            email="query_count@example.com",
+            hashed_password="-"
+        )
+        books = [
+            models.Book(
+                title=f"Query Count Book {i}",
+                publication_year=2000 + i,
+                isbn=f"555-{i:010d}",
+                author=author,
+                genres=genres[:i % 3 + 1]
+            )
+            for i in range(5)
+        ]
+        db.add_all([author, user, *genres, *books])
+        db.flush()
+        for book in books:
+            db.add(models.Review(book_id=book.id, user_id=user.id, rating=4, comment="ok"))
+        db.flush()
+        apply_rating_deltas(db, {book.id: (1, 4) for book in books})
+        db.commit()
+        return [book.id for book in books]
+
+
+@pytest.mark.parametrize("include, expected", [
+    ("", 2),
+    ("author", 2),
+    ("genres", 3),
+    ("reviews", 3),
+    ("author,genres,reviews", 4),
+])
+def test_read_book_statements(catalog, sql_statements, include, expected):
+    """
+    Получение книги выполняет фиксированное число запросов для каждого include.
+    """
+    response = client.get(f"/api/books/{catalog[0]}", params={"include": include})
+    assert response.status_code == 200
+    assert len(sql_statements) == expected
+
+    body = response.json()
+    for relation in ("author", "genres", "reviews"):
+        assert (relation in body) == (relation in include)
+
+
+@pytest.mark.parametrize("include, expected", [
+    ("", 2),
+    ("author", 2),
+    ("author,genres", 3),
+    ("author,genres,reviews", 4),
+])
+def test_top_rated_statements(catalog, sql_statements, include, expected):
+    """
+    Топ книг выполняет фиксированное число запросов независимо от числа книг.
+    """
+    response = client.get("/api/books/books/top-rated/", params={"include": include})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) >= len(catalog)
+    assert len(sql_statements) == expected
+
+
+def test_unknown_include_rejected():
+    """
+    Неизвестная связь в include отклоняется с кодом 422.
+    """
+    response = client.get("/api/books/1", params={"include": "publisher"})
+    assert response.status_code == 422
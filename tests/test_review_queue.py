@@ -0,0 +1,173 @@
+"""
+Тесты очереди отложенной записи отзывов.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+from app.main import app
+from app.database import SessionLocal, engine
+from app import crud, models, schemas, security
+from app.api import reviews
+from app.review_queue import ReviewAlreadyQueuedError, ReviewQueue, ReviewQueueFullError
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def reviewers() -> list[tuple[int, dict]]:
+    """
+    Создает пользователей (по одному отзыву на книгу) и получает для них токены.
+
+    Returns:
+        list[tuple[int, dict]]: Идентификаторы пользователей и заголовки авторизации.
+    """
+    password_hash = security.get_password_hash("Secret123")
+    with SessionLocal() as db:
+        users = [
+            crud.create_user(
+                db,
+                schemas.UserBase(username=f"queued_{i}", email=f"queued_{i}@example.com"),
+                password_hash
+            )
+            for i in range(24)
+        ]
+        db.commit()
+        return [
+            (user.id, {"Authorization": "Bearer " + security.create_access_token(
+                {"sub": user.username, "uid": user.id}
+            )})
+            for user in users
+        ]
+
+
+@pytest.fixture(scope="module")
+def book_id():
+    """
+    Создает книгу для отзывов.
+
+    Returns:
+        int: Идентификатор книги.
+    """
+    with SessionLocal() as db:
+        book = models.Book(
+            title="Queued Reviews Book", publication_year=2020, isbn="225-0000000001",
+            author=models.Author(name="Queued Reviews Author")
+        )
+        db.add(book)
+        db.commit()
+        return book.id
+
+
+def _review_stats(book_id: int) -> tuple[int, int | None]:
+    with SessionLocal() as db:
+        count = db.scalar(select(func.count()).where(models.Review.book_id == book_id))
+        rating = db.get(models.BookRating, book_id)
+        return count, rating.review_count if rating else None
+
+
+def test_enqueue_waits_for_commit(book_id, reviewers):
+    """
+    В режиме commit ответ 202 отправляется после записи отзыва и агрегата рейтинга.
+    """
+    for (_, headers), rating in zip(reviewers, (5, 3)):
+        response = client.post(
+            "/api/reviews/reviews/queue",
+            json={"book_id": book_id, "rating": rating}, headers=headers
+        )
+        assert response.status_code == 202
+        assert response.json() == {"committed": True}
+    assert _review_stats(book_id) == (2, 2)
+
+    repeated = client.post(
+        "/api/reviews/reviews/queue", json={"book_id": book_id, "rating": 1},
+        headers=reviewers[0][1]
+    )
+    assert repeated.status_code == 409
+    assert _review_stats(book_id) == (2, 2)
+
+
+def test_reviews_are_written_in_batches(book_id, reviewers):
+    """
+    Отзывы за интервал записи вставляются одним запросом и дописываются при остановке.
+    """
+    inserts = []
+
+    def before_cursor_execute(_conn, _cursor, statement, *_args):
+        if statement.startswith("INSERT INTO reviews"):
+            inserts.append(statement)
+
+    review_queue = ReviewQueue(flush_rows=100, flush_ms=500, durability="enqueue")
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        for i, (user_id, _) in enumerate(reviewers[2:22]):
+            review = schemas.ReviewCreate(book_id=book_id, rating=i % 5 + 1)
+            review_queue.submit(review, user_id)
+        review_queue.stop()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    assert len(inserts) == 1
+    assert review_queue.stats()["written"] == 20
+    assert _review_stats(book_id) == (22, 22)
+
+
+def test_full_queue_rejects_with_503(book_id, reviewers, monkeypatch):
+    """
+    Отзыв сверх емкости очереди отклоняется сразу, эндпоинт отвечает 503 с Retry-After.
+    """
+    review_queue = ReviewQueue(capacity=1, durability="enqueue")
+    monkeypatch.setattr(review_queue, "_ensure_started", lambda: None)
+    review = schemas.ReviewCreate(book_id=book_id, rating=4)
+    (first_user, _), (user_id, headers) = reviewers[22:24]
+    review_queue.submit(review, first_user)
+    with pytest.raises(ReviewQueueFullError):
+        review_queue.submit(review, user_id)
+    assert review_queue.stats()["rejected"] == 1
+
+    monkeypatch.setattr(reviews, "review_queue", review_queue)
+    response = client.post(
+        "/api/reviews/reviews/queue", json={"book_id": book_id, "rating": 4}, headers=headers
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_duplicate_review_rejected_before_queueing(book_id, reviewers, monkeypatch):
+    """
+    В режиме enqueue повторный отзыв (записанный или ожидающий записи) отклоняется с 409.
+    """
+    review_queue = ReviewQueue(durability="enqueue")
+    monkeypatch.setattr(review_queue, "_ensure_started", lambda: None)
+    review = schemas.ReviewCreate(book_id=book_id, rating=2)
+    review_queue.submit(review, reviewers[22][0])
+    with pytest.raises(ReviewAlreadyQueuedError):
+        review_queue.submit(review, reviewers[22][0])
+
+    monkeypatch.setattr(reviews, "review_queue", review_queue)
+    for _, headers in (reviewers[0], reviewers[22]):
+        response = client.post(
+            "/api/reviews/reviews/queue", json={"book_id": book_id, "rating": 2},
+            headers=headers
+        )
+        assert response.status_code == 409
+    assert review_queue.stats()["enqueued"] == 1
+
+
+def test_writer_survives_unexpected_error(book_id, monkeypatch):
+    """
+    Ошибка записи любого типа передается ожидающим вызовам, поток записи продолжает работу.
+    """
+    review_queue = ReviewQueue(flush_ms=1)
+    review = schemas.ReviewCreate(book_id=book_id, rating=3)
+
+    def broken_write(_rows):
+        raise TypeError("broken serializer")
+
+    monkeypatch.setattr(review_queue, "_write", broken_write)
+    failed = review_queue.submit(review, 1)
+    assert isinstance(failed.exception(timeout=5), TypeError)
+
+    monkeypatch.setattr(review_queue, "_write", lambda _rows: None)
+    assert review_queue.submit(review, 1).result(timeout=5) is None
+    review_queue.stop()
+    assert review_queue.stats()["failed"] == 1
@@ -0,0 +1,140 @@
+"""
+Тесты оценки книг, уникальности отзыва пользователя и ленты отзывов пользователя.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from app.main import app
+from app.database import SessionLocal
+from app import crud, models, schemas, security
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def reviewer() -> dict:
+    """
+    Создает пользователя и получает для него токен.
+
+    Returns:
+        dict: Заголовки авторизации.
+    """
+    with SessionLocal() as db:
+        user = crud.create_user(
+            db,
+            schemas.UserBase(username="rating_user", email="rating_user@example.com"),
+            security.get_password_hash("Secret123")
+        )
+        db.commit()
+        user_id = user.id
+    token = security.create_access_token({"sub": "rating_user", "uid": user_id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="module")
+def book_ids() -> list[int]:
+    """
+    Создает три книги без отзывов.
+
+    Returns:
+        list[int]: Идентификаторы книг.
+    """
+    with SessionLocal() as db:
+        author = models.Author(name="Rated Author")
+        books = [
+            models.Book(title=f"Rated Book {i}", publication_year=2015,
+                        isbn=f"226-{i:010d}", author=author)
+            for i in range(3)
+        ]
+        db.add_all(books)
+        db.commit()
+        return [book.id for book in books]
+
+
+def _rating(book_id: int) -> tuple[int, int]:
+    with SessionLocal() as db:
+        rating = db.get(models.BookRating, book_id)
+        return rating.review_count, rating.rating_sum
+
+
+def test_rate_book_updates_in_place(reviewer, book_ids):
+    """
+    Повторная оценка обновляет тот же отзыв и меняет агрегат на разницу оценок.
+    """
+    path = f"/api/reviews/reviews/book/{book_ids[0]}"
+    created = client.put(path, json={"rating": 2, "comment": "meh"}, headers=reviewer)
+    assert created.status_code == 201
+    updated = client.put(path, json={"rating": 5}, headers=reviewer)
+    assert updated.status_code == 200
+    assert updated.json()["id"] == created.json()["id"]
+    assert updated.json()["comment"] is None
+    assert _rating(book_ids[0]) == (1, 5)
+
+    missing = client.put("/api/reviews/reviews/book/999999", json={"rating": 5}, headers=reviewer)
+    assert missing.status_code == 404
+
+
+def test_second_review_is_rejected(reviewer, book_ids):
+    """
+    Второй отзыв пользователя о книге через POST отклоняется с 409.
+    """
+    body = {"book_id": book_ids[1], "rating": 4}
+    assert client.post("/api/reviews/reviews/", json=body).status_code == 401
+    assert client.post("/api/reviews/reviews/", json=body, headers=reviewer).status_code == 201
+    assert client.post("/api/reviews/reviews/", json=body, headers=reviewer).status_code == 409
+    assert _rating(book_ids[1]) == (1, 4)
+
+
+def test_concurrent_duplicate_is_not_an_error(book_ids):
+    """
+    Отзыв, вставленный конкурентной транзакцией после проверки, не вызывает ошибку целостности.
+    """
+    review = schemas.ReviewCreate(book_id=book_ids[1], rating=1)
+    with SessionLocal() as db:
+        user_id = db.scalar(select(models.User.id).where(models.User.username == "rating_user"))
+        db_review, created = crud.create_review(db, review, user_id)
+        assert not created and db_review.rating == 4
+        db.commit()
+    assert _rating(book_ids[1]) == (1, 4)
+
+
+def test_review_of_missing_book_is_not_found(reviewer):
+    """
+    Отзыв о несуществующей книге отклоняется с 404, а не ошибкой внешнего ключа.
+    """
+    response = client.post(
+        "/api/reviews/reviews/", json={"book_id": 999999, "rating": 5}, headers=reviewer
+    )
+    assert response.status_code == 404
+
+
+def test_user_review_feed(reviewer, book_ids):
+    """
+    Лента отзывов пользователя выдается страницами, начиная с последних.
+    """
+    client.put(f"/api/reviews/reviews/book/{book_ids[2]}", json={"rating": 3}, headers=reviewer)
+    first = client.get("/api/users/me/reviews", params={"limit": 2}, headers=reviewer).json()
+    assert [review["book_id"] for review in first["items"]] == [book_ids[2], book_ids[1]]
+    second = client.get(
+        "/api/users/me/reviews", params={"limit": 2, "cursor": first["next_cursor"]},
+        headers=reviewer
+    ).json()
+    assert [review["book_id"] for review in second["items"]] == [book_ids[0]]
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.parametrize("column, index", [
+    ("book_id", "ix_reviews_book_id"),
+    ("user_id", "ix_reviews_user_id"),
+])
+def test_review_lookups_use_indexes(column, index):
+    """
+    Отзывы книги и пользователя читаются по составным индексам.
+    """
+    with SessionLocal() as db:
+        plan = db.execute(text(
+            f"EXPLAIN QUERY PLAN SELECT * FROM reviews WHERE {column} = 1 "
+            "ORDER BY id DESC LIMIT 20"
+        )).all()
+    assert any(index in row[-1] for row in plan)
@@ -0,0 +1,57 @@
+"""
+Тесты поиска книг (резервный индекс в памяти для SQLite).
+"""
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app import models
+
+client = TestClient(app)
+
+
+def _titles(params: dict) -> list[str]:
+    response = client.get("/api/books/search", params=params)
+    assert response.status_code == 200
+    return [hit["title"] for hit in response.json()]
+
+
+def test_search_ranks_typos_prefixes_and_filters():
+    """
+    Поиск находит книги по словам, опечаткам, префиксам и имени автора.
+    """
+    with SessionLocal() as db:
+        author = models.Author(name="Searchable Tolkien")
+        fantasy = models.Genre(name="Search Fantasy")
+        db.add_all([
+            models.Book(title="The Hobbit Searchbook", publication_year=1937,
+                        isbn="987-0000000001", author=author, genres=[fantasy]),
+            models.Book(title="Silmarillion Searchbook", publication_year=1977,
+                        isbn="987-0000000002", author=author),
+        ])
+        db.commit()
+
+    assert _titles({"q": "hobbit searchbook"})[0] == "The Hobbit Searchbook"
+    assert _titles({"q": "hobit"}) == ["The Hobbit Searchbook"]
+    assert _titles({"q": "silmar", "prefix": True}) == ["Silmarillion Searchbook"]
+    assert set(_titles({"q": "searchable tolkien"})) == {
+        "The Hobbit Searchbook", "Silmarillion Searchbook"
+    }
+    assert _titles({"q": "searchable tolkien", "genre": "Search Fantasy"}) == [
+        "The Hobbit Searchbook"
+    ]
+    assert _titles({"q": "searchable tolkien", "year_from": 1950}) == [
+        "Silmarillion Searchbook"
+    ]
+
+
+def test_search_index_sees_committed_changes():
+    """
+    Резервный индекс перестраивается после фиксации изменений.
+    """
+    assert not _titles({"q": "zyxwvut"})
+    with SessionLocal() as db:
+        db.add(models.Book(title="Zyxwvut", publication_year=2000, isbn="987-0000000003",
+                           author=models.Author(name="Zyx Author")))
+        db.commit()
+    assert _titles({"q": "zyxwvut"}) == ["Zyxwvut"]
@@ -0,0 +1,70 @@
+"""
+Тесты ответов списков, собранных из строк колонок без проверки схемой.
+"""
+
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from app.main import app
+from app.database import SessionLocal
+from app import models, schemas
+from app.serializers import RowShape
+
+client = TestClient(app)
+
+
+def test_row_shape_follows_schema_fields():
+    """
+    Колонки берутся в порядке полей схемы, поля без колонок получают значения по умолчанию.
+    """
+    shape = RowShape(schemas.BookDetail, models.Book, defaults=True)
+    assert shape.fields == ("title", "publication_year", "isbn", "author_id", "id")
+    assert shape.to_dict(("Книга", 1999, "000-0000000000", 3, 7)) == {
+        "title": "Книга", "publication_year": 1999, "isbn": "000-0000000000",
+        "author_id": 3, "id": 7, "author": None, "genres": None, "reviews": None,
+    }
+
+    prefixed = RowShape(schemas.Author, models.Author, prefix="author__")
+    assert [column.key for column in prefixed.columns] == [
+        "author__name", "author__bio", "author__id"
+    ]
+
+
+def test_book_list_matches_validated_schema():
+    """
+    Список книг со связями совпадает с результатом сериализации через схему.
+    """
+    with SessionLocal() as db:
+        author = models.Author(name="Serializer Author", bio="bio")
+        genre = models.Genre(name="Serializer Genre")
+        user = models.User(username="serializer_user", email="serializer@example.com",
+                           hashed_password="-")
+        book = models.Book(title="Serializer Book", publication_year=2001,
+                           isbn="778-0000000018", author=author, genres=[genre])
+        db.add_all([author, genre, user, book])
+        db.flush()
+        db.add(models.Review(book_id=book.id, user_id=user.id, rating=5, comment="good"))
+        db.commit()
+        book_id = book.id
+
+    adapter = TypeAdapter(schemas.Page[schemas.BookDetail])
+    cursor = None
+    while True:
+        response = client.get("/api/books/", params={
+            "include": "author,genres,reviews", "limit": 100,
+            **({"cursor": cursor} if cursor else {})
+        })
+        assert response.status_code == 200
+        body = response.json()
+        page = adapter.validate_python(body)
+        assert adapter.dump_python(page, exclude_unset=True, mode="json") == body
+        found = [item for item in body["items"] if item["id"] == book_id]
+        if found or body["next_cursor"] is None:
+            break
+        cursor = body["next_cursor"]
+
+    assert found[0]["author"]["name"] == "Serializer Author"
+    assert [genre["name"] for genre in found[0]["genres"]] == ["Serializer Genre"]
+    assert [review["rating"] for review in found[0]["reviews"]] == [5]
+
+    plain = client.get("/api/books/", params={"limit": 1}).json()["items"][0]
+    assert set(plain) == {"id", "title", "publication_year", "isbn", "author_id"}
@@ -0,0 +1,71 @@
+"""
+Тесты зависимостей сессий базы данных.
+
+Проверяют, что каждый запрос берет из пула ровно одно соединение,
+возвращает его и фиксирует изменения один раз.
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.main import app
+from app.database import SessionLocal, async_engine
+from app.models import Author
+
+client = TestClient(app)
+
+
+def test_write_request_uses_one_connection(pool_checkouts):
+    """
+    Запрос на запись берет одно соединение и фиксирует транзакцию.
+    """
+    response = client.post("/api/authors/", json={"name": "Pool Author", "bio": "Bio"})
+    assert response.status_code == 201
+    assert len(pool_checkouts) == 1
+    assert async_engine.sync_engine.pool.checkedout() == 0
+
+    response = client.get(f"/api/authors/{response.json()['id']}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Pool Author"
+
+
+def test_read_request_uses_one_connection(pool_checkouts):
+    """
+    Запрос на чтение берет одно соединение и возвращает его в пул.
+    """
+    response = client.get("/api/genres/genres/")
+    assert response.status_code == 200
+    assert len(pool_checkouts) == 1
+    assert async_engine.sync_engine.pool.checkedout() == 0
+
+
+def test_failed_request_rolls_back(pool_checkouts):
+    """
+    Ошибка в обработчике откатывает транзакцию и освобождает соединение.
+    """
+    response = client.post("/api/books/books/", json={
+        "title": "Orphan Book",
+        "publication_year": 2020,
+        "isbn": "999-0000000001",
+        "author_id": 999999
+    })
+    assert response.status_code == 404
+    assert len(pool_checkouts) == 1
+    assert async_engine.sync_engine.pool.checkedout() == 0
+
+
+def test_failed_commit_returns_error(monkeypatch):
+    """
+    Ошибка фиксации транзакции возвращается клиенту до отправки ответа.
+    """
+    async def failing_commit(_session):
+        raise OperationalError("COMMIT", {}, Exception("disk I/O error"))
+
+    monkeypatch.setattr(AsyncSession, "commit", failing_commit)
+    response = client.post("/api/authors/", json={"name": "Lost Author", "bio": "Bio"})
+    monkeypatch.undo()
+    assert response.status_code == 500
+
+    with SessionLocal() as db:
+        assert db.scalar(select(Author).where(Author.name == "Lost Author")) is None
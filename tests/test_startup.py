@@ -0,0 +1,40 @@
+"""
+Тесты запуска приложения: прогрев в lifespan и отчет о фазах.
+"""
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.cache import response_cache
+from app.database import SessionLocal
+from app import crud, schemas, startup
+
+
+def test_lifespan_reports_phases_and_warms_cache(monkeypatch):
+    """
+    При запуске выполняются фазы прогрева, ответы прогретых эндпоинтов попадают в кэш.
+    """
+    with SessionLocal() as db:
+        author_id = crud.create_author(db, schemas.AuthorCreate(name="Warm Author")).id
+        db.commit()
+    paths = ["/api/books/books/top-rated/", f"/api/authors/{author_id}"]
+    monkeypatch.setattr(startup, "STARTUP_WARM_HASHING", False)
+    monkeypatch.setattr(startup, "STARTUP_WARM_PATHS", paths)
+    with TestClient(app) as client:
+        phases = client.get("/api/health/startup").json()["phases"]
+        assert [phase["phase"] for phase in phases] == ["db_pool", "hashing_pool", "warm_paths"]
+        assert all(phase["error"] is None for phase in phases)
+
+        response = client.get(f"/api/authors/{author_id}")
+        assert response.headers["X-Cache"] == "HIT"
+    assert response_cache.stats()["hits"] == 1
+
+
+def test_failed_phase_does_not_abort_startup(monkeypatch):
+    """
+    Ошибка прогрева записывается в отчет, приложение продолжает запуск.
+    """
+    monkeypatch.setattr(startup, "STARTUP_WARM_HASHING", False)
+    monkeypatch.setattr(startup, "STARTUP_WARM_PATHS", ["/api/no-such-endpoint"])
+    with TestClient(app) as client:
+        phases = client.get("/api/health/startup").json()["phases"]
+    assert "404" in phases[-1]["error"]
@@ -0,0 +1,73 @@
+"""
+Тесты регистрации и пакетной выгрузки учетных записей.
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.main import app
+from app.database import SessionLocal
+from app import dependencies, models, security
+
+client = TestClient(app)
+
+
+def _stored_hash(username: str) -> str:
+    with SessionLocal() as db:
+        return db.scalar(
+            select(models.User.hashed_password).where(models.User.username == username)
+        )
+
+
+def test_register_hashes_password_once():
+    """
+    Сохраненный хэш проверяется исходным паролем, то есть пароль хэширован один раз.
+    """
+    response = client.post("/api/auth/register", json={
+        "username": "new_user", "email": "new_user@example.com", "password": "Secret123"
+    })
+    assert response.status_code == 201
+    assert security.verify_password("Secret123", _stored_hash("new_user"))
+
+    duplicate = client.post("/api/auth/register", json={
+        "username": "new_user", "email": "other@example.com", "password": "Secret123"
+    })
+    assert duplicate.status_code == 400
+
+
+def test_provision_stores_hashes_as_is(monkeypatch):
+    """
+    Выгрузка сохраняет готовые хэши и пропускает занятые имена.
+    """
+    monkeypatch.setattr(dependencies, "PROVISIONING_TOKEN", "sso-token")
+    hashed = security.get_password_hash("SsoPass123")
+    batch = {"users": [
+        {"username": "sso_one", "email": "sso_one@example.com", "hashed_password": hashed},
+        {"username": "sso_two", "email": "sso_two@example.com", "hashed_password": hashed},
+    ]}
+    headers = {"X-Provisioning-Token": "sso-token"}
+
+    response = client.post("/api/users/provision", json=batch, headers=headers)
+    assert response.json() == {"received": 2, "created": 2, "skipped": 0}
+    assert _stored_hash("sso_one") == hashed
+
+    again = client.post("/api/users/provision", json=batch, headers=headers)
+    assert again.json() == {"received": 2, "created": 0, "skipped": 2}
+
+    login = client.post("/api/auth/token", data={"username": "sso_two", "password": "SsoPass123"})
+    assert login.status_code == 200
+
+
+def test_provision_requires_token_and_valid_hash(monkeypatch):
+    """
+    Без токена выгрузка запрещена, строка не в формате bcrypt отклоняется.
+    """
+    monkeypatch.setattr(dependencies, "PROVISIONING_TOKEN", "sso-token")
+    batch = {"users": [
+        {"username": "sso_bad", "email": "sso_bad@example.com", "hashed_password": "Secret123"}
+    ]}
+    assert client.post("/api/users/provision", json=batch).status_code == 403
+    response = client.post(
+        "/api/users/provision", json=batch, headers={"X-Provisioning-Token": "sso-token"}
+    )
+    assert response.status_code == 422